@@ -5,40 +5,92 @@ Flask Web Interface
 
 import os
 import json
+import time
+from contextlib import closing
 from datetime import datetime
 from io import BytesIO
 
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, Response, render_template, request, jsonify, send_file, session, stream_with_context
 import pandas as pd
 
-from browser import LinkedInBrowser
-from scraper import LinkedInScraper
-from evaluator import ProfileEvaluator, SearchCriteria, ProfileAnalysis
+from archive import PageArchive
+from browser_worker import BrowserWorker
+from cache import EvaluationCache, ProfileCache
+from dates import work_history_table
+from evaluator import CriteriaRules, ProfileEvaluator, SearchCriteria, ProfileAnalysis
+from jobs import JobCancelled, JobManager
+from journal import JournalState, RunJournal
+from pipeline import AnalysisPipeline, reevaluate as reevaluate_histories, run_histories
+from store import RunStore
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
-# Global state for browser (persists across requests)
+# Global state (persists across requests)
 browser_state = {
-    'browser': None,
-    'scraper': None,
+    'browser': BrowserWorker(),   # Owns the Playwright thread; safe to call from any thread
     'evaluator': None,
     'logged_in': False,
     'criteria': None,
     'search_results': None,
-    'analyses': None
+    'analyses': None,
+    'run_id': None          # Current run in the store
 }
 
+# Runs and their results, kept across restarts
+store = RunStore()
+
+# Decides which stored evaluations are recent enough to reuse (the browser worker has its own)
+profile_cache = ProfileCache()
+
+# Analyses written to the store per transaction
+STORE_BATCH_SIZE = 10
+
+# Searches and analyses run here, one at a time
+jobs = JobManager()
+
+# Longest gap between events on /analyze/stream
+STREAM_HEARTBEAT_SECONDS = 2.0
+
 
 def get_evaluator():
     """Get or create the evaluator."""
     if browser_state['evaluator'] is None:
         api_key = os.environ.get('ANTHROPIC_API_KEY')
         if api_key:
-            browser_state['evaluator'] = ProfileEvaluator(api_key)
+            browser_state['evaluator'] = ProfileEvaluator(api_key, cache=EvaluationCache())
     return browser_state['evaluator']
 
 
+def criteria_json(criteria: SearchCriteria) -> dict:
+    """Criteria fields shown in the UI."""
+    return {
+        'company': criteria.company,
+        'team_or_product': criteria.team_or_product,
+        'role_keywords': criteria.role_keywords,
+        'still_employed_ok': criteria.still_employed_ok,
+        'left_after': criteria.left_after,
+        'left_before': criteria.left_before,
+        'min_months_ago': criteria.min_months_ago,
+        'max_months_ago': criteria.max_months_ago,
+        'linkedin_search_query': criteria.linkedin_search_query,
+        'original_query': criteria.original_query
+    }
+
+
+def analysis_json(a: ProfileAnalysis) -> dict:
+    """Analysis fields shown in the UI."""
+    return {
+        'name': a.name,
+        'url': a.url,
+        'matches': a.matches_criteria,
+        'confidence': a.confidence,
+        'target_company': a.target_company,
+        'left_date': a.left_date,
+        'reasoning': a.reasoning
+    }
+
+
 @app.route('/')
 def index():
     """Main page."""
@@ -67,13 +119,10 @@ def set_api_key():
 def launch_browser():
     """Launch the browser and check login status."""
     try:
-        if browser_state['browser'] is None:
-            browser_state['browser'] = LinkedInBrowser(headless=False)
-            browser_state['browser'].start()
-            browser_state['scraper'] = LinkedInScraper(browser_state['browser'])
-
-        # Check login status
-        browser_state['logged_in'] = browser_state['browser'].goto_linkedin()
+        browser_state['logged_in'] = browser_state['browser'].launch(
+            lean=os.environ.get('BRAIN_LEAN') == '1',
+            archive=PageArchive() if os.environ.get('BRAIN_ARCHIVE') == '1' else None
+        )
 
         return jsonify({
             'success': True,
@@ -86,10 +135,13 @@ def launch_browser():
 @app.route('/check_login', methods=['POST'])
 def check_login():
     """Check if logged into LinkedIn."""
-    if browser_state['browser'] is None:
+    if not browser_state['browser'].started:
         return jsonify({'success': False, 'error': 'Browser not launched'})
 
-    browser_state['logged_in'] = browser_state['browser'].goto_linkedin()
+    try:
+        browser_state['logged_in'] = browser_state['browser'].check_login()
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
     return jsonify({'success': True, 'logged_in': browser_state['logged_in']})
 
 
@@ -114,18 +166,7 @@ def parse_query():
 
         return jsonify({
             'success': True,
-            'criteria': {
-                'company': criteria.company,
-                'team_or_product': criteria.team_or_product,
-                'role_keywords': criteria.role_keywords,
-                'still_employed_ok': criteria.still_employed_ok,
-                'left_after': criteria.left_after,
-                'left_before': criteria.left_before,
-                'min_months_ago': criteria.min_months_ago,
-                'max_months_ago': criteria.max_months_ago,
-                'linkedin_search_query': criteria.linkedin_search_query,
-                'original_query': criteria.original_query
-            }
+            'criteria': criteria_json(criteria)
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -133,7 +174,7 @@ def parse_query():
 
 @app.route('/search', methods=['POST'])
 def search():
-    """Execute LinkedIn search."""
+    """Start a LinkedIn search job."""
     data = request.json
     max_pages = data.get('max_pages', 1)
 
@@ -143,9 +184,11 @@ def search():
     if not browser_state['criteria']:
         return jsonify({'success': False, 'error': 'No search criteria set'})
 
-    try:
-        criteria = browser_state['criteria']
-        results = browser_state['scraper'].search(
+    criteria = browser_state['criteria']
+
+    def run_search(job):
+        job.progress(stage='searching', total=max_pages)
+        results = browser_state['browser'].search(
             criteria.linkedin_search_query,
             max_pages=max_pages,
             past_company=criteria.company
@@ -153,78 +196,309 @@ def search():
 
         browser_state['search_results'] = results
         browser_state['analyses'] = None
-
-        return jsonify({
-            'success': True,
-            'results': [{'name': r.name, 'url': r.url, 'headline': r.headline} for r in results]
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        browser_state['run_id'] = store.start_run(criteria)
+        store.add_search_hits(browser_state['run_id'], results)
+        journal = RunJournal(browser_state['run_id'])
+        journal.start(criteria, results)
+        journal.close()
+        for r in results:
+            job.results.append({'name': r.name, 'url': r.url, 'headline': r.headline})
+        job.progress(done=max_pages, stage='done')
+
+    job = jobs.submit('search', run_search)
+    return jsonify({'success': True, 'job_id': job.id})
+
+
+def start_analysis(num_profiles: int | None, resume: JournalState | None = None):
+    """
+    Queue an analysis job for the first num_profiles search results, or to
+    finish an interrupted run from its journal.
+
+    Returns:
+        (job, None) on success, or (None, error message)
+    """
+    evaluator = get_evaluator()
+    if not evaluator:
+        return None, 'API key not set'
+
+    if resume:
+        # Already evaluated profiles are replayed; fetched ones skip the browser
+        criteria, run_id = resume.criteria, resume.run_id
+        shown = [p for p in resume.profiles if resume.planned is None or p.url in resume.planned]
+        profiles = resume.pending
+        fetched = resume.fetched
+        previous = [resume.evaluated[p.url] for p in shown if p.url in resume.evaluated]
+    else:
+        if not browser_state['search_results']:
+            return None, 'No search results'
+        criteria, run_id = browser_state['criteria'], browser_state['run_id']
+        shown = browser_state['search_results'][:num_profiles]
+        fetched = None
+        # Profiles evaluated under the same criteria in an earlier run skip the browser and Claude
+        previous = store.reusable_analyses(criteria, shown, profile_cache)
+        reused = {a.url for a in previous}
+        profiles = [p for p in shown if p.url not in reused]
+    journal = RunJournal(run_id)
+
+    def run_analysis(job):
+        if resume:
+            browser_state.update(criteria=criteria, search_results=resume.profiles, analyses=previous or None, run_id=run_id)
+        else:
+            journal.plan(shown)
+            for analysis in previous:
+                journal.fetched(analysis.url, analysis.work_history)
+                journal.evaluated(analysis)
+        job.progress(total=len(shown), stage='analyzing')
+        evaluator.usage.reset()
+        by_url = {}
+        for analysis in previous:
+            by_url[analysis.url] = analysis
+            job.add_result(analysis_json(analysis))
+        unsaved = list(previous)
+        status = 'failed'
+        last = time.time()
+
+        # Fetching and evaluation overlap; keep the search result order for display
+        pipeline = AnalysisPipeline(browser_state['browser'], evaluator, journal=journal)
+        try:
+            with closing(pipeline.run(criteria, profiles, fetched=fetched)) as analyses:
+                for analysis in analyses:
+                    by_url[analysis.url] = analysis
+                    browser_state['analyses'] = [by_url[p.url] for p in shown if p.url in by_url]
+                    now = time.time()
+                    job.add_result(dict(
+                        analysis_json(analysis),
+                        seconds=round(now - last, 1),             # Since the previous result
+                        elapsed=round(now - job.started_at, 1)
+                    ))
+                    last = now
+
+                    unsaved.append(analysis)
+                    if len(unsaved) >= STORE_BATCH_SIZE:
+                        store.add_analyses(run_id, unsaved)
+                        unsaved = []
+                    job.check_cancelled()
+            status = 'done'
+        except JobCancelled:
+            status = 'cancelled'
+            raise
+        finally:
+            store.add_analyses(run_id, unsaved)
+            store.finish_run(run_id, status)
+            journal.finish(status)
+            journal.close()
+            print(evaluator.usage.summary())
+        job.progress(stage='done')
+
+    return jobs.submit('analyze', run_analysis), None
 
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
-    """Analyze profiles against criteria."""
+    """Start a job analyzing profiles against criteria."""
     data = request.json
-    num_profiles = data.get('num_profiles', len(browser_state['search_results'] or []))
+    job, error = start_analysis(data.get('num_profiles'))
+    if error:
+        return jsonify({'success': False, 'error': error})
+    return jsonify({'success': True, 'job_id': job.id})
+
+
+@app.route('/resume', methods=['POST'])
+def resume():
+    """Finish an interrupted analysis (the latest one, or {"run_id": N}) as a job."""
+    data = request.json or {}
+    if jobs.active():
+        # Also stops a second click from queueing the same run twice
+        return jsonify({'success': False, 'error': 'Another job is still running'}), 409
+    run_id = data.get('run_id') or RunJournal.latest_unfinished()
+    state = RunJournal(run_id).load() if run_id else None
+    if not state or not state.criteria:
+        return jsonify({'success': False, 'error': 'No interrupted run to resume'})
+
+    job, error = start_analysis(None, resume=state)
+    if error:
+        return jsonify({'success': False, 'error': error})
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'run_id': run_id,
+        'criteria': criteria_json(state.criteria),
+        'results': [{'name': r.name, 'url': r.url, 'headline': r.headline} for r in state.profiles]
+    })
+
 
-    if not browser_state['search_results']:
-        return jsonify({'success': False, 'error': 'No search results'})
+@app.route('/reevaluate', methods=['POST'])
+def reevaluate():
+    """
+    Evaluate already-fetched work histories against the current criteria as a
+    job, without the browser.
 
+    Uses the profiles of {"run_id": N}, or of the current run. The results
+    are stored as a new run; follow the job on /analyze/stream?job_id=.
+    """
+    data = request.json or {}
+    if jobs.active():
+        # A running job still owns browser_state and its run
+        return jsonify({'success': False, 'error': 'Another job is still running'}), 409
     evaluator = get_evaluator()
     if not evaluator:
         return jsonify({'success': False, 'error': 'API key not set'})
+    criteria = browser_state['criteria']
+    if not criteria:
+        return jsonify({'success': False, 'error': 'No search criteria set'})
 
-    try:
-        criteria = browser_state['criteria']
-        profiles = browser_state['search_results'][:num_profiles]
-        analyses = []
-
-        for profile in profiles:
-            work_history = browser_state['scraper'].get_profile_experience(profile.url)
-            result = evaluator.evaluate(criteria, work_history, profile.name)
-
-            analysis = ProfileAnalysis(
-                name=profile.name,
-                url=profile.url,
-                work_history=work_history,
-                matches_criteria=result.matches_criteria,
-                reasoning=result.reasoning,
-                target_company=result.target_company,
-                left_date=result.left_date,
-                confidence=result.confidence
-            )
-            analyses.append(analysis)
-
-        browser_state['analyses'] = analyses
+    source_run_id = data.get('run_id') or browser_state['run_id']
+    histories = run_histories(store, source_run_id) if source_run_id else []
+    if not histories:
+        return jsonify({'success': False, 'error': 'No fetched profiles to re-evaluate'})
+
+    profiles = [profile for profile, _ in histories]
+    run_id = store.start_run(criteria)
+    store.add_search_hits(run_id, profiles)
+
+    def run_reevaluation(job):
+        browser_state.update(search_results=profiles, analyses=None, run_id=run_id)
+        job.progress(total=len(histories), stage='evaluating')
+        evaluator.usage.reset()
+        by_url = {}
+        unsaved = []
+        status = 'failed'
+        try:
+            with closing(reevaluate_histories(evaluator, criteria, histories)) as analyses:
+                for analysis in analyses:
+                    by_url[analysis.url] = analysis
+                    browser_state['analyses'] = [by_url[p.url] for p in profiles if p.url in by_url]
+                    job.add_result(dict(analysis_json(analysis), elapsed=round(time.time() - job.started_at, 1)))
+
+                    unsaved.append(analysis)
+                    if len(unsaved) >= STORE_BATCH_SIZE:
+                        store.add_analyses(run_id, unsaved)
+                        unsaved = []
+                    job.check_cancelled()
+            status = 'done'
+        except JobCancelled:
+            status = 'cancelled'
+            raise
+        finally:
+            store.add_analyses(run_id, unsaved)
+            store.finish_run(run_id, status)
+            print(evaluator.usage.summary())
+        job.progress(stage='done')
+
+    job = jobs.submit('reevaluate', run_reevaluation)
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'run_id': run_id,
+        'source_run_id': source_run_id,
+        'criteria': criteria_json(criteria),
+        'results': [{'name': p.name, 'url': p.url, 'headline': p.headline} for p in profiles]
+    })
 
-        return jsonify({
-            'success': True,
-            'analyses': [{
-                'name': a.name,
-                'url': a.url,
-                'matches': a.matches_criteria,
-                'confidence': a.confidence,
-                'target_company': a.target_company,
-                'left_date': a.left_date,
-                'reasoning': a.reasoning
-            } for a in analyses]
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+
+def sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route('/analyze/stream')
+def analyze_stream():
+    """
+    Start an analysis (or follow one with ?job_id=) as a Server-Sent Events stream.
+
+    Events:
+        started   {job_id}
+        result    one per profile, as soon as it is evaluated
+        progress  heartbeat with done/total/stage/eta every few seconds
+        done      final status (done, failed or cancelled) and error
+    """
+    if job_id := request.args.get('job_id'):
+        job, error = jobs.get(job_id), 'Unknown job'
+    else:
+        job, error = start_analysis(request.args.get('num_profiles', type=int))
+
+    def stream():
+        if not job:
+            yield sse('done', {'status': 'failed', 'error': error})
+            return
+
+        yield sse('started', {'job_id': job.id})  # total arrives with the first progress event
+        since = 0
+        while True:
+            job.wait(since, timeout=STREAM_HEARTBEAT_SECONDS)
+            snapshot = job.to_dict(since=since)
+            for result in snapshot['results']:
+                yield sse('result', result)
+            since = snapshot['next']
+
+            if snapshot['status'] in ('done', 'failed', 'cancelled'):
+                yield sse('done', {'status': snapshot['status'], 'error': snapshot['error'],
+                                   'done': snapshot['done'], 'total': snapshot['total']})
+                return
+            yield sse('progress', {k: snapshot[k] for k in ('status', 'stage', 'done', 'total', 'eta')})
+
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Progress and partial results of a job; ?since=N skips results already seen."""
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    since = request.args.get('since', 0, type=int)
+    return jsonify({'success': True, 'job': job.to_dict(since=since)})
+
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Stop a job after the profile it is working on."""
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    job.cancel()
+    return jsonify({'success': True})
+
+
+@app.route('/runs')
+def runs():
+    """Stored runs, most recent first."""
+    return jsonify({
+        'success': True,
+        'runs': [{
+            'id': r.id,
+            'query': r.query,
+            'company': r.criteria.company,
+            'status': r.status,
+            'created_at': datetime.fromtimestamp(r.created_at).isoformat(timespec='seconds'),
+            'hits': r.hits,
+            'evaluated': r.evaluated,
+            'matches': r.matches
+        } for r in store.list_runs()]
+    })
 
 
 @app.route('/export')
 def export():
-    """Export results to Excel."""
-    if not browser_state['analyses']:
+    """Export a run's results to Excel (the current run, or ?run_id= for an older one)."""
+    run_id = request.args.get('run_id', type=int) or browser_state['run_id']
+    run = store.get_run(run_id) if run_id else None
+    analyses = store.run_analyses(run_id) if run else []
+    if not analyses:
         return jsonify({'success': False, 'error': 'No analysis results'})
 
-    analyses = browser_state['analyses']
-    criteria = browser_state['criteria']
+    criteria = run.criteria
+
+    # Tenure and months since leaving, computed locally for every candidate at once
+    months = None
+    if criteria:
+        table = work_history_table((a.url, a.work_history) for a in analyses)
+        months = CriteriaRules(criteria).summarize(table)
 
     data = []
     for a in analyses:
+        row = months.loc[a.url] if months is not None and a.url in months.index else None
         data.append({
             'Name': a.name,
             'LinkedIn URL': a.url,
@@ -232,6 +506,8 @@ def export():
             'Confidence': a.confidence,
             'Target Company': a.target_company or '',
             'Left Date': a.left_date or '',
+            'Months Since Left': row['months_since_left'] if row is not None else pd.NA,
+            'Tenure (months)': row['tenure_months'] if row is not None else pd.NA,
             'Reasoning': a.reasoning
         })
 
@@ -265,8 +541,11 @@ def status():
         'has_criteria': browser_state['criteria'] is not None,
         'has_results': browser_state['search_results'] is not None,
         'has_analyses': browser_state['analyses'] is not None,
+        'has_run': browser_state['run_id'] is not None,
         'num_results': len(browser_state['search_results']) if browser_state['search_results'] else 0,
-        'num_analyses': len(browser_state['analyses']) if browser_state['analyses'] else 0
+        'num_analyses': len(browser_state['analyses']) if browser_state['analyses'] else 0,
+        'job': active.to_dict(since=len(active.results)) if (active := jobs.active()) else None,
+        'resumable_run': RunJournal.latest_unfinished()
     })
 
 
@@ -278,4 +557,5 @@ if __name__ == '__main__':
     print("Open http://localhost:5000 in your browser")
     print("\nPress Ctrl+C to stop\n")
 
-    app.run(debug=False, port=5000, threaded=False)
+    # Browser commands go through the BrowserWorker thread, so requests can run concurrently
+    app.run(debug=False, port=5000, threaded=True)
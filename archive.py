@@ -0,0 +1,159 @@
+"""
+Raw page archive for offline re-parsing.
+
+Stores the raw experience-section payload of each profile visit (captured
+Voyager JSON or the DOM extraction items) in a content-addressed, gzip
+compressed store, so improved parsers can rebuild work histories without
+re-visiting LinkedIn.
+
+Usage:
+    python archive.py reparse [--workers N]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from cache import ProfileCache, canonical_profile_url, get_brain_cache_dir
+from scraper import WorkExperience, parse_experience_items
+from voyager import parse_positions
+
+
+class PageArchive:
+    """
+    Content-addressed store of raw experience payloads.
+
+    Layout:
+        objects/<2 hex>/<sha256>.json.gz   one blob per distinct payload
+        index.jsonl                        one line per visit (url, kind, digest, fetched_at)
+    """
+
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root else get_brain_cache_dir() / "archive"
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.jsonl"
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.json.gz"
+
+    def store(self, url: str, kind: str, payload) -> str:
+        """
+        Archive one visit's payload.
+
+        Args:
+            url: Profile URL
+            kind: "positions" (Voyager JSON) or "dom" (experience items)
+            payload: JSON-serializable raw payload
+
+        Returns:
+            The payload's sha256 digest
+        """
+        data = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+
+        with self._lock:
+            # Identical payloads are stored once
+            if not path.exists():
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(gzip.compress(data))
+                tmp.replace(path)
+
+            entry = {
+                "url": canonical_profile_url(url),
+                "kind": kind,
+                "digest": digest,
+                "fetched_at": time.time()
+            }
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+        return digest
+
+    def load(self, digest: str):
+        """Load a payload by digest."""
+        return json.loads(gzip.decompress(self._blob_path(digest).read_bytes()))
+
+    def latest(self) -> dict[str, dict]:
+        """Most recent index entry for each archived profile URL."""
+        entries = {}
+        if not self.index_path.exists():
+            return entries
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial line from an interrupted write
+                entries[entry["url"]] = entry
+        return entries
+
+
+def parse_payload(kind: str, payload) -> list[WorkExperience]:
+    """Parse an archived payload with the current parsers."""
+    if kind == "positions":
+        return [WorkExperience(**p) for p in parse_positions(payload)]
+    return parse_experience_items(payload)
+
+
+def _reparse_entry(args: tuple[str, dict]) -> tuple[dict, list[WorkExperience]]:
+    """Process pool worker: load and parse one archived visit."""
+    root, entry = args
+    payload = PageArchive(Path(root)).load(entry["digest"])
+    return entry, parse_payload(entry["kind"], payload)
+
+
+def reparse(
+    archive: PageArchive,
+    cache: ProfileCache | None = None,
+    workers: int | None = None
+) -> dict[str, list[WorkExperience]]:
+    """
+    Rebuild work histories from the latest archived visit of every profile.
+
+    Args:
+        archive: Archive to read
+        cache: If given, re-parsed histories replace the cached ones
+            (keeping the original visit time as fetched_at)
+        workers: Process pool size (defaults to CPU count)
+
+    Returns:
+        Dict of profile URL -> re-parsed work history
+    """
+    entries = list(archive.latest().values())
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [(str(archive.root), entry) for entry in entries]
+        for entry, work_history in pool.map(_reparse_entry, jobs, chunksize=16):
+            results[entry["url"]] = work_history
+            if cache and work_history:
+                cache.put(entry["url"], work_history, fetched_at=entry["fetched_at"])
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Brain raw page archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    reparse_cmd = commands.add_parser("reparse", help="Rebuild cached work histories from the archive")
+    reparse_cmd.add_argument("--workers", type=int, default=None, help="Process pool size")
+    args = parser.parse_args()
+
+    if args.command == "reparse":
+        archive = PageArchive()
+        started = time.monotonic()
+        results = reparse(archive, cache=ProfileCache(), workers=args.workers)
+        empty = sum(1 for history in results.values() if not history)
+        print(f"Re-parsed {len(results)} profiles in {time.monotonic() - started:.1f}s"
+              f" ({empty} with no experience found)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Asyncio browser management with persistent Chrome context.
+Async twin of browser.LinkedInBrowser, built on playwright.async_api.
+"""
+
+from playwright.async_api import async_playwright, BrowserContext, Page
+from browser import get_brain_profile_dir
+
+
+class AsyncLinkedInBrowser:
+    """Manages a persistent browser session for LinkedIn from an event loop."""
+
+    def __init__(self, headless: bool = False):
+        self.headless = headless
+        self._playwright = None
+        self._context: BrowserContext | None = None
+        self._page: Page | None = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def start(self):
+        """Start the browser with persistent context."""
+        profile_dir = get_brain_profile_dir()
+        profile_dir.mkdir(exist_ok=True)
+
+        self._playwright = await async_playwright().start()
+
+        # Use persistent context - login once, reuse session
+        self._context = await self._playwright.chromium.launch_persistent_context(
+            user_data_dir=str(profile_dir),
+            headless=self.headless,
+            args=[
+                "--disable-blink-features=AutomationControlled",  # Less detectable
+            ]
+        )
+
+        # Use existing page or create new one
+        if self._context.pages:
+            self._page = self._context.pages[0]
+        else:
+            self._page = await self._context.new_page()
+
+    async def close(self):
+        """Close browser and cleanup."""
+        try:
+            if self._context:
+                await self._context.close()
+        except Exception:
+            pass  # Browser may already be closed
+        try:
+            if self._playwright:
+                await self._playwright.stop()
+        except Exception:
+            pass
+
+    @property
+    def page(self) -> Page:
+        if not self._page:
+            raise RuntimeError("Browser not started. Call start() first.")
+        return self._page
+
+    @property
+    def context(self) -> BrowserContext:
+        if not self._context:
+            raise RuntimeError("Browser not started. Call start() first.")
+        return self._context
+
+    async def new_page(self) -> Page:
+        """Open an additional tab in the persistent context (shares the login session)."""
+        return await self.context.new_page()
+
+    async def goto_linkedin(self) -> bool:
+        """Navigate to LinkedIn and check if logged in."""
+        await self.page.goto("https://www.linkedin.com/feed/", timeout=60000)
+        await self.page.wait_for_load_state("domcontentloaded")
+
+        # Give page a moment to redirect if not logged in
+        await self.page.wait_for_timeout(2000)
+
+        # Check if we're on the feed (logged in) or redirected to login
+        current_url = self.page.url
+        is_logged_in = "/feed" in current_url or "/in/" in current_url
+
+        return is_logged_in
@@ -0,0 +1,229 @@
+"""
+Asyncio LinkedIn scraper.
+
+Async twin of scraper.LinkedInScraper: same selectors, in-page scripts and
+parsers, driven through playwright.async_api so one event loop can run many
+pages, timers and API calls at once.
+"""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator
+from async_browser import AsyncLinkedInBrowser
+from readiness import AsyncPageReadiness
+from voyager import AsyncVoyagerCapture, parse_positions, parse_search_hits, positions_complete
+from scraper import (
+    DEFAULT_CONCURRENCY,
+    EXPERIENCE_LOADED_SELECTOR,
+    EXPERIENCE_INIT_JS,
+    SCROLL_AND_EXTRACT_JS,
+    SCROLL_OPTIONS,
+    SEARCH_RESULT_SELECTOR,
+    SEARCH_RESULTS_JS,
+    LinkedInScraper,
+    ProfileResult,
+    WorkExperience,
+    _Tab,
+    build_search_url,
+    experience_url,
+    parse_experience_items,
+    parse_search_query,
+)
+
+
+class AsyncLinkedInScraper:
+    """Scrapes LinkedIn search results and profiles from an event loop."""
+
+    def __init__(self, browser: AsyncLinkedInBrowser, concurrency: int = DEFAULT_CONCURRENCY):
+        self.browser = browser
+        self.page = browser.page
+        self.ready = AsyncPageReadiness(self.page)
+        self.capture = AsyncVoyagerCapture(self.page)
+        self.concurrency = concurrency
+        self._main_tab = _Tab(page=self.page, ready=self.ready, capture=self.capture)
+        # Idle tabs for fetch_many; grown on demand
+        self._tabs: asyncio.Queue | None = None
+        self._tab_count = 0
+        self._nav_lock = asyncio.Lock()
+        self._last_start = 0.0
+        self._scripts_installed = False
+
+    async def _install_scripts(self):
+        """Register the in-page extractor once for the whole context."""
+        if not self._scripts_installed:
+            await self.browser.context.add_init_script(EXPERIENCE_INIT_JS)
+            self._scripts_installed = True
+
+    async def search(
+        self,
+        query: str,
+        max_pages: int = 1,
+        past_company_ids: list[str] | None = None
+    ) -> list[ProfileResult]:
+        """
+        Execute a search and return profile results.
+
+        Pages are addressed by URL, so the Past company filter needs company
+        IDs (see cache.CompanyCache) rather than a name.
+
+        Args:
+            query: Search keywords
+            max_pages: Maximum number of result pages to scrape
+            past_company_ids: LinkedIn company IDs for the Past company filter
+
+        Returns:
+            List of ProfileResult objects
+        """
+        parsed = parse_search_query(query)
+        all_results = []
+        seen_urls = set()
+
+        for page_num in range(1, max_pages + 1):
+            print(f"  Scraping page {page_num}...")
+            LinkedInScraper._before_navigation(self._main_tab)
+            await self.page.goto(build_search_url(parsed["keywords"], page_num, past_company_ids=past_company_ids), timeout=60000)
+            await self.page.wait_for_load_state("domcontentloaded")
+            await self.ready.wait_for_list(SEARCH_RESULT_SELECTOR)
+
+            results = [r for r in await self._extract_results(self._main_tab) if r.url not in seen_urls]
+            if not results:
+                print(f"  No results on page {page_num}, stopping.")
+                break
+
+            seen_urls.update(r.url for r in results)
+            all_results.extend(results)
+            print(f"  Found {len(results)} profiles on page {page_num}")
+
+        return all_results
+
+    async def _extract_results(self, tab: _Tab) -> list[ProfileResult]:
+        """Extract profile results from the search results page in `tab`."""
+        # Prefer the search JSON the page loaded, fall back to the DOM
+        if not tab.capture.search:
+            await tab.capture.collect_embedded("search")
+        hits = parse_search_hits(tab.capture.search)
+        if not hits:
+            hits = await tab.page.evaluate(SEARCH_RESULTS_JS, SEARCH_RESULT_SELECTOR)
+        return LinkedInScraper._profiles_from_hits(hits)
+
+    async def get_profile_experience(
+        self,
+        profile_url: str,
+        delay: float = 2.5,
+        debug: bool = False
+    ) -> list[WorkExperience]:
+        """
+        Visit a profile on the main page and extract work experience history.
+
+        Args:
+            profile_url: LinkedIn profile URL
+            delay: Seconds to wait before visiting (rate limiting)
+            debug: If True, save debug info to files
+
+        Returns:
+            List of WorkExperience objects
+        """
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        await self._install_scripts()
+        LinkedInScraper._before_navigation(self._main_tab)
+        await self.page.goto(experience_url(profile_url), timeout=60000)
+        await self.page.wait_for_load_state("domcontentloaded")
+
+        return await self._read_experience(self._main_tab, debug=debug)
+
+    async def fetch_many(
+        self,
+        profile_urls: list[str],
+        concurrency: int | None = None,
+        delay: float = 1.0
+    ) -> AsyncIterator[tuple[str, list[WorkExperience]]]:
+        """
+        Fetch work experience for many profiles across a pool of tabs.
+
+        Args:
+            profile_urls: LinkedIn profile URLs
+            concurrency: Number of tabs to use (defaults to self.concurrency)
+            delay: Minimum seconds between starting two profile visits (rate limiting)
+
+        Yields:
+            (profile_url, work_history) tuples in completion order
+        """
+        limit = max(1, concurrency or self.concurrency)
+        semaphore = asyncio.Semaphore(limit)
+        await self._install_scripts()
+
+        async def fetch(url: str) -> tuple[str, list[WorkExperience]]:
+            async with semaphore:
+                tab = await self._acquire_tab(limit)
+                try:
+                    await self._pace(delay)
+                    LinkedInScraper._before_navigation(tab)
+                    await tab.page.goto(experience_url(url), timeout=60000)
+                    return url, await self._read_experience(tab)
+                except Exception as e:
+                    print(f"    Warning: Could not open {url}: {e}")
+                    return url, []
+                finally:
+                    self._tabs.put_nowait(tab)
+
+        tasks = [asyncio.ensure_future(fetch(url)) for url in profile_urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _acquire_tab(self, limit: int) -> _Tab:
+        """Take an idle tab from the pool, opening one if all are busy and under limit."""
+        if self._tabs is None:
+            self._tabs = asyncio.Queue()
+            self._tabs.put_nowait(self._main_tab)
+            self._tab_count = 1
+        if self._tabs.empty() and self._tab_count < limit:
+            self._tab_count += 1
+            page = await self.browser.new_page()
+            return _Tab(page=page, ready=AsyncPageReadiness(page), capture=AsyncVoyagerCapture(page))
+        return await self._tabs.get()
+
+    async def _pace(self, delay: float):
+        """Space navigation starts at least `delay` seconds apart across all tabs."""
+        async with self._nav_lock:
+            wait = self._last_start + delay - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_start = time.monotonic()
+
+    async def _read_experience(self, tab: _Tab, debug: bool = False) -> list[WorkExperience]:
+        """Wait for the experience details page in `tab` to load and extract it."""
+        page, ready, capture = tab.page, tab.ready, tab.capture
+        try:
+            # Prefer the positions JSON the page loaded: exact dates, no scrolling
+            await ready.wait_for_network_quiet()
+            if not capture.positions and await ready.wait_for_selector(EXPERIENCE_LOADED_SELECTOR):
+                await capture.collect_embedded("positions")
+            # A partly captured paginated payload would truncate long careers; read the DOM instead
+            experiences = []
+            if positions_complete(capture.positions):
+                experiences = [WorkExperience(**p) for p in parse_positions(capture.positions)]
+            if experiences:
+                return experiences
+
+            # DOM fallback: scroll until the list stops growing, extract in the same call
+            exp_data = await page.evaluate(SCROLL_AND_EXTRACT_JS, SCROLL_OPTIONS)
+            if exp_data is None:
+                await page.evaluate(EXPERIENCE_INIT_JS)
+                exp_data = await page.evaluate(SCROLL_AND_EXTRACT_JS, SCROLL_OPTIONS)
+
+            if debug and exp_data:
+                with open("debug_raw_experience.json", "w", encoding="utf-8") as f:
+                    json.dump(exp_data, f, indent=2, ensure_ascii=False)
+
+            return parse_experience_items(exp_data)
+
+        except Exception as e:
+            print(f"    Warning: Error extracting experience: {e}")
+            return []
@@ -4,8 +4,37 @@ Reuses existing Chrome login session for LinkedIn.
 """
 
 import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page, Route, Response
+
+
+# Resource types the scraper never reads
+LEAN_BLOCKED_TYPES = {"image", "media", "font"}
+
+# Tracking beacons and ad/analytics endpoints
+LEAN_BLOCKED_URLS = re.compile(
+    r"linkedin\.com/(li/track|tscp-serving|csp/dtag|platform-telemetry|sensorCollect)"
+    r"|px\.ads\.linkedin\.com|snap\.licdn\.com/li\.lms-analytics"
+    r"|doubleclick\.net|google-analytics\.com|googletagmanager\.com"
+)
+
+# Smaller than Playwright's 1280x720 default, still wide enough for the full results layout
+LEAN_VIEWPORT = {"width": 1024, "height": 640}
+
+# Turns off CSS animations and transitions so content settles immediately
+DISABLE_ANIMATIONS_JS = """(() => {
+    const css = '*, *::before, *::after { animation: none !important; transition: none !important; scroll-behavior: auto !important; }';
+    const add = () => {
+        const style = document.createElement('style');
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) add();
+    else document.addEventListener('DOMContentLoaded', add);
+})();"""
 
 
 def get_brain_profile_dir() -> Path:
@@ -18,11 +47,35 @@ def get_brain_profile_dir() -> Path:
     return Path(__file__).parent / ".brain_profile"
 
 
+@dataclass
+class LeanStats:
+    """Traffic counters for lean page mode."""
+    blocked: Counter = field(default_factory=Counter)  # resource type -> requests blocked
+    allowed_requests: int = 0
+    allowed_bytes: int = 0    # From Content-Length of responses that were let through
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked.values())
+
+    def summary(self, profiles: int = 0) -> str:
+        """One-line report, with per-profile averages if profiles > 0."""
+        text = (f"Lean mode: blocked {self.blocked_requests} requests "
+                f"({', '.join(f'{k}: {v}' for k, v in self.blocked.most_common()) or 'none'}), "
+                f"loaded {self.allowed_requests} requests / {self.allowed_bytes / 1e6:.1f} MB")
+        if profiles > 0:
+            text += (f"; per profile: {self.blocked_requests / profiles:.0f} blocked, "
+                     f"{self.allowed_bytes / profiles / 1e3:.0f} KB loaded")
+        return text
+
+
 class LinkedInBrowser:
     """Manages a persistent browser session for LinkedIn."""
 
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, lean: bool = False):
         self.headless = headless
+        self.lean = lean
+        self.lean_stats = LeanStats()
         self._playwright = None
         self._context: BrowserContext | None = None
         self._page: Page | None = None
@@ -34,8 +87,19 @@ class LinkedInBrowser:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
-    def start(self):
-        """Start the browser with persistent context."""
+    def start(self, lean: bool | None = None):
+        """
+        Start the browser with persistent context.
+
+        Args:
+            lean: Block images, media, fonts and telemetry, disable CSS
+                animations and use a smaller viewport. Defaults to the value
+                given to the constructor. Log in once without it, since the
+                login page may need images (e.g. captchas).
+        """
+        if lean is not None:
+            self.lean = lean
+
         profile_dir = get_brain_profile_dir()
         profile_dir.mkdir(exist_ok=True)
 
@@ -45,17 +109,44 @@ class LinkedInBrowser:
         self._context = self._playwright.chromium.launch_persistent_context(
             user_data_dir=str(profile_dir),
             headless=self.headless,
+            viewport=LEAN_VIEWPORT if self.lean else None,
             args=[
                 "--disable-blink-features=AutomationControlled",  # Less detectable
             ]
         )
 
+        if self.lean:
+            self._install_lean_mode()
+
         # Use existing page or create new one
         if self._context.pages:
             self._page = self._context.pages[0]
         else:
             self._page = self._context.new_page()
 
+    def _install_lean_mode(self):
+        """Route rules and init script for lean page mode."""
+        self._context.route("**/*", self._lean_route)
+        self._context.on("response", self._count_response)
+        self._context.add_init_script(DISABLE_ANIMATIONS_JS)
+
+    def _lean_route(self, route: Route):
+        request = route.request
+        if request.resource_type in LEAN_BLOCKED_TYPES:
+            self.lean_stats.blocked[request.resource_type] += 1
+            route.abort("blockedbyclient")
+        elif LEAN_BLOCKED_URLS.search(request.url):
+            self.lean_stats.blocked["telemetry"] += 1
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    def _count_response(self, response: Response):
+        self.lean_stats.allowed_requests += 1
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.lean_stats.allowed_bytes += int(length)
+
     def close(self):
         """Close browser and cleanup."""
         try:
@@ -75,6 +166,16 @@ class LinkedInBrowser:
             raise RuntimeError("Browser not started. Call start() first.")
         return self._page
 
+    @property
+    def context(self) -> BrowserContext:
+        if not self._context:
+            raise RuntimeError("Browser not started. Call start() first.")
+        return self._context
+
+    def new_page(self) -> Page:
+        """Open an additional tab in the persistent context (shares the login session)."""
+        return self.context.new_page()
+
     def goto_linkedin(self) -> bool:
         """Navigate to LinkedIn and check if logged in."""
         self.page.goto("https://www.linkedin.com/feed/", timeout=60000)
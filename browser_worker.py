@@ -0,0 +1,156 @@
+"""
+Browser actor for the web UI.
+
+Playwright's sync API only works from the thread that started it. A
+BrowserWorker owns that thread: it holds the LinkedInBrowser and
+LinkedInScraper and runs commands sent through a queue, returning results
+via futures. Any other thread (Flask request handlers, background jobs)
+can then use the browser safely, so the web server can run threaded.
+
+BrowserWorker has the search() and fetch_many() signatures of
+LinkedInScraper, so it can be handed to AnalysisPipeline directly.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import closing
+from typing import Any, Callable, Iterable, Iterator
+from archive import PageArchive
+from browser import LinkedInBrowser
+from cache import CompanyCache, ProfileCache
+from scraper import LinkedInScraper, ProfileResult, WorkExperience
+
+
+_DONE = object()
+
+
+class BrowserWorker:
+    """Owns the browser on a dedicated thread and runs commands for other threads."""
+
+    def __init__(self):
+        self.browser: LinkedInBrowser | None = None
+        self.scraper: LinkedInScraper | None = None
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="brain-browser", daemon=True)
+        self._thread.start()
+
+    @property
+    def started(self) -> bool:
+        return self.browser is not None
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) to run on the browser thread."""
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def call(self, fn: Callable[..., Any], *args, timeout: float | None = None, **kwargs) -> Any:
+        """Run fn on the browser thread and wait for its result."""
+        return self.submit(fn, *args, **kwargs).result(timeout=timeout)
+
+    def _run(self):
+        while True:
+            future, fn, args, kwargs = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _require_scraper(self) -> LinkedInScraper:
+        if not self.scraper:
+            raise RuntimeError("Browser not launched")
+        return self.scraper
+
+    # Commands
+
+    def launch(self, lean: bool = False, archive: PageArchive | None = None) -> bool:
+        """
+        Start the browser (once) and check the LinkedIn login.
+
+        Args:
+            lean: Start in lean page mode (see LinkedInBrowser.start)
+            archive: Optional raw payload archive for the scraper
+
+        Returns:
+            True if logged into LinkedIn
+        """
+        def launch():
+            if self.browser is None:
+                browser = LinkedInBrowser(headless=False, lean=lean)
+                browser.start()
+                self.scraper = LinkedInScraper(
+                    browser,
+                    cache=ProfileCache(),
+                    archive=archive,
+                    companies=CompanyCache()
+                )
+                self.browser = browser
+            return self.browser.goto_linkedin()
+
+        return self.call(launch)
+
+    def check_login(self) -> bool:
+        """Reload the feed and report whether the session is logged in."""
+        if not self.browser:
+            raise RuntimeError("Browser not launched")
+        return self.call(self.browser.goto_linkedin)
+
+    def search(self, query: str, max_pages: int = 1, past_company: str | None = None) -> list[ProfileResult]:
+        """LinkedInScraper.search on the browser thread."""
+        return self.call(lambda: self._require_scraper().search(
+            query, max_pages=max_pages, past_company=past_company
+        ))
+
+    def get_profile_experience(self, profile_url: str, **kwargs) -> list[WorkExperience]:
+        """LinkedInScraper.get_profile_experience on the browser thread."""
+        return self.call(lambda: self._require_scraper().get_profile_experience(profile_url, **kwargs))
+
+    def fetch_many(self, profile_urls: Iterable[str], **kwargs) -> Iterator[tuple[str, list[WorkExperience]]]:
+        """
+        LinkedInScraper.fetch_many on the browser thread, streamed to the caller.
+
+        Profiles are yielded as the browser thread finishes them. The hand-off
+        holds one profile, so the browser waits while the caller is busy
+        (keeping the pipeline's backpressure). If the caller stops iterating,
+        the browser stops after the profile in hand.
+        """
+        results: queue.Queue = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        profile_urls = list(profile_urls)
+
+        def put(item) -> bool:
+            """Wait for room in the hand-off; False once the caller has gone."""
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch():
+            try:
+                with closing(self._require_scraper().fetch_many(profile_urls, **kwargs)) as fetched:
+                    for item in fetched:
+                        if not put(item):
+                            break
+            finally:
+                put(_DONE)
+
+        future = self.submit(fetch)
+        try:
+            while (item := results.get()) is not _DONE:
+                yield item
+            future.result()  # Re-raise scraper errors
+        finally:
+            stop.set()
+
+    def close(self):
+        """Close the browser."""
+        if self.browser:
+            self.call(self.browser.close)
+            self.browser = None
+            self.scraper = None
@@ -0,0 +1,278 @@
+"""
+On-disk caches so repeat searches don't re-visit LinkedIn or re-ask Claude.
+
+Profiles are keyed by canonical profile URL and store the parsed work history,
+a content hash of the experience section and when it was fetched. Company
+names are mapped to the LinkedIn company IDs used by search URL filters.
+Evaluation results are keyed by a criteria fingerprint and a work history hash.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from scraper import WorkExperience
+
+
+# How long a cached profile is used without re-visiting LinkedIn
+DEFAULT_PROFILE_TTL = 7 * 24 * 3600
+
+# Evaluation cache size before least recently used results are evicted
+DEFAULT_EVALUATION_CACHE_BYTES = 20 * 1024 * 1024
+
+
+def get_brain_cache_dir() -> Path:
+    """Get the Brain cache directory."""
+    # Allow override via environment variable
+    if custom_path := os.environ.get("BRAIN_CACHE_DIR"):
+        return Path(custom_path)
+
+    return Path(__file__).parent / ".brain_cache"
+
+
+def canonical_profile_url(url: str) -> str:
+    """Normalize a profile URL to https://www.linkedin.com/in/<slug>."""
+    match = re.search(r'/in/([^/?#]+)', url)
+    if not match:
+        return url.rstrip('/')
+    slug = urllib.parse.unquote(match.group(1)).lower()
+    return f"https://www.linkedin.com/in/{slug}"
+
+
+def work_history_hash(work_history: list[WorkExperience]) -> str:
+    """
+    Content hash of an experience section.
+
+    Uses company, title and dates only: durations of current roles grow every
+    month without the profile changing.
+    """
+    entries = [[e.company, e.title, e.start_date, e.end_date] for e in work_history]
+    return hashlib.sha256(json.dumps(entries).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedProfile:
+    """A cached profile visit."""
+    url: str
+    work_history: list[WorkExperience]
+    content_hash: str
+    fetched_at: float   # Last time the profile was visited
+    changed_at: float   # Last time the experience section was different
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+
+class ProfileCache:
+    """SQLite-backed cache of parsed profile work histories."""
+
+    def __init__(self, path: Path | None = None, ttl: float = DEFAULT_PROFILE_TTL):
+        if path is None:
+            get_brain_cache_dir().mkdir(exist_ok=True)
+            path = get_brain_cache_dir() / "profiles.sqlite3"
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                url TEXT PRIMARY KEY,
+                work_history TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                changed_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, url: str, max_age: float | None = None) -> CachedProfile | None:
+        """
+        Look up a profile.
+
+        Args:
+            url: Profile URL in any form
+            max_age: Only return entries fetched within this many seconds
+                (defaults to the cache TTL). Pass float("inf") to ignore age.
+
+        Returns:
+            CachedProfile, or None if missing or stale
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, work_history, content_hash, fetched_at, changed_at FROM profiles WHERE url = ?",
+                (canonical_profile_url(url),)
+            ).fetchone()
+        if not row:
+            return None
+
+        entry = CachedProfile(
+            url=row[0],
+            work_history=[WorkExperience(**e) for e in json.loads(row[1])],
+            content_hash=row[2],
+            fetched_at=row[3],
+            changed_at=row[4]
+        )
+        if not entry.is_fresh(self.ttl if max_age is None else max_age):
+            return None
+        return entry
+
+    def put(
+        self,
+        url: str,
+        work_history: list[WorkExperience],
+        fetched_at: float | None = None
+    ) -> CachedProfile:
+        """
+        Store a fresh visit. If the experience section hash is unchanged,
+        changed_at keeps its old value so earlier evaluations stay valid;
+        otherwise it is now, even when fetched_at is backdated.
+
+        Args:
+            url: Profile URL in any form
+            work_history: Parsed work history
+            fetched_at: When the page was visited (defaults to now); set when
+                re-parsing an archived visit
+        """
+        url = canonical_profile_url(url)
+        content_hash = work_history_hash(work_history)
+        now = time.time() if fetched_at is None else fetched_at
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash, changed_at FROM profiles WHERE url = ?", (url,)
+            ).fetchone()
+            # A re-parse of an old visit still changes the history evaluations saw today
+            changed_at = row[1] if row and row[0] == content_hash else time.time()
+            self._db.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?)",
+                (url, json.dumps([asdict(e) for e in work_history]), content_hash, now, changed_at)
+            )
+            self._db.commit()
+
+        return CachedProfile(url, work_history, content_hash, now, changed_at)
+
+    def evaluation_valid(self, url: str, content_hash: str, evaluated_at: float) -> bool:
+        """
+        True if an evaluation of the work history with content_hash, made at
+        evaluated_at, still holds: the profile was visited within the TTL and
+        its experience section has not changed since.
+        """
+        entry = self.get(url)
+        return entry is not None and entry.content_hash == content_hash and entry.changed_at <= evaluated_at
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CompanyCache:
+    """JSON file mapping company names to LinkedIn company IDs (URN numbers)."""
+
+    def __init__(self, path: Path | None = None):
+        if path is None:
+            get_brain_cache_dir().mkdir(exist_ok=True)
+            path = get_brain_cache_dir() / "companies.json"
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return " ".join(name.lower().split())
+
+    def get(self, name: str) -> list[str] | None:
+        """Company IDs for a name, or None if it hasn't been resolved yet."""
+        entry = self._entries.get(self._key(name))
+        return entry["ids"] if entry else None
+
+    def put(self, name: str, ids: list[str]):
+        """Remember the company IDs LinkedIn resolved for a name."""
+        with self._lock:
+            self._entries[self._key(name)] = {"name": name, "ids": ids, "resolved_at": time.time()}
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._entries, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+
+
+class EvaluationCache:
+    """
+    SQLite-backed cache of evaluation results with size-based LRU eviction.
+
+    Keys are (criteria fingerprint, work history hash); see
+    evaluator.criteria_fingerprint for how date-relative criteria expire.
+    """
+
+    def __init__(self, path: Path | None = None, max_bytes: int = DEFAULT_EVALUATION_CACHE_BYTES):
+        if path is None:
+            get_brain_cache_dir().mkdir(exist_ok=True)
+            path = get_brain_cache_dir() / "evaluations.sqlite3"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS evaluations (
+                criteria_key TEXT NOT NULL,
+                history_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (criteria_key, history_hash)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS evaluations_last_used ON evaluations (last_used)")
+        self._db.commit()
+
+    def get(self, criteria_key: str, history_hash: str) -> dict | None:
+        """Cached EvaluationResult fields, or None. Marks the entry as recently used."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM evaluations WHERE criteria_key = ? AND history_hash = ?",
+                (criteria_key, history_hash)
+            ).fetchone()
+            if not row:
+                return None
+            self._db.execute(
+                "UPDATE evaluations SET last_used = ? WHERE criteria_key = ? AND history_hash = ?",
+                (time.time(), criteria_key, history_hash)
+            )
+            self._db.commit()
+        return json.loads(row[0])
+
+    def put(self, criteria_key: str, history_hash: str, result: dict):
+        """Store EvaluationResult fields, evicting old entries past max_bytes."""
+        data = json.dumps(result)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?)",
+                (criteria_key, history_hash, data, len(data), time.time())
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the total size fits. Caller holds the lock."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM evaluations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT rowid, size FROM evaluations ORDER BY last_used"
+        ).fetchall()
+        doomed = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((rowid,))
+            total -= size
+        self._db.executemany("DELETE FROM evaluations WHERE rowid = ?", doomed)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
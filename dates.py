@@ -0,0 +1,189 @@
+"""
+Month-level date helpers for work history dates.
+
+LinkedIn shows dates as "Jan 2020", "2020" or "Present". Dates are handled as
+month ordinals (year * 12 + month - 1) so ranges compare and subtract as
+plain integers. A year without a month is the range of its twelve months.
+
+For a whole run, work_history_table() normalizes every position into one
+pandas table so tenure, months since leaving and window membership are
+computed for all candidates in a single vectorized pass.
+"""
+
+import re
+from datetime import datetime
+from typing import Iterable
+import numpy as np
+import pandas as pd
+from scraper import WorkExperience
+
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+MONTH_YEAR_PATTERN = re.compile(r"\b([A-Za-z]{3})[a-z]*\.?\s+(\d{4})\b")
+YEAR_PATTERN = re.compile(r"\b(19|20)\d{2}\b")
+DURATION_PATTERN = re.compile(r"(?:(\d+)\s*yrs?)?\s*(?:(\d+)\s*mos?)?", re.IGNORECASE)
+
+
+def month_ordinal(year: int, month: int) -> int:
+    """Ordinal of a calendar month."""
+    return year * 12 + month - 1
+
+
+def current_month(today: datetime | None = None) -> int:
+    """Ordinal of the current month."""
+    today = today or datetime.now()
+    return month_ordinal(today.year, today.month)
+
+
+def format_month(ordinal: int) -> str:
+    """Ordinal -> "Jan 2020"."""
+    year, month = divmod(ordinal, 12)
+    return f"{MONTH_NAMES[month]} {year}"
+
+
+def is_present(text: str | None) -> bool:
+    """True for end dates of ongoing roles."""
+    return bool(text) and text.strip().lower() in ("present", "now", "current")
+
+
+def parse_month_range(text: str | None) -> tuple[int, int] | None:
+    """
+    Parse a LinkedIn date into the range of month ordinals it may mean.
+
+    Args:
+        text: "Jan 2020", "January 2020" or "2020"
+
+    Returns:
+        (first, last) month ordinals, equal when the month is known, or None
+        if the text is not a date
+    """
+    if not text:
+        return None
+
+    match = MONTH_YEAR_PATTERN.search(text)
+    if match and match.group(1).lower() in MONTHS:
+        ordinal = month_ordinal(int(match.group(2)), MONTHS[match.group(1).lower()])
+        return ordinal, ordinal
+
+    match = YEAR_PATTERN.search(text)
+    if match:
+        year = int(match.group(0))
+        return month_ordinal(year, 1), month_ordinal(year, 12)
+
+    return None
+
+
+def parse_duration_months(text: str | None) -> int | None:
+    """"2 yrs 3 mos" -> 27, or None if the text has no duration."""
+    if not text:
+        return None
+    match = DURATION_PATTERN.search(text.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    return int(match.group(1) or 0) * 12 + int(match.group(2) or 0)
+
+
+def work_history_table(
+    histories: Iterable[tuple[str, list[WorkExperience]]],
+    today: datetime | None = None
+) -> pd.DataFrame:
+    """
+    One row per position across all candidates, dates as month ordinals.
+
+    Args:
+        histories: (candidate key, work_history) pairs, e.g. profile URLs
+        today: Reference date for "Present"
+
+    Returns:
+        DataFrame with columns candidate, company, title, start_month,
+        end_first, end_last (nullable ints) and is_current. end_first and
+        end_last differ when only the year is known; ongoing roles end in
+        the current month. A missing start is derived from the duration.
+    """
+    now = current_month(today)
+    rows = []
+    for candidate, work_history in histories:
+        for exp in work_history:
+            start = parse_month_range(exp.start_date)
+            current = is_present(exp.end_date)
+            end = (now, now) if current else parse_month_range(exp.end_date)
+            duration = parse_duration_months(exp.duration)
+            start_month = start[0] if start else None
+            if start_month is None and end and duration:
+                start_month = end[1] - duration + 1
+            rows.append((
+                candidate, exp.company, exp.title, start_month,
+                end[0] if end else None, end[1] if end else None, current
+            ))
+
+    table = pd.DataFrame(rows, columns=[
+        "candidate", "company", "title", "start_month", "end_first", "end_last", "is_current"
+    ])
+    for column in ("start_month", "end_first", "end_last"):
+        table[column] = table[column].astype("Int64")
+    table["is_current"] = table["is_current"].astype(bool)
+    return table
+
+
+def candidate_months(
+    table: pd.DataFrame,
+    at_company: pd.Series,
+    earliest: int | None = None,
+    latest: int | None = None,
+    today: datetime | None = None
+) -> pd.DataFrame:
+    """
+    Per-candidate tenure, leave month and window membership at one company.
+
+    Args:
+        table: From work_history_table()
+        at_company: Boolean mask of table rows that are at the target company
+        earliest: First month of the leave window (inclusive), or None
+        latest: Last month of the leave window (inclusive), or None
+        today: Reference date for months since leaving
+
+    Returns:
+        DataFrame indexed by candidate with worked_there, is_current,
+        tenure_months, left_first, left_last, months_since_left and
+        in_window (True/False, or NA when the leave month is unknown or
+        straddles a bound). Candidates without rows at the company are
+        included with worked_there False.
+    """
+    now = current_month(today)
+    rows = table[at_company.to_numpy(dtype=bool)]
+    tenure = (rows["end_last"] - rows["start_month"] + 1).clip(lower=0)
+
+    grouped = rows.assign(tenure_months=tenure).groupby("candidate")
+    summary = pd.DataFrame({
+        "is_current": grouped["is_current"].any(),
+        "tenure_months": grouped["tenure_months"].sum(min_count=1),
+        # Leaving the company means leaving its latest position
+        "left_first": grouped["end_first"].max(),
+        "left_last": grouped["end_last"].max()
+    })
+    summary = summary.reindex(table["candidate"].unique())
+    summary.index.name = "candidate"
+    summary.insert(0, "worked_there", summary.index.isin(rows["candidate"].unique()))
+    summary["is_current"] = summary["is_current"].fillna(False).astype(bool)
+
+    left_first = summary["left_first"].astype("Int64").mask(summary["is_current"])
+    left_last = summary["left_last"].astype("Int64").mask(summary["is_current"])
+    summary["left_first"] = left_first
+    summary["left_last"] = left_last
+    summary["months_since_left"] = now - left_last
+
+    lo = -np.inf if earliest is None else earliest
+    hi = np.inf if latest is None else latest
+    inside = (left_first >= lo) & (left_last <= hi)
+    outside = (left_last < lo) | (left_first > hi)
+    in_window = pd.Series(pd.NA, index=summary.index, dtype="boolean")
+    in_window[inside.fillna(False).astype(bool)] = True
+    in_window[outside.fillna(False).astype(bool)] = False
+    summary["in_window"] = in_window
+    return summary
@@ -5,12 +5,171 @@ Parses natural language queries and evaluates candidates against extracted crite
 """
 
 import os
+import copy
+import hashlib
 import json
-from dataclasses import dataclass
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, asdict
 from datetime import datetime
+from typing import TYPE_CHECKING, Iterator, Sequence
 import anthropic
+from dates import candidate_months, current_month, format_month, is_present, parse_month_range
 from scraper import WorkExperience
 
+if TYPE_CHECKING:
+    from cache import EvaluationCache
+
+
+# Claude requests in flight at once in evaluate_many
+DEFAULT_EVALUATE_CONCURRENCY = 8
+
+# Retries for rate limits, overload (529), 5xx and connection errors
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Batched evaluation: estimated work-history tokens per request, and a hard cap
+BATCH_TOKEN_BUDGET = 6000
+MAX_BATCH_SIZE = 20
+
+# Response tokens allowed per candidate in a batch
+BATCH_TOKENS_PER_CANDIDATE = 150
+
+# Anthropic only caches prompt prefixes of at least this many tokens (Sonnet)
+MIN_CACHEABLE_TOKENS = 1024
+
+# Evaluation instructions that don't depend on the query. Sent first as their
+# own cached system block so every run shares one cache entry; it has to stay
+# above MIN_CACHEABLE_TOKENS for that to take effect.
+EVALUATION_RUBRIC = """You are a recruiting researcher. You decide whether a candidate's LinkedIn work history \
+satisfies a recruiter's search criteria. You only see the experience section: company names, job titles, \
+start and end dates and durations, exactly as the candidate entered them. Judge from that evidence alone \
+and never assume facts that the history does not show.
+
+HOW TO READ A WORK HISTORY
+- Each line is one position: "<title> at <company> (<start> - <end>)". A duration such as "2 yrs 3 mos" \
+may appear instead of dates.
+- Positions are usually listed newest first, but do not rely on the order; compare the dates.
+- Several consecutive positions at the same company are promotions or internal moves, not separate \
+employments. The candidate left the company when their LAST position there ended.
+- A candidate may have worked at the same company twice (a "boomerang"). Use the most recent stint when \
+deciding whether and when they left, and mention the earlier stint if it matters.
+- Overlapping positions (a side project, board seat or advisory role next to a full-time job) are \
+normal. Only a position at the target company counts toward the criteria.
+- Internships, co-ops, contract and freelance positions count as having worked at a company unless the \
+criteria say otherwise, but lower your confidence when the only stint is one of these.
+- "Self-employed", "Stealth", "Stealth Startup" and "Confidential" are real entries; they are never the \
+target company unless the criteria name them.
+
+MATCHING THE COMPANY
+- Company names vary. Ignore legal suffixes and decorations such as Inc., LLC, Ltd., Corp., \
+Technologies, "Full-time" or "Contract".
+- Products, brands and subsidiaries count as the parent company: Instagram, WhatsApp, Facebook and \
+Oculus count as Meta; YouTube, DeepMind and Google Cloud count as Google; AWS and Alexa count as Amazon; \
+LinkedIn, GitHub and Azure count as Microsoft; Uber Eats counts as Uber.
+- Companies acquired by the target count only for time after the acquisition, and only when the \
+history shows the candidate was there after the acquisition. If unsure, say so and lower your confidence.
+- If the criteria name a team or product (for example "Uber Eats" or "Google Maps"), the candidate must \
+have worked on it. Accept a title or company line that names it ("Software Engineer, Maps" or \
+"Uber Eats"). A plain parent-company position without any mention of the team is not proof; treat it as \
+a likely non-match with low confidence rather than a match.
+- Recruiting agencies, consultancies and outsourcing firms that place people at the target company do \
+not count, unless the title says the work was done for the target company.
+
+MATCHING THE ROLE
+- Role keywords describe the kind of work, not an exact title. Accept common synonyms and seniority \
+levels: "engineer" covers Software Engineer, SWE, Developer, Member of Technical Staff, Senior, Staff \
+and Principal Engineer; "product manager" covers PM, Group PM and Product Lead; "designer" covers \
+Product Designer, UX and UI Designer.
+- Qualifiers in the keywords narrow the role. "Data engineer" is not met by a generic Software Engineer \
+title, and "ML engineer" is not met by a Frontend Engineer title. Engineering managers match \
+"engineer" only when the criteria are about engineering leadership.
+- The role must have been held AT the target company. Having the role elsewhere does not count.
+
+DETERMINING WHEN THEY LEFT
+- An end date of "Present" means the candidate still works there. Current employees only match when \
+the criteria say current employees are allowed.
+- Compare dates at month granularity. A date given as only a year ("2023") could be any month of that \
+year; if the answer depends on the month, use low confidence.
+- Window bounds are inclusive. "Left after X" means the last month at the company is X or later, and \
+"left before X" means it is X or earlier, so leaving in month X itself satisfies either. "Left within the last N months" and "left more than N months ago" are measured from \
+today's date, given below.
+- When dates are missing, derive them from the duration if you can. Otherwise report the left date as \
+"Unknown" and decide with low confidence.
+- A gap after leaving, or a new job starting before the old one ended, does not change the month they \
+left.
+
+DATE ARITHMETIC
+Count months carefully:
+- Aug 2024 to Jan 2026 = 17 months
+- Dec 2023 to Jan 2026 = 25 months
+- Jan 2025 to Jan 2026 = 12 months
+- If someone shows "Present" for a company, they still work there.
+
+CONFIDENCE
+- high: the history states everything needed (company, role and dates) and the decision does not \
+depend on interpretation.
+- medium: a reasonable reading of the evidence decides it, such as a title synonym or a product that \
+belongs to the parent company.
+- low: key facts are missing or ambiguous, such as year-only dates on a window boundary, an unclear \
+employer name or no mention of the requested team.
+
+EXAMPLES
+- Criteria: worked at Uber, engineer, left after January 2023, former employees only. History: "Senior \
+Software Engineer at Uber (Mar 2021 - Jun 2024)" then "Staff Engineer at Stripe (Jul 2024 - Present)". \
+Match, high confidence: an engineer at Uber who left in June 2024.
+- Criteria: worked at Uber, left after June 2023. History: "Software Engineer at Uber (2019 - 2023)". \
+The candidate left in some month of 2023, which may be before June. Possible match, low confidence, left \
+date "2023". With "left after January 2023" every month of 2023 qualifies, so it would be a match.
+- Criteria: worked at Meta, designer. History: "Product Designer at Instagram (Feb 2020 - Aug 2022)". \
+Match, medium confidence: Instagram is part of Meta.
+- Criteria: worked at Google on Google Maps, engineer. History: "Software Engineer at Google \
+(May 2018 - Dec 2021)" with no mention of Maps. Non-match, low confidence: the team is not shown.
+- Criteria: worked at Amazon, former employees only. History: "SDE II at Amazon Web Services \
+(Jan 2020 - Present)". Non-match, high confidence: still at Amazon.
+
+REASONING
+Explain the decision in one or two plain sentences that a recruiter can check against the profile: name \
+the position and dates that decided it, or the criterion that was not met. Do not restate the criteria \
+and do not speculate beyond the history."""
+
+SINGLE_RESPONSE_FORMAT = """Evaluate the candidate in the user message.
+
+Respond in this exact format:
+TARGET_COMPANY: [the company from criteria]
+WORKED_THERE: [Yes/No]
+LEFT_DATE: [Month Year, or "Still there", or "Unknown"]
+MATCHES_CRITERIA: [Yes/No]
+CONFIDENCE: [high/medium/low]
+REASONING: [1-2 sentence explanation of why they match or don't match]"""
+
+BATCH_RESPONSE_FORMAT = """Evaluate each candidate in the user message.
+
+Respond with a JSON array (no markdown, just raw JSON) containing exactly one object per candidate:
+[
+  {
+    "id": "c1",
+    "target_company": "...",
+    "worked_there": true or false,
+    "left_date": "Month Year" or "Still there" or "Unknown",
+    "matches_criteria": true or false,
+    "confidence": "high" or "medium" or "low",
+    "reasoning": "1-2 sentence explanation"
+  }
+]"""
+
+TRANSIENT_ERRORS = (
+    anthropic.RateLimitError,
+    anthropic.APIConnectionError,   # Includes APITimeoutError
+    anthropic.InternalServerError,  # 5xx
+    # Newer SDKs raise these for 529 and 503 instead of InternalServerError
+    *(getattr(anthropic, name) for name in ("OverloadedError", "ServiceUnavailableError") if hasattr(anthropic, name)),
+)
+
 
 @dataclass
 class SearchCriteria:
@@ -25,6 +184,7 @@ class SearchCriteria:
     still_employed_ok: bool = False    # If True, current employees match
     original_query: str = ""
     linkedin_search_query: str = ""    # Optimized query for LinkedIn search
+    parsed: bool = True                # False if parsing failed and company is the raw query
 
 
 @dataclass
@@ -37,6 +197,38 @@ class EvaluationResult:
     confidence: str = "medium"  # low, medium, high
 
 
+@dataclass
+class UsageStats:
+    """Token usage across Claude requests, including prompt cache hits."""
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def add(self, usage):
+        """Add a Messages API response's usage block."""
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+            self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+            self.cache_read_input_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+            self.cache_creation_input_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.input_tokens = self.output_tokens = 0
+            self.cache_read_input_tokens = self.cache_creation_input_tokens = 0
+
+    def summary(self) -> str:
+        return (f"Claude usage: {self.requests} requests, {self.input_tokens} input tokens "
+                f"(+{self.cache_read_input_tokens} cache read, {self.cache_creation_input_tokens} cache write), "
+                f"{self.output_tokens} output tokens")
+
+
 @dataclass
 class ProfileAnalysis:
     """Complete analysis of a profile including work history and evaluation."""
@@ -50,25 +242,263 @@ class ProfileAnalysis:
     confidence: str = "medium"
 
 
+# Pre-filter verdicts
+RULE_MATCH = "match"
+RULE_REJECT = "reject"
+RULE_AMBIGUOUS = "ambiguous"
+
+# Title words that change a role into managing it ("Engineering Manager")
+LEADERSHIP_WORDS = {"manager", "director", "head", "lead", "vp", "chief"}
+
+# Legal suffixes and LinkedIn decorations ignored when comparing company names
+COMPANY_SUFFIXES = re.compile(r"\b(inc|llc|ltd|corp|corporation|co|gmbh|plc|technologies)\b\.?")
+
+
+def normalize_company(name: str) -> str:
+    """"Uber Technologies, Inc. · Full-time" -> "uber"."""
+    name = name.split("·")[0].lower()
+    name = COMPANY_SUFFIXES.sub(" ", name)
+    return " ".join(re.sub(r"[^\w&+ ]", " ", name).split())
+
+
+@dataclass
+class RuleDecision:
+    """Pre-filter outcome; result is final unless verdict is ambiguous."""
+    verdict: str
+    result: EvaluationResult
+
+
+class CriteriaRules:
+    """
+    SearchCriteria compiled into a predicate over month ranges.
+
+    Settles candidates whose work history decides the criteria mechanically:
+    never worked at the company, still there when only former employees
+    count, or a leave date clearly inside or outside the window. Anything
+    that needs judgment (team/product, role keyword synonyms, vague dates,
+    boundary months) is left ambiguous for Claude.
+    """
+
+    def __init__(self, criteria: SearchCriteria, today: datetime | None = None):
+        self.criteria = criteria
+        self.company = normalize_company(criteria.company)
+        # Employers that count as the company: its products listed as their own
+        # employer on LinkedIn ("Instagram" for Meta) and the team/product asked for
+        names = {self.company}
+        names |= {normalize_company(p) for p, parent in KNOWN_PRODUCTS.items()
+                  if normalize_company(parent) == self.company}
+        if criteria.team_or_product:
+            names.add(normalize_company(criteria.team_or_product))
+        names.discard("")
+        self.company_names = sorted(names, key=len, reverse=True)
+        self._company_pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(n) for n in self.company_names) + r")\b"
+        ) if self.company else None
+        self.role_keywords = [k.lower() for k in criteria.role_keywords or []]
+        now = current_month(today)
+
+        # Window for the month the candidate left, inclusive; None = unbounded
+        self.earliest = None
+        self.latest = None
+        # "left within the last N months" / "more than N months ago" are
+        # day-sensitive at the boundary month, which stays ambiguous
+        self.fuzzy_months = set()
+
+        if after := parse_month_range(criteria.left_after):
+            self.earliest = after[0]
+        if before := parse_month_range(criteria.left_before):
+            self.latest = before[1]
+        if criteria.max_months_ago:
+            bound = now - criteria.max_months_ago
+            self.earliest = bound if self.earliest is None else max(self.earliest, bound)
+            self.fuzzy_months.add(bound)
+        if criteria.min_months_ago:
+            bound = now - criteria.min_months_ago
+            self.latest = bound if self.latest is None else min(self.latest, bound)
+            self.fuzzy_months.add(bound)
+
+    @property
+    def has_window(self) -> bool:
+        return self.earliest is not None or self.latest is not None
+
+    def _decision(self, verdict: str, reasoning: str, left_date: str | None = None, confidence: str = "high"):
+        return RuleDecision(verdict, EvaluationResult(
+            matches_criteria=verdict == RULE_MATCH,
+            reasoning=reasoning,
+            target_company=self.criteria.company,
+            left_date=left_date,
+            confidence=confidence
+        ))
+
+    def _title_matches_role(self, title: str | None) -> bool:
+        """
+        True if the title names the role outright: every keyword as a whole word
+        ("pm" is not in "Development"), and no leadership word the keywords
+        lack ("Engineering Manager" is not an "engineer" without judgment).
+        """
+        title = (title or "").lower()
+        if not all(re.search(rf"\b{re.escape(k)}s?\b", title) for k in self.role_keywords):
+            return False
+        leadership = LEADERSHIP_WORDS.intersection(re.findall(r"\w+", title))
+        return not leadership or bool(leadership & set(self.role_keywords))
+
+    def _in_window(self, first: int, last: int) -> bool | None:
+        """True/False if every month in [first, last] is inside/outside the window, else None."""
+        if (self.earliest is not None and last < self.earliest) or (self.latest is not None and first > self.latest):
+            return False
+        if any(first <= month <= last for month in self.fuzzy_months):
+            return None
+        if (self.earliest is None or first >= self.earliest) and (self.latest is None or last <= self.latest):
+            return True
+        return None
+
+    def summarize(self, table, today: datetime | None = None):
+        """
+        Vectorized tenure, months since leaving and window membership for a
+        whole run (see dates.work_history_table and dates.candidate_months).
+        """
+        companies = table["company"].fillna("").map(normalize_company)
+        at_company = companies.str.contains(self._company_pattern) if self._company_pattern else companies.eq(None)
+        return candidate_months(table, at_company, self.earliest, self.latest, today)
+
+    def classify(self, work_history: list[WorkExperience]) -> RuleDecision:
+        """Classify a candidate as definite match, definite reject or ambiguous."""
+        name = self.criteria.company
+        if not work_history:
+            return self._decision(RULE_REJECT, "No work history available to evaluate.")
+        if not self._company_pattern:
+            return self._decision(RULE_AMBIGUOUS, "No company to check.", confidence="low")
+        if not self.criteria.parsed:
+            # The company is the whole query, so name matching proves nothing
+            return self._decision(RULE_AMBIGUOUS, "Query was not parsed into criteria.", confidence="low")
+
+        stints = [e for e in work_history if self._company_pattern.search(normalize_company(e.company or ""))]
+        if not stints:
+            # Names that merely contain the company (e.g. in a title) need a closer look
+            mentions = any(n in f"{e.company} {e.title}".lower() for e in work_history for n in self.company_names)
+            if mentions:
+                return self._decision(RULE_AMBIGUOUS, f"{name} is mentioned but not listed as an employer.",
+                                      confidence="low")
+            # A team or product may sit under an employer name we don't know
+            # (a subsidiary, or the parent of a product asked for by name)
+            if self.criteria.team_or_product or self.company in KNOWN_PRODUCTS:
+                return self._decision(RULE_AMBIGUOUS, f"No employer listed as {name}.", confidence="low")
+            return self._decision(RULE_REJECT, f"Never worked at {name}.")
+
+        current = [e for e in stints if is_present(e.end_date)]
+        if current and not self.criteria.still_employed_ok:
+            return self._decision(RULE_REJECT, f"Still works at {name} (shows Present).", left_date="Still there")
+
+        # Semantic parts of the criteria can't be settled by rules
+        needs_judgment = bool(self.criteria.team_or_product)
+        if self.role_keywords:
+            # Only a title with every keyword ("data" and "engineer") settles the role;
+            # a single shared word ("Software Engineer") does not
+            needs_judgment |= not any(self._title_matches_role(e.title) for e in stints)
+
+        if current:
+            # still_employed_ok: a current employee matches unless dates restrict leaving
+            if needs_judgment or self.has_window:
+                return self._decision(RULE_AMBIGUOUS, f"Currently at {name}.", left_date="Still there",
+                                      confidence="low")
+            return self._decision(RULE_MATCH, f"Currently works at {name}.", left_date="Still there")
+
+        ends = [parse_month_range(e.end_date) for e in stints]
+        if None in ends:
+            return self._decision(RULE_AMBIGUOUS, f"Unclear when they left {name}.", confidence="low")
+        first = max(end[0] for end in ends)
+        last = max(end[1] for end in ends)
+        left_date = format_month(first) if first == last else str(first // 12)
+
+        inside = self._in_window(first, last) if self.has_window else True
+        if inside is False:
+            return self._decision(RULE_REJECT, f"Left {name} in {left_date}, outside the requested window.",
+                                  left_date=left_date)
+        if inside is None or needs_judgment:
+            return self._decision(RULE_AMBIGUOUS, f"Left {name} in {left_date}.", left_date=left_date,
+                                  confidence="low")
+        window = ", within the requested window" if self.has_window else ""
+        return self._decision(RULE_MATCH, f"Left {name} in {left_date}{window}.", left_date=left_date)
+
+
 class ProfileEvaluator:
     """Parses queries and evaluates candidates using Claude API."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, cache: "EvaluationCache | None" = None):
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable required")
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Retries are handled by _call_claude
+        self.client = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
+        self.usage = UsageStats()
+        self.cache = cache
+        # (normalized query, date) -> SearchCriteria
+        self._query_cache: dict[tuple[str, str], SearchCriteria] = {}
+        self._query_lock = threading.Lock()
+
+    def _call_claude(self, **kwargs):
+        """
+        messages.create with retries on transient errors.
+
+        Waits with full-jitter exponential backoff, or the server's
+        retry-after header when it sends one. Other errors, and transient
+        ones that persist after MAX_RETRIES, are raised.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = self.client.messages.create(**kwargs)
+                self.usage.add(response.usage)
+                return response
+            except TRANSIENT_ERRORS as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+                response = getattr(e, "response", None)
+                retry_after = response.headers.get("retry-after") if response is not None else None
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+                print(f"    Claude API {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})")
+                time.sleep(delay)
 
     def parse_query(self, query: str) -> SearchCriteria:
         """
         Parse a natural language query into structured search criteria.
 
+        Common query shapes are parsed locally (see parse_query_locally);
+        anything else goes to Claude. Successful parses are cached per day.
+
         Args:
             query: Natural language query like "Uber Eats engineers who left between 2023-2025"
 
         Returns:
             SearchCriteria with extracted parameters
         """
+        key = (normalize_query(query), datetime.now().strftime("%Y-%m-%d"))
+        with self._query_lock:
+            if key in self._query_cache:
+                return copy.deepcopy(self._query_cache[key])
+
+        criteria = parse_query_locally(query)
+        if criteria is None:
+            criteria = self._parse_query_with_claude(query)
+        if criteria is None:
+            # Fallback: use query as-is, and leave every candidate to Claude
+            return SearchCriteria(
+                company=query,
+                original_query=query,
+                linkedin_search_query=query,
+                parsed=False
+            )
+
+        with self._query_lock:
+            self._query_cache[key] = copy.deepcopy(criteria)
+        return criteria
+
+    def _parse_query_with_claude(self, query: str) -> SearchCriteria | None:
+        """Claude round trip for queries the local parser can't handle."""
         today = datetime.now().strftime("%B %d, %Y")
 
         prompt = f"""Parse this recruiting search query into structured criteria.
@@ -108,7 +538,7 @@ Respond in this exact JSON format (no markdown, just raw JSON):
 }}"""
 
         try:
-            response = self.client.messages.create(
+            response = self._call_claude(
                 model="claude-sonnet-4-20250514",
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}]
@@ -116,15 +546,7 @@ Respond in this exact JSON format (no markdown, just raw JSON):
 
             response_text = response.content[0].text.strip()
 
-            # Parse JSON response
-            # Handle potential markdown code blocks
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-            response_text = response_text.strip()
-
-            data = json.loads(response_text)
+            data = json.loads(_strip_code_fence(response_text))
 
             return SearchCriteria(
                 company=data.get("company", "Unknown"),
@@ -140,13 +562,8 @@ Respond in this exact JSON format (no markdown, just raw JSON):
             )
 
         except Exception as e:
-            # Fallback: use query as-is
             print(f"    Warning: Could not parse query: {e}")
-            return SearchCriteria(
-                company=query,
-                original_query=query,
-                linkedin_search_query=query
-            )
+            return None
 
     def evaluate(
         self,
@@ -165,18 +582,279 @@ Respond in this exact JSON format (no markdown, just raw JSON):
         Returns:
             EvaluationResult with match status and reasoning
         """
-        if not work_history:
+        decision = CriteriaRules(criteria).classify(work_history)
+        if decision.verdict != RULE_AMBIGUOUS:
+            return decision.result
+
+        cached = self._cached_result(criteria, work_history)
+        if cached:
+            return cached
+
+        system = self._evaluation_prefix(criteria, SINGLE_RESPONSE_FORMAT)
+        prompt = f"""CANDIDATE WORK HISTORY:
+{self._format_work_history(work_history)}"""
+
+        try:
+            response = self._call_claude(
+                model="claude-sonnet-4-20250514",
+                max_tokens=500,
+                system=system,
+                messages=[{"role": "user", "content": prompt}]
+            )
+
+            response_text = response.content[0].text
+            result = self._parse_response(response_text, criteria.company)
+            if result is None:
+                # Not cached, so the next run asks again
+                return EvaluationResult(
+                    matches_criteria=False,
+                    reasoning="Could not read a verdict from Claude's answer",
+                    confidence="low"
+                )
+            self._remember_result(criteria, work_history, result)
+            return result
+
+        except Exception as e:
             return EvaluationResult(
                 matches_criteria=False,
-                reasoning="No work history available to evaluate.",
-                confidence="high"
+                reasoning=f"API error: {str(e)}",
+                confidence="low"
+            )
+
+    def evaluate_many(
+        self,
+        criteria: SearchCriteria,
+        histories: Sequence[tuple[str, list[WorkExperience]]],
+        concurrency: int = DEFAULT_EVALUATE_CONCURRENCY,
+        ordered: bool = False,
+        batched: bool = False
+    ) -> Iterator[tuple[int, EvaluationResult]]:
+        """
+        Evaluate many candidates with several Claude requests in flight.
+
+        Args:
+            criteria: Parsed search criteria
+            histories: (profile_name, work_history) pairs
+            concurrency: Maximum requests in flight
+            ordered: Yield in input order instead of completion order
+            batched: Pack several candidates into each request (see evaluate_batch)
+
+        Yields:
+            (index into histories, EvaluationResult) tuples
+        """
+        histories = list(histories)
+        if batched:
+            groups = self._make_batches(list(range(len(histories))), histories)
+        else:
+            groups = [[i] for i in range(len(histories))]
+        next_index = 0
+        finished = {}
+
+        # Groups are submitted as slots free up rather than all at once, so a
+        # caller that stops iterating only waits for the requests in flight
+        concurrency = max(1, concurrency)
+        remaining = iter(groups)
+        running = {}
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+
+        def submit_next():
+            group = next(remaining, None)
+            if group is not None:
+                # A batch of one is a plain evaluate() call
+                running[pool.submit(self.evaluate_batch, criteria, [histories[i] for i in group])] = group
+
+        try:
+            for _ in range(concurrency):
+                submit_next()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group = running.pop(future)
+                    submit_next()
+                    results = future.result()
+                    if not ordered:
+                        yield from zip(group, results)
+                        continue
+
+                    # Hold results back until everything before them is done
+                    finished.update(zip(group, results))
+                    while next_index in finished:
+                        yield next_index, finished.pop(next_index)
+                        next_index += 1
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def evaluate_batch(
+        self,
+        criteria: SearchCriteria,
+        candidates: Sequence[tuple[str, list[WorkExperience]]]
+    ) -> list[EvaluationResult]:
+        """
+        Evaluate several candidates in one request under a single criteria header.
+
+        Claude answers with a JSON array keyed by candidate id. If any id is
+        missing or malformed, the batch is split in half and each half is
+        retried; a single leftover candidate falls back to evaluate().
+
+        Args:
+            criteria: Parsed search criteria
+            candidates: (profile_name, work_history) pairs
+
+        Returns:
+            EvaluationResults in the same order as candidates
+        """
+        results: list[EvaluationResult | None] = [None] * len(candidates)
+        pending = []
+        rules = CriteriaRules(criteria)
+        for i, (name, work_history) in enumerate(candidates):
+            decision = rules.classify(work_history)
+            if decision.verdict != RULE_AMBIGUOUS:
+                results[i] = decision.result
+            elif cached := self._cached_result(criteria, work_history):
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        self._evaluate_group(criteria, candidates, pending, results)
+        return results
+
+    def _evaluate_group(
+        self,
+        criteria: SearchCriteria,
+        candidates: Sequence[tuple[str, list[WorkExperience]]],
+        indices: list[int],
+        results: list
+    ):
+        """Fill results[i] for indices with one request, splitting on incomplete answers."""
+        if not indices:
+            return
+        if len(indices) == 1:
+            name, work_history = candidates[indices[0]]
+            results[indices[0]] = self.evaluate(criteria, work_history, name)
+            return
+
+        ids = {f"c{n}": i for n, i in enumerate(indices, 1)}
+        blocks = [
+            f"[{cid}] {candidates[i][0]}\n{self._format_work_history(candidates[i][1])}"
+            for cid, i in ids.items()
+        ]
+        system = self._evaluation_prefix(criteria, BATCH_RESPONSE_FORMAT)
+        prompt = f"""CANDIDATES:
+{chr(10).join(blocks)}"""
+
+        answers = {}
+        try:
+            response = self._call_claude(
+                model="claude-sonnet-4-20250514",
+                max_tokens=200 + BATCH_TOKENS_PER_CANDIDATE * len(ids),
+                system=system,
+                messages=[{"role": "user", "content": prompt}]
             )
+            data = json.loads(_strip_code_fence(response.content[0].text))
+            for item in data if isinstance(data, list) else []:
+                if isinstance(item, dict) and item.get("id") in ids:
+                    answers[item["id"]] = item
+        except json.JSONDecodeError:
+            pass  # Truncated or malformed; every candidate is retried below
+        except Exception as e:
+            for i in indices:
+                results[i] = EvaluationResult(
+                    matches_criteria=False,
+                    reasoning=f"API error: {str(e)}",
+                    confidence="low"
+                )
+            return
+
+        missing = []
+        for cid, i in ids.items():
+            item = answers.get(cid)
+            if item is None or not isinstance(item.get("matches_criteria"), bool):
+                missing.append(i)
+                continue
+            results[i] = EvaluationResult(
+                matches_criteria=item["matches_criteria"],
+                reasoning=item.get("reasoning") or "No reasoning provided",
+                target_company=item.get("target_company") or criteria.company,
+                left_date=item.get("left_date"),
+                confidence=str(item.get("confidence") or "medium").lower()
+            )
+            self._remember_result(criteria, candidates[i][1], results[i])
+
+        if missing:
+            print(f"    Batch answer missing {len(missing)}/{len(ids)} candidates, retrying in smaller batches")
+            half = len(missing) // 2 or 1
+            self._evaluate_group(criteria, candidates, missing[:half], results)
+            self._evaluate_group(criteria, candidates, missing[half:], results)
 
-        # Format work history for the prompt
-        work_history_text = self._format_work_history(work_history)
+    def _make_batches(
+        self,
+        indices: list[int],
+        histories: Sequence[tuple[str, list[WorkExperience]]]
+    ) -> list[list[int]]:
+        """Group candidates so each batch's work histories fit BATCH_TOKEN_BUDGET."""
+        batches = []
+        current, used = [], 0
+        for i in indices:
+            name, work_history = histories[i]
+            tokens = _estimate_tokens(name) + _estimate_tokens(self._format_work_history(work_history))
+            if current and (used + tokens > BATCH_TOKEN_BUDGET or len(current) >= MAX_BATCH_SIZE):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _cache_key(self, criteria: SearchCriteria, work_history: list[WorkExperience]) -> tuple[str, str]:
+        history_hash = hashlib.sha256(self._format_work_history(work_history).encode("utf-8")).hexdigest()
+        return criteria_fingerprint(criteria), history_hash
+
+    def _cached_result(
+        self,
+        criteria: SearchCriteria,
+        work_history: list[WorkExperience]
+    ) -> EvaluationResult | None:
+        """Previous result for identical criteria and work history, if cached."""
+        if not self.cache:
+            return None
+        fields = self.cache.get(*self._cache_key(criteria, work_history))
+        return EvaluationResult(**fields) if fields else None
+
+    def _remember_result(
+        self,
+        criteria: SearchCriteria,
+        work_history: list[WorkExperience],
+        result: EvaluationResult
+    ):
+        if self.cache:
+            self.cache.put(*self._cache_key(criteria, work_history), asdict(result))
+
+    def _evaluation_prefix(self, criteria: SearchCriteria, response_format: str) -> list[dict]:
+        """
+        System prompt shared by every evaluation in a run.
+
+        Only the candidates differ between requests. The prompt is two cached
+        blocks: EVALUATION_RUBRIC, which is the same for every query and long
+        enough for the model's prompt cache minimum, then the query, date,
+        criteria and response format, which are cached for the rest of the run.
+        """
         today = datetime.now().strftime("%B %d, %Y")
+        text = f"""ORIGINAL QUERY: "{criteria.original_query}"
+
+TODAY'S DATE: {today}
 
-        # Build criteria description
+CRITERIA TO CHECK:
+{self._criteria_text(criteria)}
+
+{response_format}"""
+        return [
+            {"type": "text", "text": EVALUATION_RUBRIC, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def _criteria_text(self, criteria: SearchCriteria) -> str:
+        """Numbered criteria list for the evaluation prompts."""
         criteria_parts = [f"1. Must have worked at {criteria.company}"]
 
         if criteria.role_keywords:
@@ -188,10 +866,10 @@ Respond in this exact JSON format (no markdown, just raw JSON):
             criteria_parts.append("3. Must have LEFT the company (current employees do NOT match)")
 
         if criteria.left_after:
-            criteria_parts.append(f"4. Must have left AFTER {criteria.left_after}")
+            criteria_parts.append(f"4. Must have left in or after {criteria.left_after}")
 
         if criteria.left_before:
-            criteria_parts.append(f"5. Must have left BEFORE {criteria.left_before}")
+            criteria_parts.append(f"5. Must have left in or before {criteria.left_before}")
 
         if criteria.min_months_ago:
             criteria_parts.append(f"6. Must have left MORE THAN {criteria.min_months_ago} months ago")
@@ -199,49 +877,7 @@ Respond in this exact JSON format (no markdown, just raw JSON):
         if criteria.max_months_ago:
             criteria_parts.append(f"7. Must have left WITHIN THE LAST {criteria.max_months_ago} months")
 
-        criteria_text = "\n".join(criteria_parts)
-
-        prompt = f"""Evaluate this candidate against the search criteria.
-
-ORIGINAL QUERY: "{criteria.original_query}"
-
-CANDIDATE WORK HISTORY:
-{work_history_text}
-
-TODAY'S DATE: {today}
-
-CRITERIA TO CHECK:
-{criteria_text}
-
-IMPORTANT: Calculate dates carefully. For example:
-- Aug 2024 to Jan 2026 = 17 months
-- Dec 2023 to Jan 2026 = 25 months
-- If someone shows "Present" for a company, they still work there.
-
-Respond in this exact format:
-TARGET_COMPANY: [the company from criteria]
-WORKED_THERE: [Yes/No]
-LEFT_DATE: [Month Year, or "Still there", or "Unknown"]
-MATCHES_CRITERIA: [Yes/No]
-CONFIDENCE: [high/medium/low]
-REASONING: [1-2 sentence explanation of why they match or don't match]"""
-
-        try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            response_text = response.content[0].text
-            return self._parse_response(response_text, criteria.company)
-
-        except Exception as e:
-            return EvaluationResult(
-                matches_criteria=False,
-                reasoning=f"API error: {str(e)}",
-                confidence="low"
-            )
+        return "\n".join(criteria_parts)
 
     def _format_work_history(self, work_history: list[WorkExperience]) -> str:
         """Format work history for the prompt."""
@@ -259,13 +895,13 @@ REASONING: [1-2 sentence explanation of why they match or don't match]"""
 
         return "\n".join(lines) if lines else "No work history found"
 
-    def _parse_response(self, response_text: str, default_company: str) -> EvaluationResult:
-        """Parse Claude's response into an EvaluationResult."""
+    def _parse_response(self, response_text: str, default_company: str) -> EvaluationResult | None:
+        """Parse Claude's response into an EvaluationResult, or None if it has no MATCHES_CRITERIA line."""
         lines = response_text.strip().split('\n')
         result = {
             'target_company': default_company,
             'left_date': None,
-            'matches': False,
+            'matches': None,
             'confidence': 'medium',
             'reasoning': ''
         }
@@ -284,6 +920,9 @@ REASONING: [1-2 sentence explanation of why they match or don't match]"""
             elif line.startswith('REASONING:'):
                 result['reasoning'] = line.split(':', 1)[1].strip()
 
+        if result['matches'] is None:
+            return None
+
         return EvaluationResult(
             matches_criteria=result['matches'],
             reasoning=result['reasoning'] or "No reasoning provided",
@@ -293,5 +932,183 @@ REASONING: [1-2 sentence explanation of why they match or don't match]"""
         )
 
 
+# Products and teams whose parent company isn't in the name
+KNOWN_PRODUCTS = {
+    "uber eats": "Uber",
+    "google maps": "Google",
+    "google cloud": "Google",
+    "youtube": "Google",
+    "deepmind": "Google",
+    "instagram": "Meta",
+    "whatsapp": "Meta",
+    "facebook": "Meta",
+    "oculus": "Meta",
+    "aws": "Amazon",
+    "alexa": "Amazon",
+    "azure": "Microsoft",
+    "linkedin": "Microsoft",
+    "github": "Microsoft",
+    "icloud": "Apple",
+}
+
+ROLE_MODIFIERS = (r"(?:software|data|product|machine learning|ml|ai|backend|frontend|full[- ]stack|senior|"
+                  r"staff|principal|mobile|ios|android|infrastructure|platform|research|security|design)")
+ROLE_NOUNS = (r"(?:engineers?|developers?|scientists?|designers?|managers?|pms?|researchers?|recruiters?|"
+              r"analysts?|people|employees|folks|staff)")
+ROLE = rf"(?P<role>(?:{ROLE_MODIFIERS}\s+){{0,2}}{ROLE_NOUNS})"
+
+# Words that name people without narrowing the role
+GENERIC_ROLES = {"people", "employees", "folks", "staff"}
+
+WHEN_PATTERNS = [
+    (re.compile(r"between (\d{4})\s*(?:-|–|and|to)\s*(\d{4})"), "between"),
+    (re.compile(r"in (\d{4})"), "year"),
+    (re.compile(r"(?:in|within) the (?:last|past) (\d+) months?"), "max_months"),
+    (re.compile(r"(?:in|within) the (?:last|past) (year|month)"), "max_unit"),
+    (re.compile(r"(?:more than|over|at least) (\d+) months? ago"), "min_months"),
+]
+
+QUERY_SHAPES = [
+    # "former Google Maps engineers", "ex-Stripe employees"
+    re.compile(rf"^(?:former |ex- ?|ex )(?P<subject>.+?) {ROLE}$"),
+    # "Uber Eats engineers who left between 2023-2025"
+    re.compile(rf"^(?P<subject>.+?) {ROLE} (?:who|that) (?:left|quit|departed)(?: (?P<when>.+))?$"),
+    # "people who left Stripe more than 3 months ago"
+    re.compile(rf"^{ROLE} (?:who|that) (?:left|quit) (?P<subject>.+?)(?: (?P<when>(?:between|in|within|more than|over|at least) .+))?$"),
+]
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, single-spaced query text without trailing punctuation."""
+    return " ".join(query.lower().split()).strip(" .?!")
+
+
+def _resolve_subject(subject: str) -> tuple[str, str | None] | None:
+    """Query subject -> (company, team_or_product), or None if unsure."""
+    key = subject.lower()
+    if key in KNOWN_PRODUCTS:
+        return KNOWN_PRODUCTS[key], subject
+    # Multi-word subjects may be a product ("Google Maps") or a company
+    # ("Goldman Sachs"); leave those to Claude
+    if " " in subject or not re.fullmatch(r"[\w&.+-]+", subject):
+        return None
+    return subject, None
+
+
+def _singular(word: str) -> str:
+    return word[:-1] if word.endswith("s") and not word.endswith("ss") else word
+
+
+def parse_query_locally(query: str) -> SearchCriteria | None:
+    """
+    Parse formulaic queries without Claude.
+
+    Recognizes "former X <role>", "X <role> who left <when>" and
+    "<people> who left X <when>", with <when> one of "between 2023-2025",
+    "in 2024", "in the last 6 months", "in the last year" or "more than 3
+    months ago".
+
+    Returns:
+        SearchCriteria, or None unless the whole query was understood
+    """
+    text = normalize_query(query)
+    # Keep the user's capitalization for company names
+    original = " ".join(query.split()).strip(" .?!")
+
+    for shape in QUERY_SHAPES:
+        match = shape.match(text)
+        if match:
+            break
+    else:
+        return None
+
+    start, end = match.span("subject")
+    resolved = _resolve_subject(original[start:end])
+    if not resolved:
+        return None
+    company, team = resolved
+    if company.islower():
+        company = company.title()
+    if team and team.islower():
+        team = team.title()
+
+    criteria = SearchCriteria(company=company, team_or_product=team, original_query=query)
+
+    role_words = match.group("role").split()
+    if role_words[-1] not in GENERIC_ROLES:
+        criteria.role_keywords = [_singular(w) for w in role_words]
+
+    when = match.groupdict().get("when")
+    if when:
+        for pattern, kind in WHEN_PATTERNS:
+            found = pattern.fullmatch(when)
+            if found:
+                break
+        else:
+            return None
+
+        if kind == "between":
+            # "between 2025-2023" means the same window as "between 2023-2025"
+            first, last = sorted((found.group(1), found.group(2)))
+            criteria.left_after = f"January {first}"
+            criteria.left_before = f"December {last}"
+        elif kind == "year":
+            criteria.left_after = f"January {found.group(1)}"
+            criteria.left_before = f"December {found.group(1)}"
+        elif kind == "max_months":
+            criteria.max_months_ago = int(found.group(1))
+        elif kind == "max_unit":
+            criteria.max_months_ago = 12 if found.group(1) == "year" else 1
+        elif kind == "min_months":
+            criteria.min_months_ago = int(found.group(1))
+
+    search_terms = [team or company] + [w for w in (criteria.role_keywords or []) if w != "staff"]
+    criteria.linkedin_search_query = " ".join(search_terms[:3])
+    return criteria
+
+
+def criteria_fingerprint(criteria: SearchCriteria, today: datetime | None = None) -> str:
+    """
+    Stable hash of the criteria fields that affect an evaluation.
+
+    Criteria measured from today ("left within the last 6 months") also
+    include the current month, so their cached results expire monthly.
+    Absolute dates ("left after January 2023") never expire.
+    """
+    def norm(value):
+        return " ".join(value.lower().split()) if isinstance(value, str) else value
+
+    fields = {
+        "company": norm(criteria.company),
+        "team_or_product": norm(criteria.team_or_product),
+        "role_keywords": sorted(norm(k) for k in criteria.role_keywords or []),
+        "left_after": norm(criteria.left_after),
+        "left_before": norm(criteria.left_before),
+        "min_months_ago": criteria.min_months_ago,
+        "max_months_ago": criteria.max_months_ago,
+        "still_employed_ok": criteria.still_employed_ok,
+        "query": norm(criteria.original_query)
+    }
+    if criteria.min_months_ago or criteria.max_months_ago:
+        fields["month"] = (today or datetime.now()).strftime("%Y-%m")
+
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a markdown code block around a JSON response."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("```")[1]
+        if text.startswith("json"):
+            text = text[4:]
+    return text.strip()
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
 # Keep old class name for backwards compatibility
 GoldilocksEvaluator = ProfileEvaluator
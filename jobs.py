@@ -0,0 +1,193 @@
+"""
+Background jobs for the web UI.
+
+Long searches and analyses run on a single worker thread instead of inside
+an HTTP request. Each job reports progress (done/total, current stage, ETA),
+keeps partial results as they arrive and can be cancelled between profiles.
+Browser work inside a job goes through the BrowserWorker (browser_worker.py).
+"""
+
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+# Finished jobs kept for /jobs/<id> lookups
+MAX_FINISHED_JOBS = 20
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function to stop at a safe point."""
+
+
+@dataclass
+class Job:
+    """A unit of background work and its progress."""
+    id: str
+    kind: str                       # "search", "analyze" or "reevaluate"
+    status: str = "queued"          # queued, running, done, failed, cancelled
+    stage: str = ""
+    done: int = 0
+    total: int = 0
+    error: str | None = None
+    results: list = field(default_factory=list)   # Partial results, appended as they arrive
+    result: Any = None                            # Final value returned by the job function
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def __post_init__(self):
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def cancel(self):
+        """Ask the job to stop at its next check."""
+        self._cancel.set()
+
+    def check_cancelled(self):
+        """Call between units of work; raises JobCancelled if cancel() was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, done: int | None = None, total: int | None = None, stage: str | None = None):
+        with self._lock:
+            if done is not None:
+                self.done = done
+            if total is not None:
+                self.total = total
+            if stage is not None:
+                self.stage = stage
+            self._changed.notify_all()
+
+    def add_result(self, item):
+        """Record a partial result and count it as done."""
+        with self._lock:
+            self.results.append(item)
+            self.done += 1
+            self._changed.notify_all()
+
+    def set_status(self, status: str, error: str | None = None):
+        with self._lock:
+            self.status = status
+            if error is not None:
+                self.error = error
+            if status == "running":
+                self.started_at = time.time()
+            elif self.finished:
+                self.finished_at = time.time()
+            self._changed.notify_all()
+
+    def wait(self, since: int, timeout: float) -> bool:
+        """
+        Block until there are more than `since` results, the job finishes or
+        timeout seconds pass.
+
+        Returns:
+            True if there is something new to report
+        """
+        with self._lock:
+            return self._changed.wait_for(lambda: len(self.results) > since or self.finished, timeout)
+
+    @property
+    def eta(self) -> float | None:
+        """Seconds left, extrapolated from the average time per finished item."""
+        if self.status != "running" or not self.started_at or not self.done or not self.total:
+            return None
+        elapsed = time.time() - self.started_at
+        return elapsed / self.done * max(0, self.total - self.done)
+
+    def to_dict(self, since: int = 0) -> dict:
+        """
+        JSON-friendly snapshot.
+
+        Args:
+            since: Only include partial results from this index on, so
+                pollers can fetch just what is new
+        """
+        with self._lock:
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'stage': self.stage,
+                'done': self.done,
+                'total': self.total,
+                'eta': round(self.eta) if self.eta is not None else None,
+                'error': self.error,
+                'results': self.results[since:],
+                'next': len(self.results)
+            }
+
+
+class JobManager:
+    """Runs jobs one at a time on a dedicated worker thread."""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="brain-jobs", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind: str, fn: Callable[[Job], Any]) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Label shown to the UI
+            fn: Called on the worker thread with the Job; reports progress
+                through it and returns the final result
+
+        Returns:
+            The queued Job
+        """
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._queue.put((job, fn))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self) -> Job | None:
+        """The running or oldest queued job, if any."""
+        with self._lock:
+            pending = [j for j in self._jobs.values() if not j.finished]
+        return min(pending, key=lambda j: j.created_at) if pending else None
+
+    def _prune(self):
+        """Forget the oldest finished jobs. Caller holds the lock."""
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.created_at)
+        for job in finished[:-MAX_FINISHED_JOBS]:
+            del self._jobs[job.id]
+
+    def _run(self):
+        while True:
+            job, fn = self._queue.get()
+            if job.cancel_requested:
+                job.set_status("cancelled")
+                continue
+
+            job.set_status("running")
+            try:
+                job.result = fn(job)
+                job.set_status("done")
+            except JobCancelled:
+                job.set_status("cancelled")
+            except Exception as e:
+                job.set_status("failed", error=str(e))
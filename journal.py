@@ -0,0 +1,182 @@
+"""
+Append-only journal of a run's progress, for resuming after a crash.
+
+Each run gets .brain_cache/journals/run-<id>.jsonl with one line per
+completed stage: the search hits, the profiles picked for analysis, each
+fetched work history and each evaluation. Lines are flushed and fsynced as
+they are written, so a crash loses at most the profile in progress.
+Resuming replays the journal, evaluates fetched-but-unevaluated profiles
+without the browser and fetches only the rest.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from cache import get_brain_cache_dir
+from evaluator import ProfileAnalysis, SearchCriteria
+from scraper import ProfileResult, WorkExperience
+
+
+def get_journal_dir() -> Path:
+    return get_brain_cache_dir() / "journals"
+
+
+@dataclass
+class JournalState:
+    """A run's progress as replayed from its journal."""
+    run_id: int
+    criteria: SearchCriteria | None = None
+    profiles: list[ProfileResult] = field(default_factory=list)   # Search hits, in order
+    planned: list[str] | None = None                               # URLs picked for analysis
+    fetched: dict[str, list[WorkExperience]] = field(default_factory=dict)
+    evaluated: dict[str, ProfileAnalysis] = field(default_factory=dict)
+    finished: bool = False
+
+    @property
+    def pending(self) -> list[ProfileResult]:
+        """Profiles picked for analysis that have no evaluation yet."""
+        planned = set(self.planned) if self.planned is not None else None
+        return [
+            p for p in self.profiles
+            if (planned is None or p.url in planned) and p.url not in self.evaluated
+        ]
+
+
+class RunJournal:
+    """Writer and reader for one run's journal file."""
+
+    def __init__(self, run_id: int, root: Path | None = None):
+        self.run_id = run_id
+        self.root = Path(root) if root else get_journal_dir()
+        self.path = self.root / f"run-{run_id}.jsonl"
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _append(self, record: dict):
+        record["t"] = time.time()
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._drop_torn_line()
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _drop_torn_line(self):
+        """Cut a partial last line left by a crash, so new records start on a fresh line."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def start(self, criteria: SearchCriteria, profiles: list[ProfileResult]):
+        """Record the run's criteria and search hits (the 'searched' stage)."""
+        self._append({"stage": "run", "criteria": asdict(criteria)})
+        self._append({"stage": "searched", "profiles": [asdict(p) for p in profiles]})
+
+    def plan(self, profiles: list[ProfileResult]):
+        """Record which search hits were picked for analysis."""
+        self._append({"stage": "planned", "urls": [p.url for p in profiles]})
+
+    def fetched(self, url: str, work_history: list[WorkExperience]):
+        self._append({"stage": "fetched", "url": url, "work_history": [asdict(e) for e in work_history]})
+
+    def evaluated(self, analysis: ProfileAnalysis):
+        fields = asdict(analysis)
+        del fields["work_history"]  # Already in the 'fetched' record
+        self._append({"stage": "evaluated", "analysis": fields})
+
+    def finish(self, status: str = "done"):
+        self._append({"stage": "finished", "status": status})
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def load(self) -> JournalState | None:
+        """Replay the journal, or None if the run has none."""
+        if not self.path.exists():
+            return None
+
+        state = JournalState(self.run_id)
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial line from a crash mid-write
+
+                stage = record.get("stage")
+                if stage == "run":
+                    state.criteria = SearchCriteria(**record["criteria"])
+                elif stage == "searched":
+                    state.profiles = [ProfileResult(**p) for p in record["profiles"]]
+                elif stage == "planned":
+                    state.planned = record["urls"]
+                    state.finished = False
+                elif stage == "fetched":
+                    state.fetched[record["url"]] = [WorkExperience(**e) for e in record["work_history"]]
+                elif stage == "evaluated":
+                    fields = record["analysis"]
+                    state.evaluated[fields["url"]] = ProfileAnalysis(
+                        work_history=state.fetched.get(fields["url"], []), **fields
+                    )
+                elif stage == "finished":
+                    state.finished = record.get("status") == "done"
+
+        return state
+
+    @staticmethod
+    def latest_unfinished(root: Path | None = None) -> int | None:
+        """
+        Id of the most recently written run whose analysis started but didn't finish.
+
+        Only each journal's last record is read: fetched, evaluated and
+        finished records are written after 'planned', so a run is unfinished
+        when its last record is one of those without a 'done' finish.
+        """
+        root = Path(root) if root else get_journal_dir()
+        if not root.exists():
+            return None
+        paths = sorted(root.glob("run-*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in paths:
+            record = _last_record(path)
+            if not record:
+                continue
+            stage = record.get("stage")
+            if stage in ("planned", "fetched", "evaluated") or (stage == "finished" and record.get("status") != "done"):
+                return int(path.stem.split("-", 1)[1])
+        return None
+
+
+def _last_record(path: Path, chunk_size: int = 8192) -> dict | None:
+    """Last complete record of a journal, reading backwards from the end."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        data = b""
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+            # A torn last line may not parse; keep reading until one more line is complete
+            lines = data.split(b"\n")
+            complete = lines if end == 0 else lines[1:]
+            for line in reversed(complete):
+                if not line.strip():
+                    continue
+                try:
+                    return json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    return None
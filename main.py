@@ -7,7 +7,12 @@ Natural language search for LinkedIn profiles with customizable criteria.
 import os
 from browser import LinkedInBrowser
 from scraper import LinkedInScraper
+from archive import PageArchive
+from cache import CompanyCache, EvaluationCache, ProfileCache
 from evaluator import ProfileEvaluator, SearchCriteria, ProfileAnalysis
+from pipeline import AnalysisPipeline, reevaluate, run_histories
+from journal import RunJournal
+from store import RunStore
 
 
 def display_criteria(criteria: SearchCriteria) -> str:
@@ -43,16 +48,23 @@ def analyze_profiles(
     scraper: LinkedInScraper,
     evaluator: ProfileEvaluator,
     profiles: list,
-    criteria: SearchCriteria
+    criteria: SearchCriteria,
+    journal: RunJournal | None = None,
+    fetched: dict | None = None
 ) -> list[ProfileAnalysis]:
     """
     Analyze each profile: extract work history and evaluate against criteria.
 
+    Profile fetching and Claude evaluation overlap (see pipeline.py), so
+    results are printed in completion order.
+
     Args:
         scraper: LinkedInScraper instance
         evaluator: ProfileEvaluator instance
         profiles: List of ProfileResult objects
         criteria: Parsed search criteria
+        journal: Records each fetched and evaluated profile for resuming
+        fetched: Work histories already fetched, by profile URL (when resuming)
 
     Returns:
         List of ProfileAnalysis objects
@@ -60,13 +72,11 @@ def analyze_profiles(
     analyses = []
     total = len(profiles)
 
-    for i, profile in enumerate(profiles, 1):
-        print(f"\n[{i}/{total}] Analyzing: {profile.name}")
-        print(f"    URL: {profile.url}")
-
-        # Extract work experience from profile
-        print("    Extracting work history...")
-        work_history = scraper.get_profile_experience(profile.url)
+    pipeline = AnalysisPipeline(scraper, evaluator, journal=journal)
+    for i, analysis in enumerate(pipeline.run(criteria, profiles, fetched=fetched), 1):
+        work_history = analysis.work_history
+        print(f"\n[{i}/{total}] Analyzed: {analysis.name}")
+        print(f"    URL: {analysis.url}")
 
         if work_history:
             print(f"    Found {len(work_history)} experience entries:")
@@ -77,27 +87,91 @@ def analyze_profiles(
         else:
             print("    No work history found")
 
-        # Evaluate against criteria
-        print("    Evaluating against criteria...")
-        result = evaluator.evaluate(criteria, work_history, profile.name)
-
-        analysis = ProfileAnalysis(
-            name=profile.name,
-            url=profile.url,
-            work_history=work_history,
-            matches_criteria=result.matches_criteria,
-            reasoning=result.reasoning,
-            target_company=result.target_company,
-            left_date=result.left_date,
-            confidence=result.confidence
-        )
         analyses.append(analysis)
 
         # Show result
-        status = "MATCH" if result.matches_criteria else "NO MATCH"
-        print(f"    Result: {status} ({result.confidence} confidence)")
-        print(f"    Reason: {result.reasoning}")
+        status = "MATCH" if analysis.matches_criteria else "NO MATCH"
+        print(f"    Result: {status} ({analysis.confidence} confidence)")
+        print(f"    Reason: {analysis.reasoning}")
+
+    return analyses
+
+
+def resume_run(scraper, evaluator, store: RunStore, run_id: int | None) -> list[ProfileAnalysis] | None:
+    """
+    Finish an interrupted run from its journal.
+
+    Profiles already evaluated are kept, fetched ones are evaluated without
+    visiting LinkedIn again, and only the rest are fetched.
+
+    Args:
+        run_id: Run to resume, or None for the latest unfinished one
+
+    Returns:
+        All of the run's analyses, or None if there was nothing to resume
+    """
+    run_id = run_id or RunJournal.latest_unfinished()
+    state = RunJournal(run_id).load() if run_id else None
+    if not state or not state.criteria:
+        print("No interrupted run to resume.")
+        return None
+
+    pending = state.pending
+    print(f"\nResuming run {run_id}: {display_criteria(state.criteria)}")
+    print(f"{len(state.evaluated)} profiles already evaluated, {len(pending)} to go "
+          f"({sum(1 for p in pending if p.url in state.fetched)} already fetched)")
+
+    journal = RunJournal(run_id)
+    new = analyze_profiles(scraper, evaluator, pending, state.criteria, journal=journal, fetched=state.fetched)
+    store.add_analyses(run_id, list(state.evaluated.values()) + new)
+    store.finish_run(run_id)
+    journal.finish()
+    journal.close()
+
+    # Search result order
+    by_url = {**state.evaluated, **{a.url: a for a in new}}
+    return [by_url[p.url] for p in state.profiles if p.url in by_url]
+
+
+def reevaluate_run(evaluator, store: RunStore, run_id: int | None, query: str) -> list[ProfileAnalysis] | None:
+    """
+    Evaluate a run's fetched work histories against a new query, without the browser.
+
+    The result is saved as a new run with the same search hits.
+
+    Args:
+        run_id: Run whose work histories to reuse, or None for the latest run
+        query: The new natural language query
 
+    Returns:
+        The new analyses in search result order, or None if there was nothing to re-evaluate
+    """
+    if run_id is None:
+        latest = store.list_runs(limit=1)
+        run_id = latest[0].id if latest else None
+    histories = run_histories(store, run_id) if run_id else []
+    if not histories:
+        print("No fetched profiles to re-evaluate.")
+        return None
+
+    criteria = evaluator.parse_query(query)
+    print("\nRe-evaluating with criteria:")
+    print(f"  {display_criteria(criteria)}")
+    print(f"\n{len(histories)} profiles from run {run_id} (no LinkedIn visits)...")
+
+    new_run_id = store.start_run(criteria)
+    store.add_search_hits(new_run_id, [profile for profile, _ in histories])
+    evaluator.usage.reset()
+    by_url = {}
+    for analysis in reevaluate(evaluator, criteria, histories):
+        by_url[analysis.url] = analysis
+        status = "MATCH" if analysis.matches_criteria else "NO MATCH"
+        print(f"  [{len(by_url)}/{len(histories)}] {analysis.name}: {status} ({analysis.confidence})")
+
+    analyses = [by_url[profile.url] for profile, _ in histories]
+    store.add_analyses(new_run_id, analyses)
+    store.finish_run(new_run_id)
+    print(f"Saved as run {new_run_id}. {evaluator.usage.summary()}")
     return analyses
 
 
@@ -142,7 +216,10 @@ def main():
 
     print("\nStarting browser with persistent Chrome session...")
 
-    with LinkedInBrowser(headless=False) as browser:
+    # Opt-in lean page mode (blocks images, fonts and tracking; log in once without it)
+    lean = os.environ.get("BRAIN_LEAN") == "1"
+
+    with LinkedInBrowser(headless=False, lean=lean) as browser:
         print("Checking LinkedIn login status...")
 
         if not browser.goto_linkedin():
@@ -155,12 +232,23 @@ def main():
         print("SUCCESS: Logged into LinkedIn!")
 
         # Initialize components
-        scraper = LinkedInScraper(browser)
+        # Opt-in raw payload archive for offline re-parsing (python archive.py reparse)
+        archive = PageArchive() if os.environ.get("BRAIN_ARCHIVE") == "1" else None
+        profile_cache = ProfileCache()
+        scraper = LinkedInScraper(
+            browser,
+            cache=profile_cache,
+            archive=archive,
+            companies=CompanyCache()
+        )
+
+        # Searches and results are kept in .brain_cache/runs.sqlite3
+        store = RunStore()
 
         # Initialize evaluator if API key is available
         evaluator = None
         try:
-            evaluator = ProfileEvaluator()
+            evaluator = ProfileEvaluator(cache=EvaluationCache())
             print("Claude API evaluator ready.")
         except ValueError as e:
             print(f"Note: {e}")
@@ -172,6 +260,9 @@ def main():
         print("  - Uber Eats engineers who left between 2023-2025")
         print("  - Former Google engineers")
         print("  - Meta engineers who left in the last 6 months")
+        print("Type 'resume' (or 'resume <run id>') to finish an interrupted run.")
+        print("Type 'reevaluate' (or 'reevaluate <run id>') to apply a new query to")
+        print("the profiles a run already fetched, without visiting LinkedIn.")
         print("\nOr press Enter to exit.")
         print("=" * 40)
 
@@ -185,6 +276,29 @@ def main():
                 print("Error: Evaluator not available. Set ANTHROPIC_API_KEY.")
                 continue
 
+            if query.lower().split()[0] == "resume":
+                parts = query.split()
+                run_id = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+                analyses = resume_run(scraper, evaluator, store, run_id)
+                if analyses:
+                    matches = display_results(analyses)
+                    if matches:
+                        print(f"\n{len(matches)} candidates match your criteria!")
+                continue
+
+            if query.lower().split()[0] == "reevaluate":
+                parts = query.split()
+                run_id = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+                new_query = input("New query: ").strip()
+                if not new_query:
+                    continue
+                analyses = reevaluate_run(evaluator, store, run_id, new_query)
+                if analyses:
+                    matches = display_results(analyses)
+                    if matches:
+                        print(f"\n{len(matches)} candidates match your criteria!")
+                continue
+
             # Parse the natural language query
             print("\nParsing your query...")
             criteria = evaluator.parse_query(query)
@@ -212,6 +326,10 @@ def main():
             )
 
             if results:
+                run_id = store.start_run(criteria)
+                store.add_search_hits(run_id, results)
+                journal = RunJournal(run_id)
+                journal.start(criteria, results)
                 print(f"\nFound {len(results)} profiles:")
                 print("-" * 40)
                 for i, r in enumerate(results, 1):
@@ -231,10 +349,31 @@ def main():
                         results = results[:limit]
 
                     print(f"\nAnalyzing {len(results)} profiles...")
-                    print("(2-3 second delay between profiles to avoid rate limiting)")
-
-                    analyses = analyze_profiles(scraper, evaluator, results, criteria)
+                    print("(Profile visits are paced across a few tabs to avoid rate limiting)")
+
+                    journal.plan(results)
+                    print(f"(Interrupted? Type 'resume {run_id}' next time to pick up where this stopped)")
+
+                    # Profiles evaluated under the same criteria in an earlier run are reused
+                    reused = store.reusable_analyses(criteria, results, profile_cache)
+                    if reused:
+                        print(f"Reusing {len(reused)} profiles already evaluated for these criteria.")
+                        for analysis in reused:
+                            journal.fetched(analysis.url, analysis.work_history)
+                            journal.evaluated(analysis)
+                    reused_urls = {a.url for a in reused}
+                    results = [r for r in results if r.url not in reused_urls]
+
+                    evaluator.usage.reset()
+                    analyses = reused + analyze_profiles(scraper, evaluator, results, criteria, journal=journal)
+                    store.add_analyses(run_id, analyses)
+                    store.finish_run(run_id)
+                    journal.finish()
+                    journal.close()
                     matches = display_results(analyses)
+                    print(f"\n{evaluator.usage.summary()}")
+                    if browser.lean:
+                        print(f"\n{browser.lean_stats.summary(len(analyses))}")
 
                     if matches:
                         print(f"\n{len(matches)} candidates match your criteria!")
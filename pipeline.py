@@ -0,0 +1,186 @@
+"""
+Streaming search -> fetch -> evaluate pipeline.
+
+Profile pages are fetched in the browser thread while Claude evaluations run
+in a thread pool, so page loads and LLM calls overlap instead of alternating.
+A bounded number of evaluations may be pending at once; when the buffer is
+full the fetch stage waits, so a slow API never piles up unbounded work.
+
+reevaluate() runs the evaluate stage alone on work histories that were
+already fetched, so criteria can be tweaked without browsing again.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
+from cache import canonical_profile_url
+from evaluator import ProfileAnalysis, ProfileEvaluator, SearchCriteria
+from journal import RunJournal
+from scraper import LinkedInScraper, ProfileResult, WorkExperience
+
+if TYPE_CHECKING:
+    from browser_worker import BrowserWorker
+    from store import RunStore
+
+
+# Concurrent Claude calls in the evaluate stage
+DEFAULT_EVALUATE_CONCURRENCY = 4
+
+# Fetched profiles allowed to wait for (or be in) evaluation before fetching pauses
+DEFAULT_BUFFER_SIZE = 8
+
+
+def make_analysis(profile: ProfileResult, work_history: list[WorkExperience], result) -> ProfileAnalysis:
+    """Combine a profile, its work history and an EvaluationResult."""
+    return ProfileAnalysis(
+        name=profile.name,
+        url=profile.url,
+        work_history=work_history,
+        matches_criteria=result.matches_criteria,
+        reasoning=result.reasoning,
+        target_company=result.target_company,
+        left_date=result.left_date,
+        confidence=result.confidence
+    )
+
+
+class AnalysisPipeline:
+    """Runs search, fetch and evaluate as overlapping stages."""
+
+    def __init__(
+        self,
+        scraper: "LinkedInScraper | BrowserWorker",
+        evaluator: ProfileEvaluator,
+        fetch_concurrency: int | None = None,
+        evaluate_concurrency: int = DEFAULT_EVALUATE_CONCURRENCY,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        journal: RunJournal | None = None
+    ):
+        self.scraper = scraper
+        self.journal = journal
+        self.evaluator = evaluator
+        self.fetch_concurrency = fetch_concurrency
+        self.evaluate_concurrency = evaluate_concurrency
+        self.buffer_size = max(1, buffer_size)
+
+    def search(self, criteria: SearchCriteria, max_pages: int = 1) -> list[ProfileResult]:
+        """Search stage: LinkedIn search with the Past company filter."""
+        return self.scraper.search(
+            criteria.linkedin_search_query,
+            max_pages=max_pages,
+            past_company=criteria.company
+        )
+
+    def run(
+        self,
+        criteria: SearchCriteria,
+        profiles: Iterable[ProfileResult] | None = None,
+        max_pages: int = 1,
+        fetched: dict[str, list[WorkExperience]] | None = None
+    ) -> Iterator[ProfileAnalysis]:
+        """
+        Fetch and evaluate profiles, yielding each analysis as it completes.
+
+        Must be iterated from the thread that owns the browser, unless the
+        scraper is a BrowserWorker.
+
+        Args:
+            criteria: Parsed search criteria
+            profiles: Profiles to analyze; if None, the search stage runs first
+            max_pages: Result pages to scrape when searching
+            fetched: Work histories already fetched (e.g. from a journal),
+                by profile URL; these profiles skip the fetch stage
+
+        Yields:
+            ProfileAnalysis objects in completion order
+        """
+        if profiles is None:
+            profiles = self.search(criteria, max_pages=max_pages)
+        by_url = {p.url: p for p in profiles}
+        known = {url: history for url, history in (fetched or {}).items() if url in by_url}
+        pending: set[Future] = set()
+
+        with ThreadPoolExecutor(max_workers=self.evaluate_concurrency) as pool:
+            for url, work_history in known.items():
+                pending.add(pool.submit(self._evaluate, criteria, by_url[url], work_history))
+
+            to_fetch = [url for url in by_url if url not in known]
+            fetching = self.scraper.fetch_many(to_fetch, concurrency=self.fetch_concurrency) if to_fetch else []
+            for url, work_history in fetching:
+                if self.journal:
+                    self.journal.fetched(url, work_history)
+                pending.add(pool.submit(self._evaluate, criteria, by_url[url], work_history))
+
+                # Hand back finished evaluations; block only when the buffer is full
+                yield from self._drain(pending, block=len(pending) >= self.buffer_size)
+
+            while pending:
+                yield from self._drain(pending, block=True)
+
+    def _evaluate(
+        self,
+        criteria: SearchCriteria,
+        profile: ProfileResult,
+        work_history: list[WorkExperience]
+    ) -> ProfileAnalysis:
+        """Evaluate stage worker."""
+        result = self.evaluator.evaluate(criteria, work_history, profile.name)
+        return make_analysis(profile, work_history, result)
+
+    def _drain(self, pending: set[Future], block: bool) -> Iterator[ProfileAnalysis]:
+        """Yield completed evaluations, waiting for at least one if block is set."""
+        done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            analysis = future.result()
+            if self.journal:
+                self.journal.evaluated(analysis)
+            yield analysis
+
+
+def run_histories(store: "RunStore", run_id: int) -> list[tuple[ProfileResult, list[WorkExperience]]]:
+    """
+    Every work history a run has fetched, in search result order.
+
+    Histories come from the store, plus any that only reached the run's
+    journal (a run interrupted before its results were saved).
+    """
+    histories = store.run_histories(run_id)
+    state = RunJournal(run_id).load()
+    if state:
+        seen = {canonical_profile_url(p.url) for p, _ in histories}
+        histories += [
+            (p, state.fetched[p.url]) for p in state.profiles
+            if state.fetched.get(p.url) and canonical_profile_url(p.url) not in seen
+        ]
+    return histories
+
+
+def reevaluate(
+    evaluator: ProfileEvaluator,
+    criteria: SearchCriteria,
+    histories: Sequence[tuple[ProfileResult, list[WorkExperience]]],
+    concurrency: int = DEFAULT_EVALUATE_CONCURRENCY,
+    batched: bool = True
+) -> Iterator[ProfileAnalysis]:
+    """
+    Evaluate already-fetched work histories against new criteria.
+
+    Only the evaluate stage runs: the rule pre-filter settles clear-cut
+    candidates locally, cached verdicts are reused, and the rest go to
+    Claude in concurrent (by default batched) requests.
+
+    Args:
+        evaluator: ProfileEvaluator instance
+        criteria: The new criteria
+        histories: (profile, work_history) pairs, e.g. from run_histories()
+        concurrency: Claude requests in flight
+        batched: Pack several candidates into each request
+
+    Yields:
+        ProfileAnalysis objects in completion order
+    """
+    histories = list(histories)
+    candidates = [(profile.name, work_history) for profile, work_history in histories]
+    for i, result in evaluator.evaluate_many(criteria, candidates, concurrency=concurrency, batched=batched):
+        profile, work_history = histories[i]
+        yield make_analysis(profile, work_history, result)
@@ -0,0 +1,243 @@
+"""
+Page readiness signals for LinkedIn pages.
+
+Replaces fixed sleeps with waits on concrete signals: a selector is present,
+a list has stopped growing, and LinkedIn's data XHRs have gone quiet. Each
+signal has its own timeout, so fast pages return immediately and slow pages
+still get time to finish.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+
+# LinkedIn loads page data through its Voyager API (REST and GraphQL)
+VOYAGER_XHR_PATTERN = r"/voyager/api/"
+
+# Tracks how long the matched element count has been unchanged. State lives on
+# window so the check can run as a polled wait_for_function in the browser.
+STABLE_COUNT_JS = '''([selector, stableMs]) => {
+    const n = document.querySelectorAll(selector).length;
+    const state = window.__brainStableCounts || (window.__brainStableCounts = {});
+    const now = performance.now();
+    const prev = state[selector];
+    if (!prev || prev.n !== n) {
+        state[selector] = { n: n, t: now };
+        return false;
+    }
+    return n > 0 && now - prev.t >= stableMs ? n : false;
+}'''
+
+
+@dataclass
+class ReadinessTimeouts:
+    """Per-signal timeouts in milliseconds."""
+    selector: int = 10000   # Wait for a key element to appear
+    stable: int = 5000      # Wait for a list to stop growing
+    network: int = 5000     # Wait for data XHRs to finish
+    navigation: int = 10000 # Wait for a client-side URL change
+
+
+class PageReadiness:
+    """Waits for a page to be ready based on DOM and network signals."""
+
+    def __init__(
+        self,
+        page: Page,
+        xhr_pattern: str = VOYAGER_XHR_PATTERN,
+        timeouts: ReadinessTimeouts | None = None
+    ):
+        self.page = page
+        self.timeouts = timeouts or ReadinessTimeouts()
+        self._xhr_re = re.compile(xhr_pattern)
+        self._inflight = set()
+        self._last_activity = time.monotonic()
+
+        # Track relevant XHRs from the start so navigations are covered
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _on_request(self, request):
+        if self._xhr_re.search(request.url):
+            self._inflight.add(request)
+            self._last_activity = time.monotonic()
+
+    def _on_request_done(self, request):
+        if request in self._inflight:
+            self._inflight.discard(request)
+            self._last_activity = time.monotonic()
+
+    def mark_navigation(self):
+        """Start a fresh quiet window; call right before navigating or clicking."""
+        self._inflight.clear()
+        self._last_activity = time.monotonic()
+
+    def wait_for_selector(self, selector: str, timeout: int | None = None) -> bool:
+        """
+        Wait until an element matching selector is attached to the DOM.
+
+        Returns:
+            True if the element appeared, False on timeout
+        """
+        try:
+            self.page.wait_for_selector(
+                selector,
+                state="attached",
+                timeout=timeout or self.timeouts.selector
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    def wait_for_stable_count(
+        self,
+        selector: str,
+        stable_ms: int = 500,
+        timeout: int | None = None
+    ) -> int:
+        """
+        Wait until the number of elements matching selector stops changing.
+
+        Args:
+            selector: CSS selector for the list items
+            stable_ms: How long the count must be unchanged
+            timeout: Maximum wait in milliseconds
+
+        Returns:
+            The stable element count, or the current count on timeout
+        """
+        try:
+            handle = self.page.wait_for_function(
+                STABLE_COUNT_JS,
+                arg=[selector, stable_ms],
+                polling=100,
+                timeout=timeout or self.timeouts.stable
+            )
+            return int(handle.json_value())
+        except PlaywrightTimeoutError:
+            return len(self.page.query_selector_all(selector))
+
+    def is_network_quiet(self, quiet_ms: int = 500) -> bool:
+        """Non-blocking check: no matching XHRs in flight for at least quiet_ms."""
+        return not self._inflight and time.monotonic() - self._last_activity >= quiet_ms / 1000
+
+    def wait_for_network_quiet(self, quiet_ms: int = 500, timeout: int | None = None) -> bool:
+        """
+        Wait until no matching XHRs are in flight and none have started or
+        finished for quiet_ms.
+
+        Returns:
+            True if the network went quiet, False on timeout
+        """
+        deadline = time.monotonic() + (timeout or self.timeouts.network) / 1000
+
+        while time.monotonic() < deadline:
+            if self.is_network_quiet(quiet_ms):
+                return True
+            # Short waits let Playwright dispatch the request events
+            self.page.wait_for_timeout(50)
+
+        return False
+
+    def wait_for_url_change(self, old_url: str, timeout: int | None = None) -> bool:
+        """
+        Wait for a client-side navigation away from old_url.
+
+        Returns:
+            True if the URL changed, False on timeout
+        """
+        try:
+            self.page.wait_for_url(
+                lambda url: url != old_url,
+                wait_until="commit",
+                timeout=timeout or self.timeouts.navigation
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    def wait_for_list(self, selector: str, stable_ms: int = 500) -> int:
+        """
+        Wait for a data-driven list: element present, data XHRs quiet and the
+        item count stable.
+
+        Returns:
+            Number of matching items (0 if the list never appeared)
+        """
+        if not self.wait_for_selector(selector):
+            return 0
+        self.wait_for_network_quiet()
+        return self.wait_for_stable_count(selector, stable_ms=stable_ms)
+
+
+class AsyncPageReadiness(PageReadiness):
+    """PageReadiness for playwright.async_api pages. Same signals, awaitable waits."""
+
+    def __init__(
+        self,
+        page: AsyncPage,
+        xhr_pattern: str = VOYAGER_XHR_PATTERN,
+        timeouts: ReadinessTimeouts | None = None
+    ):
+        super().__init__(page, xhr_pattern, timeouts)
+
+    async def wait_for_selector(self, selector: str, timeout: int | None = None) -> bool:
+        try:
+            await self.page.wait_for_selector(
+                selector,
+                state="attached",
+                timeout=timeout or self.timeouts.selector
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def wait_for_stable_count(
+        self,
+        selector: str,
+        stable_ms: int = 500,
+        timeout: int | None = None
+    ) -> int:
+        try:
+            handle = await self.page.wait_for_function(
+                STABLE_COUNT_JS,
+                arg=[selector, stable_ms],
+                polling=100,
+                timeout=timeout or self.timeouts.stable
+            )
+            return int(await handle.json_value())
+        except PlaywrightTimeoutError:
+            return len(await self.page.query_selector_all(selector))
+
+    async def wait_for_network_quiet(self, quiet_ms: int = 500, timeout: int | None = None) -> bool:
+        deadline = time.monotonic() + (timeout or self.timeouts.network) / 1000
+
+        while time.monotonic() < deadline:
+            if self.is_network_quiet(quiet_ms):
+                return True
+            # Request events are dispatched by the event loop while we sleep
+            await asyncio.sleep(0.05)
+
+        return False
+
+    async def wait_for_url_change(self, old_url: str, timeout: int | None = None) -> bool:
+        try:
+            await self.page.wait_for_url(
+                lambda url: url != old_url,
+                wait_until="commit",
+                timeout=timeout or self.timeouts.navigation
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def wait_for_list(self, selector: str, stable_ms: int = 500) -> int:
+        if not await self.wait_for_selector(selector):
+            return 0
+        await self.wait_for_network_quiet()
+        return await self.wait_for_stable_count(selector, stable_ms=stable_ms)
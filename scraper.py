@@ -2,11 +2,234 @@
 LinkedIn search results scraper.
 """
 
+import json
 import re
 import time
 import urllib.parse
 from dataclasses import dataclass
+from typing import Iterator, TYPE_CHECKING
+from playwright.sync_api import Page
 from browser import LinkedInBrowser
+from readiness import PageReadiness
+from voyager import VoyagerCapture, parse_positions, parse_search_hits, positions_complete
+
+if TYPE_CHECKING:
+    from archive import PageArchive
+    from cache import CompanyCache, ProfileCache
+
+
+# Anchors to profiles on a search results page
+SEARCH_RESULT_SELECTOR = 'a[href*="/in/"]'
+
+# Top-level entries on the experience details page
+EXPERIENCE_ITEM_SELECTOR = 'li.pvs-list__paged-list-item'
+# "Nothing to see for now" placeholder on an experience page with no positions
+EXPERIENCE_EMPTY_SELECTOR = '.artdeco-empty-state'
+# Items or the empty-state placeholder, whichever the page renders
+EXPERIENCE_LOADED_SELECTOR = f'{EXPERIENCE_ITEM_SELECTOR}, {EXPERIENCE_EMPTY_SELECTOR}'
+
+# Walks every profile anchor on a search results page in one round trip.
+# Applies the visibility, mutual-connection and non-name filters in the page
+# and returns a compact {url, name, headline, x} per result.
+SEARCH_RESULTS_JS = r'''(selector) => {
+    const skipNames = ["view", "message", "connect", "follow", "linkedin member"];
+    const results = [];
+    const seen = new Set();
+
+    for (const el of document.querySelectorAll(selector)) {
+        // Skip hidden anchors (no layout box or hidden by style)
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) continue;
+        const style = window.getComputedStyle(el);
+        if (style.visibility === "hidden" || style.display === "none") continue;
+
+        const match = (el.getAttribute("href") || "").match(/\/in\/[^\/?#]+/);
+        if (!match) continue;
+        const url = "https://www.linkedin.com" + match[0];
+        if (seen.has(url)) continue;
+
+        // Check for "mutual" in nearby text (within 2 parent levels)
+        let isMutual = false;
+        let p = el.parentElement;
+        for (let i = 0; i < 2 && p; i++) {
+            const t = p.innerText || "";
+            const tLower = t.toLowerCase();
+            // Catch both "X and Y are mutual connections" and "X is a mutual connection"
+            if (tLower.includes("mutual") && (t.includes(" and ") || tLower.includes(" is a mutual"))) {
+                isMutual = true;
+                break;
+            }
+            p = p.parentElement;
+        }
+        if (isMutual) continue;
+
+        const name = el.innerText.trim();
+        if (!name || name.length > 60 || name.length < 2) continue;
+        if (skipNames.includes(name.toLowerCase())) continue;
+
+        // Headline is the first real line after the name in the result card
+        let headline = null;
+        const card = el.closest("li");
+        if (card) {
+            const lines = card.innerText.split("\n").map(l => l.trim()).filter(l => l);
+            const firstName = name.split("\n")[0];
+            const start = lines.indexOf(firstName);
+            for (const line of lines.slice(start + 1)) {
+                if (line === firstName || line.startsWith("•") || /^View .*profile/.test(line) ||
+                    /degree connection|^\d(st|nd|rd|th)\+?$/i.test(line)) continue;
+                headline = line.substring(0, 200);
+                break;
+            }
+        }
+
+        seen.add(url);
+        results.push({ url: url, name: name, headline: headline, x: rect.left });
+    }
+
+    return results;
+}'''
+
+# Pagination state of a search results page in one round trip: whether a
+# next page exists, the highest page number shown and the total result count
+PAGINATION_JS = r'''() => {
+    let current = 1;
+    let maxPage = 1;
+    for (const el of document.querySelectorAll('[aria-label^="Page "], [data-test-pagination-page-btn]')) {
+        const label = el.getAttribute('aria-label') || el.innerText || '';
+        const match = label.match(/(\d+)/);
+        if (!match) continue;
+        const num = parseInt(match[1], 10);
+        maxPage = Math.max(maxPage, num);
+        if (el.getAttribute('aria-current') || el.classList.contains('active') ||
+            (el.closest('li') && el.closest('li').classList.contains('active'))) {
+            current = num;
+        }
+    }
+
+    const next = document.querySelector(
+        'button[aria-label="Next"], button.artdeco-pagination__button--next, a[aria-label="Next"]'
+    );
+    const nextEnabled = !!next && !next.disabled && next.getAttribute('aria-disabled') !== 'true';
+
+    let total = null;
+    const text = document.querySelector('main') ? document.querySelector('main').innerText : '';
+    const totalMatch = text.match(/(?:About\s+)?([\d,]+)\s+results?/i);
+    if (totalMatch) total = parseInt(totalMatch[1].replace(/,/g, ''), 10);
+
+    return { hasNext: nextEnabled || maxPage > current, current: current, maxPage: maxPage, total: total };
+}'''
+
+# Registered once per browser context as an init script, so every experience
+# page already has the extractor and nothing is re-sent per call.
+# window.__brainExperience.extract() returns the full text of each top-level
+# experience item, plus whether it groups several roles at one company.
+# scrollAndExtract() scrolls until a MutationObserver sees the item count stop
+# growing, then extracts in the same call.
+EXPERIENCE_INIT_JS = r'''(() => {
+    const extract = (selector) => {
+        let results = [];
+
+        // Get all top-level experience items
+        let items = document.querySelectorAll(selector);
+
+        for (let item of items) {
+            // Get the full inner text of this item
+            let fullText = item.innerText.trim();
+
+            // Skip if too short or too long
+            if (fullText.length < 20 || fullText.length > 3000) continue;
+
+            // Skip if it looks like a "Show more" button
+            if (fullText.toLowerCase().includes('show all') ||
+                fullText.toLowerCase().includes('see more')) continue;
+
+            // Also get structured spans for better parsing
+            let spans = item.querySelectorAll(':scope > div span[aria-hidden="true"]');
+            let topSpans = [];
+            spans.forEach(s => {
+                let t = s.innerText.trim();
+                if (t && t.length > 0 && t.length < 200) {
+                    topSpans.push(t);
+                }
+            });
+
+            // Check if this has nested roles (multiple positions at same company)
+            let nestedUl = item.querySelector(':scope > div > div > ul');
+            let hasNested = nestedUl && nestedUl.querySelectorAll(':scope > li').length > 0;
+
+            results.push({
+                fullText: fullText,
+                topSpans: topSpans,
+                hasNested: hasNested
+            });
+        }
+
+        return results;
+    };
+
+    // Resolves true as soon as the item count grows, false after quietMs without growth
+    const waitForGrowth = (selector, count, quietMs) => new Promise(resolve => {
+        const observer = new MutationObserver(() => {
+            if (document.querySelectorAll(selector).length > count) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(true);
+            }
+        });
+        observer.observe(document.body, { childList: true, subtree: true });
+        const timer = setTimeout(() => {
+            observer.disconnect();
+            resolve(false);
+        }, quietMs);
+    });
+
+    const scrollAndExtract = async ({ selector, emptySelector, quietMs, emptyMs, timeoutMs }) => {
+        const started = performance.now();
+        const deadline = started + timeoutMs;
+        while (performance.now() < deadline) {
+            const count = document.querySelectorAll(selector).length;
+            window.scrollTo(0, document.body.scrollHeight);
+            const grew = await waitForGrowth(selector, count, quietMs);
+            if (grew) continue;
+            if (count > 0) break;
+            // No positions: an empty-state placeholder, or a loaded page that has stayed empty
+            if (document.querySelector(emptySelector)) break;
+            if (document.readyState === 'complete' && performance.now() - started >= emptyMs) break;
+        }
+        return extract(selector);
+    };
+
+    window.__brainExperience = { extract, scrollAndExtract };
+})()'''
+
+# Calls the registered routine; the fallback covers documents loaded before registration
+SCROLL_AND_EXTRACT_JS = '''async (opts) => {
+    if (!window.__brainExperience) return null;
+    return await window.__brainExperience.scrollAndExtract(opts);
+}'''
+
+# Lazy-load driver settings: stop once no new item appears for quietMs, or
+# once an empty list has stayed empty for emptyMs
+SCROLL_OPTIONS = {
+    "selector": EXPERIENCE_ITEM_SELECTOR,
+    "emptySelector": EXPERIENCE_EMPTY_SELECTOR,
+    "quietMs": 600,
+    "emptyMs": 2000,
+    "timeoutMs": 15000
+}
+
+# What a tab's experience page shows so far: "items", "empty" or document.readyState
+EXPERIENCE_STATE_JS = '''([items, empty]) =>
+    document.querySelector(items) ? "items" : document.querySelector(empty) ? "empty" : document.readyState'''
+
+# Seconds a loaded, network-quiet page with no positions must stay empty to count as ready
+EMPTY_SETTLE_SECONDS = 2.0
+
+# LinkedIn people search shows 10 results per page
+RESULTS_PER_PAGE = 10
+
+# Number of tabs used for parallel page loads. Kept low so LinkedIn traffic stays human-like.
+DEFAULT_CONCURRENCY = 3
 
 
 @dataclass
@@ -42,22 +265,96 @@ def parse_search_query(natural_query: str) -> dict:
     }
 
 
-def build_search_url(keywords: str, page: int = 1) -> str:
-    """Build LinkedIn people search URL."""
+def experience_url(profile_url: str) -> str:
+    """Build the full experience details URL for a profile."""
+    return profile_url.rstrip('/') + '/details/experience/'
+
+
+def build_search_url(
+    keywords: str,
+    page: int = 1,
+    past_company_ids: list[str] | None = None,
+    current_company_ids: list[str] | None = None
+) -> str:
+    """
+    Build LinkedIn people search URL.
+
+    Company filters take LinkedIn company IDs and are encoded the way the
+    All filters dialog does, e.g. pastCompany=["1815218"].
+    """
     encoded = urllib.parse.quote(keywords)
     url = f"https://www.linkedin.com/search/results/people/?keywords={encoded}"
+    if past_company_ids or current_company_ids:
+        url += "&origin=FACETED_SEARCH"
+    if past_company_ids:
+        url += "&pastCompany=" + urllib.parse.quote(json.dumps(past_company_ids, separators=(",", ":")))
+    if current_company_ids:
+        url += "&currentCompany=" + urllib.parse.quote(json.dumps(current_company_ids, separators=(",", ":")))
     if page > 1:
         # LinkedIn uses 10 results per page, origin parameter for pagination
         url += f"&page={page}"
     return url
 
 
+def with_page(search_url: str, page: int) -> str:
+    """Return a search URL (including any filters) pointing at a given results page."""
+    parts = urllib.parse.urlparse(search_url)
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query) if k != "page"]
+    if page > 1:
+        query.append(("page", str(page)))
+    return urllib.parse.urlunparse(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+def company_ids_from_url(url: str, param: str = "pastCompany") -> list[str] | None:
+    """Read company IDs from a search URL filter parameter, e.g. pastCompany=["1815218"]."""
+    values = urllib.parse.parse_qs(urllib.parse.urlparse(url).query).get(param)
+    if not values:
+        return None
+    try:
+        ids = json.loads(values[0])
+    except json.JSONDecodeError:
+        return None
+    return [str(i) for i in ids] if isinstance(ids, list) and ids else None
+
+
+@dataclass
+class _Tab:
+    """A browser tab in the profile fetching pool."""
+    page: Page
+    ready: PageReadiness
+    capture: VoyagerCapture
+    url: str | None = None       # Profile currently loading in this tab
+    started: float = 0.0         # time.monotonic() when navigation started
+    empty_since: float | None = None  # When the loaded page was first seen without positions
+
+
 class LinkedInScraper:
     """Scrapes LinkedIn search results."""
 
-    def __init__(self, browser: LinkedInBrowser):
+    def __init__(
+        self,
+        browser: LinkedInBrowser,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        cache: "ProfileCache | None" = None,
+        archive: "PageArchive | None" = None,
+        companies: "CompanyCache | None" = None
+    ):
         self.browser = browser
+        self.cache = cache
+        # Company name -> ID lookups so filters can go straight into the URL
+        self.companies = companies
+        # Opt-in store of raw experience payloads for offline re-parsing
+        self.archive = archive
         self.page = browser.page
+        self.ready = PageReadiness(self.page)
+        self.capture = VoyagerCapture(self.page)
+        self.concurrency = concurrency
+        self._last_start = 0.0
+        # Main page first, extra tabs are opened on demand by fetch_many
+        self._tabs = [_Tab(page=self.page, ready=self.ready, capture=self.capture)]
+
+        # Applies to every page in the context, including future pool tabs
+        browser.context.add_init_script(EXPERIENCE_INIT_JS)
 
     def search(self, query: str, max_pages: int = 1, past_company: str = None) -> list[ProfileResult]:
         """
@@ -74,148 +371,112 @@ class LinkedInScraper:
         parsed = parse_search_query(query)
         all_results = []
 
+        # Known company IDs go straight into the URL, skipping the filter dialog
+        company_ids = self.companies.get(past_company) if past_company and self.companies else None
+
         # Navigate to first page
-        url = build_search_url(parsed["keywords"], 1)
+        url = build_search_url(parsed["keywords"], 1, past_company_ids=company_ids)
+        self._before_navigation(self._tabs[0])
         self.page.goto(url, timeout=60000)
         self.page.wait_for_load_state("domcontentloaded")
-        self.page.wait_for_timeout(3000)
+        self.ready.wait_for_list(SEARCH_RESULT_SELECTOR)
 
-        # Apply past company filter if specified
-        if past_company:
+        if company_ids:
+            print(f"  Using 'Past company' filter: {past_company} (IDs {', '.join(company_ids)})")
+        elif past_company:
+            # First search for this company: resolve it through the dialog once
             print(f"  Applying 'Past company' filter: {past_company}")
             if not self._apply_past_company_filter(past_company):
                 print("  Warning: Could not apply past company filter, continuing with keyword search")
-
-        for page_num in range(1, max_pages + 1):
+            elif self.companies:
+                resolved = company_ids_from_url(self.page.url)
+                if resolved:
+                    self.companies.put(past_company, resolved)
+                    print(f"    Cached company IDs for {past_company}: {', '.join(resolved)}")
+
+        # Page 1 is already loaded in the main tab
+        print("  Scraping page 1...")
+
+        # Save screenshot for debugging
+        self.page.screenshot(path="debug_screenshot.png")
+        print(f"    (Screenshot saved to debug_screenshot.png)")
+
+        results = self._extract_results()
+        if not results:
+            print("  No results on page 1, stopping.")
+            return all_results
+        all_results.extend(results)
+        print(f"  Found {len(results)} profiles on page 1")
+
+        info = self.page.evaluate(PAGINATION_JS)
+        print(f"    (Has next page: {info['hasNext']}, total results: {info['total'] or 'unknown'})")
+        if max_pages <= 1 or not info["hasNext"]:
+            return all_results
+
+        # Remaining pages are addressed by URL (filters included) and loaded
+        # in parallel tabs, prefetching ahead of the page being extracted
+        last_page = max_pages
+        if info["total"]:
+            last_page = min(last_page, -(-info["total"] // RESULTS_PER_PAGE))
+        page_urls = [with_page(self.page.url, n) for n in range(2, last_page + 1)]
+        seen_urls = {r.url for r in all_results}
+
+        for page_num, tab in enumerate(self._load_in_order(page_urls), start=2):
             print(f"  Scraping page {page_num}...")
-
-            # For page 2+, click Next button to preserve filters
-            if page_num > 1:
-                if not self._goto_next_page():
-                    print(f"  Could not navigate to page {page_num}, stopping.")
-                    break
-                self.page.wait_for_load_state("domcontentloaded")
-
-            # Wait for search results to load
-            self.page.wait_for_timeout(3000)
-
-            # Save screenshot for debugging
-            self.page.screenshot(path="debug_screenshot.png")
-            print(f"    (Screenshot saved to debug_screenshot.png)")
-
-            results = self._extract_results()
+            results = [r for r in self._extract_results(tab) if r.url not in seen_urls]
             if not results:
                 print(f"  No results on page {page_num}, stopping.")
                 break
 
+            seen_urls.update(r.url for r in results)
             all_results.extend(results)
             print(f"  Found {len(results)} profiles on page {page_num}")
 
-            # Check if there's a next page
-            has_next = self._has_next_page()
-            print(f"    (Has next page: {has_next})")
-            if not has_next:
-                break
-
         return all_results
 
-    def _extract_results(self) -> list[ProfileResult]:
-        """Extract profile results from current search results page."""
-        results = []
-        seen_urls = set()
-
-        # Get all profile links directly
-        all_links = self.page.query_selector_all('a[href*="/in/"]')
-        print(f"    Debug: Found {len(all_links)} profile links")
-
-        # Debug: find what container holds these links
-        if all_links:
-            for i, link in enumerate(all_links[:3]):
-                try:
-                    # Find the nearest container div
-                    parent_info = link.evaluate('''el => {
-                        let p = el.parentElement;
-                        for (let i = 0; i < 5 && p; i++) {
-                            if (p.tagName === "DIV" && p.className) {
-                                return p.className.substring(0, 80);
-                            }
-                            p = p.parentElement;
-                        }
-                        return "no div parent";
-                    }''')
-                    print(f"    Link {i+1} container: {parent_info}")
-                except:
-                    pass
-
-        # Process each profile link
-        for link in all_links:
+    def _load_in_order(self, urls: list[str], delay: float = 1.0) -> Iterator[_Tab]:
+        """
+        Load search pages across the tab pool and yield each tab, in URL order,
+        once its results list is ready. Later pages are already loading while
+        the caller extracts the current one.
+        """
+        tabs = self._get_tabs(min(self.concurrency, len(urls)))
+        pending = list(reversed(urls))
+        loading = []  # Tabs in URL order
+
+        def start(tab: _Tab):
+            url = pending.pop()
+            self._pace(delay)
+            self._before_navigation(tab)
             try:
-                if not link.is_visible():
-                    continue
-
-                href = link.get_attribute("href")
-                if not href:
-                    continue
-
-                profile_url = self._clean_profile_url(href)
-                if not profile_url or profile_url in seen_urls:
-                    continue
-
-                # Get link info using JavaScript
-                link_info = link.evaluate('''el => {
-                    let linkText = el.innerText.trim();
-
-                    // Get bounding box to check position (main results are centered)
-                    let rect = el.getBoundingClientRect();
-                    let x = rect.left;
-
-                    // Check for "mutual" in nearby text (within 2 parent levels)
-                    let isMutual = false;
-                    let p = el.parentElement;
-                    for (let i = 0; i < 2 && p; i++) {
-                        let t = p.innerText || "";
-                        let tLower = t.toLowerCase();
-                        // Catch both "X and Y are mutual connections" and "X is a mutual connection"
-                        if (tLower.includes("mutual") && (t.includes(" and ") || tLower.includes(" is a mutual"))) {
-                            isMutual = true;
-                            break;
-                        }
-                        p = p.parentElement;
-                    }
-
-                    return {
-                        name: linkText,
-                        x: x,
-                        isMutual: isMutual
-                    };
-                }''')
-
-                name = link_info.get("name", "")
-                is_mutual = link_info.get("isMutual", False)
-                x_pos = link_info.get("x", 0)
-
-                # Skip if clearly a mutual connection mention
-                if is_mutual:
-                    continue
-
-                # Skip if name is empty or too long or too short
-                if not name or len(name) > 60 or len(name) < 2:
-                    continue
-
-                # Skip common non-name patterns
-                if name.lower() in ["view", "message", "connect", "follow", "linkedin member"]:
-                    continue
-
-                seen_urls.add(profile_url)
-
-                results.append(ProfileResult(
-                    name=name,
-                    url=profile_url,
-                    headline=None
-                ))
+                tab.page.goto(url, wait_until="commit", timeout=60000)
+            except Exception as e:
+                print(f"    Warning: Could not open {url}: {e}")
+            loading.append(tab)
+
+        for tab in tabs:
+            if pending:
+                start(tab)
+
+        while loading:
+            tab = loading.pop(0)
+            tab.ready.wait_for_list(SEARCH_RESULT_SELECTOR)
+            yield tab
+            if pending:
+                start(tab)
+
+    def _extract_results(self, tab: _Tab | None = None) -> list[ProfileResult]:
+        """Extract profile results from current search results page."""
+        tab = tab or self._tabs[0]
 
-            except Exception:
-                continue
+        # Prefer the search JSON the page loaded, fall back to the DOM
+        if not tab.capture.search:
+            tab.capture.collect_embedded("search")
+        hits = parse_search_hits(tab.capture.search)
+        if not hits:
+            # One round trip: filtering happens in the page
+            hits = tab.page.evaluate(SEARCH_RESULTS_JS, SEARCH_RESULT_SELECTOR)
+        results = self._profiles_from_hits(hits)
 
         # Debug: print what we found
         for r in results:
@@ -223,116 +484,14 @@ class LinkedInScraper:
 
         return results
 
-    def _clean_profile_url(self, href: str) -> str | None:
-        """Extract clean LinkedIn profile URL."""
-        # Match /in/username pattern
-        match = re.search(r'(/in/[^/?]+)', href)
-        if match:
-            return f"https://www.linkedin.com{match.group(1)}"
-        return None
-
-    def _extract_name(self, link) -> str | None:
-        """Extract name from profile link or parent elements."""
-        # Try to get text from the link itself
-        text = link.inner_text().strip()
-
-        # Filter out non-name text
-        if text and len(text) < 100 and not text.startswith("View"):
-            # Clean up the name
-            name = text.split("\n")[0].strip()
-            if name:
-                return name
-
-        # Try aria-label
-        aria = link.get_attribute("aria-label")
-        if aria:
-            # aria-label often contains "View X's profile"
-            match = re.search(r"View (.+?)['']s profile", aria)
-            if match:
-                return match.group(1)
-
-        return None
-
-    def _extract_headline(self, element) -> str | None:
-        """Try to extract headline/title from nearby elements."""
-        try:
-            text = element.inner_text()
-            lines = [l.strip() for l in text.split("\n") if l.strip()]
-            # Headline is usually the second non-empty line after name
-            if len(lines) >= 2:
-                return lines[1][:200]  # Limit length
-        except Exception:
-            pass
-        return None
-
-    def _has_next_page(self) -> bool:
-        """Check if there's a next page of results."""
-        # Try multiple selectors for the next button
-        selectors = [
-            'button[aria-label="Next"]',
-            'button.artdeco-pagination__button--next',
-            'button[aria-label*="Next"]',
-            'a[aria-label="Next"]',
+    @staticmethod
+    def _profiles_from_hits(hits: list[dict]) -> list[ProfileResult]:
+        """Convert SEARCH_RESULTS_JS output to ProfileResult objects."""
+        return [
+            ProfileResult(name=hit["name"], url=hit["url"], headline=hit.get("headline"))
+            for hit in hits
         ]
 
-        for selector in selectors:
-            next_button = self.page.query_selector(selector)
-            if next_button and next_button.is_visible():
-                disabled = next_button.get_attribute("disabled")
-                if not disabled:
-                    return True
-
-        # Also check for pagination numbers - if there's a page 2 link, there's a next page
-        page_buttons = self.page.query_selector_all('button[aria-label*="Page"]')
-        current_page = 1
-        max_page = 1
-        for btn in page_buttons:
-            try:
-                label = btn.get_attribute("aria-label") or ""
-                if "Page" in label:
-                    import re
-                    match = re.search(r'Page (\d+)', label)
-                    if match:
-                        page_num = int(match.group(1))
-                        max_page = max(max_page, page_num)
-                        if "current" in label.lower():
-                            current_page = page_num
-            except:
-                pass
-
-        return max_page > current_page
-
-    def _goto_next_page(self) -> bool:
-        """
-        Click the Next button to go to the next page of results.
-        This preserves any applied filters (unlike URL navigation).
-
-        Returns:
-            True if navigation succeeded, False otherwise
-        """
-        try:
-            # Try multiple selectors for the next button
-            selectors = [
-                'button[aria-label="Next"]',
-                'button.artdeco-pagination__button--next',
-                'button[aria-label*="Next"]',
-                'a[aria-label="Next"]',
-            ]
-
-            for selector in selectors:
-                next_button = self.page.query_selector(selector)
-                if next_button and next_button.is_visible():
-                    disabled = next_button.get_attribute("disabled")
-                    if not disabled:
-                        next_button.click()
-                        self.page.wait_for_timeout(2000)
-                        return True
-
-            return False
-        except Exception as e:
-            print(f"    Error navigating to next page: {e}")
-            return False
-
     def _apply_past_company_filter(self, company: str) -> bool:
         """
         Apply LinkedIn's 'Past company' filter.
@@ -354,7 +513,7 @@ class LinkedInScraper:
                 return False
 
             all_filters_btn.click()
-            self.page.wait_for_timeout(2000)
+            self.ready.wait_for_selector('[role="dialog"]')
 
             # Scroll down in the filter panel to reveal "Past company" section
             self.page.evaluate('''() => {
@@ -364,7 +523,7 @@ class LinkedInScraper:
                     }
                 });
             }''')
-            self.page.wait_for_timeout(1000)
+            self.ready.wait_for_selector('button:has-text("Add a company")', timeout=3000)
 
             past_company_input = None
 
@@ -391,7 +550,7 @@ class LinkedInScraper:
             }''' , company)
 
             if result.get('success'):
-                self.page.wait_for_timeout(1500)
+                self.ready.wait_for_selector('input[placeholder="Add a company"]', timeout=5000)
 
                 # The input that appears has placeholder "Add a company"
                 past_company_input = self.page.query_selector('input[placeholder="Add a company"]')
@@ -409,18 +568,18 @@ class LinkedInScraper:
             # Type the company name
             past_company_input.click()
             past_company_input.fill(company)
-            self.page.wait_for_timeout(1500)  # Wait for autocomplete
 
             # Select first autocomplete suggestion
             # LinkedIn typically shows suggestions in a listbox or dropdown
-            suggestion = self.page.query_selector('[role="listbox"] [role="option"], .basic-typeahead__selectable')
+            suggestion_selector = '[role="listbox"] [role="option"], .basic-typeahead__selectable'
+            self.ready.wait_for_selector(suggestion_selector, timeout=5000)
+            suggestion = self.page.query_selector(suggestion_selector)
             if suggestion:
                 suggestion.click()
-                self.page.wait_for_timeout(500)
             else:
                 # Try pressing Enter to confirm
                 past_company_input.press("Enter")
-                self.page.wait_for_timeout(500)
+            self.ready.wait_for_network_quiet(quiet_ms=300, timeout=2000)
 
             # Click "Show results" button to apply filters
             show_results_btn = self.page.query_selector('button:has-text("Show results")')
@@ -428,8 +587,12 @@ class LinkedInScraper:
                 show_results_btn = self.page.query_selector('button[aria-label*="Apply"], button:has-text("Apply")')
 
             if show_results_btn:
+                old_url = self.page.url
+                self._before_navigation(self._tabs[0])
                 show_results_btn.click()
-                self.page.wait_for_timeout(3000)  # Wait for results to reload
+                # Filters are reflected in the URL once results reload
+                self.ready.wait_for_url_change(old_url)
+                self.ready.wait_for_list(SEARCH_RESULT_SELECTOR)
                 print(f"    Applied 'Past company' filter for: {company}")
                 return True
             else:
@@ -447,7 +610,13 @@ class LinkedInScraper:
                 pass
             return False
 
-    def get_profile_experience(self, profile_url: str, delay: float = 2.5, debug: bool = True) -> list[WorkExperience]:
+    def get_profile_experience(
+        self,
+        profile_url: str,
+        delay: float = 2.5,
+        debug: bool = True,
+        max_age: float | None = None
+    ) -> list[WorkExperience]:
         """
         Visit a profile and extract work experience history.
 
@@ -455,91 +624,231 @@ class LinkedInScraper:
             profile_url: LinkedIn profile URL
             delay: Seconds to wait before visiting (rate limiting)
             debug: If True, save debug info to files
+            max_age: Use a cached visit younger than this many seconds
+                (defaults to the cache TTL; 0 forces a visit)
 
         Returns:
             List of WorkExperience objects
         """
+        cached = self._cached(profile_url, max_age)
+        if cached is not None:
+            if debug:
+                print("    (Using cached work history)")
+            return cached
+
         # Rate limiting delay
         if delay > 0:
             time.sleep(delay)
 
         # Navigate directly to the full experience details page
         # This shows ALL experiences, not just the preview
-        experience_url = profile_url.rstrip('/') + '/details/experience/'
-        self.page.goto(experience_url, timeout=60000)
+        self._before_navigation(self._tabs[0])
+        self.page.goto(experience_url(profile_url), timeout=60000)
         self.page.wait_for_load_state("domcontentloaded")
-        self.page.wait_for_timeout(3000)  # Wait for dynamic content
 
+        return self._remember(profile_url, self._read_experience(self._tabs[0], profile_url, debug=debug))
+
+    def fetch_many(
+        self,
+        profile_urls: list[str],
+        concurrency: int | None = None,
+        delay: float = 1.0,
+        timeout: float = 30.0,
+        max_age: float | None = None
+    ) -> Iterator[tuple[str, list[WorkExperience]]]:
+        """
+        Fetch work experience for many profiles across a pool of tabs.
+
+        Navigations are started in up to `concurrency` tabs of the shared
+        browser context, so pages load in parallel while finished tabs are
+        extracted. Results are yielded in completion order.
+
+        Args:
+            profile_urls: LinkedIn profile URLs
+            concurrency: Number of tabs to use (defaults to self.concurrency)
+            delay: Minimum seconds between starting two profile visits (rate limiting)
+            timeout: Seconds after which a tab is extracted even if not ready
+            max_age: Use cached visits younger than this many seconds
+                (defaults to the cache TTL; 0 forces a visit)
+
+        Yields:
+            (profile_url, work_history) tuples as each profile completes
+        """
+        # Cached profiles complete immediately
+        pending = []
+        for url in profile_urls:
+            cached = self._cached(url, max_age)
+            if cached is not None:
+                yield url, cached
+            else:
+                pending.append(url)
+        pending.reverse()
+        tabs = self._get_tabs(concurrency or self.concurrency)
+        failed = []
+
+        def start(tab: _Tab) -> bool:
+            """Start loading the next pending profile in tab."""
+            while pending:
+                url = pending.pop()
+                self._pace(delay)
+                self._before_navigation(tab)
+                try:
+                    # Return as soon as navigation commits; the page keeps loading
+                    tab.page.goto(experience_url(url), wait_until="commit", timeout=60000)
+                except Exception as e:
+                    print(f"    Warning: Could not open {url}: {e}")
+                    failed.append(url)
+                    continue
+                tab.url = url
+                tab.started = time.monotonic()
+                return True
+            return False
+
+        for tab in tabs:
+            tab.url = None  # Left over from a fetch_many that was closed early
+
+        try:
+            for tab in tabs:
+                if not start(tab):
+                    break
+
+            while True:
+                # Report navigation failures in order with the rest
+                while failed:
+                    yield failed.pop(0), []
+
+                active = [tab for tab in tabs if tab.url]
+                if not active:
+                    break
+
+                # Pick the first tab whose page has loaded, or the oldest timed-out one
+                done = None
+                for tab in sorted(active, key=lambda t: t.started):
+                    if time.monotonic() - tab.started > timeout or self._is_experience_ready(tab):
+                        done = tab
+                        break
+                if done is None:
+                    active[0].page.wait_for_timeout(50)
+                    continue
+
+                url = done.url
+                done.url = None
+                experiences = self._remember(url, self._read_experience(done, url, debug=False))
+                start(done)
+                yield url, experiences
+        finally:
+            # The caller may stop iterating with profiles still loading
+            for tab in tabs:
+                tab.url = None
+
+    def _cached(self, profile_url: str, max_age: float | None) -> list[WorkExperience] | None:
+        """Work history from the profile cache, or None if it must be fetched."""
+        if not self.cache:
+            return None
+        entry = self.cache.get(profile_url, max_age)
+        return entry.work_history if entry else None
+
+    def _remember(self, profile_url: str, experiences: list[WorkExperience]) -> list[WorkExperience]:
+        """Store a fetched work history in the profile cache."""
+        # An empty history usually means the page failed to load; don't pin it
+        if self.cache and experiences:
+            self.cache.put(profile_url, experiences)
+        return experiences
+
+    def _get_tabs(self, count: int) -> list[_Tab]:
+        """Return `count` pool tabs, opening new ones in the browser context as needed."""
+        count = max(1, count)
+        while len(self._tabs) < count:
+            page = self.browser.new_page()
+            self._tabs.append(_Tab(page=page, ready=PageReadiness(page), capture=VoyagerCapture(page)))
+        return self._tabs[:count]
+
+    def _pace(self, delay: float):
+        """Space navigation starts at least `delay` seconds apart across all tabs."""
+        wait = self._last_start + delay - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_start = time.monotonic()
+
+    @staticmethod
+    def _before_navigation(tab: _Tab):
+        """Drop captured payloads and restart the network quiet window for a new page."""
+        tab.capture.reset()
+        tab.ready.mark_navigation()
+        tab.empty_since = None
+
+    def _is_experience_ready(self, tab: _Tab) -> bool:
+        """Cheap check whether a tab's experience data has arrived and its XHRs are done."""
+        if not tab.ready.is_network_quiet():
+            return False
+        if tab.capture.positions:
+            return True
+        try:
+            state = tab.page.evaluate(EXPERIENCE_STATE_JS, [EXPERIENCE_ITEM_SELECTOR, EXPERIENCE_EMPTY_SELECTOR])
+        except Exception:
+            # Page is mid-navigation
+            return False
+        if state in ("items", "empty"):
+            return True
+        if state != "complete":
+            tab.empty_since = None
+            return False
+        # Loaded without positions or a placeholder: ready once it has stayed that way
+        now = time.monotonic()
+        if tab.empty_since is None:
+            tab.empty_since = now
+        return now - tab.empty_since >= EMPTY_SETTLE_SECONDS
+
+    def _read_experience(self, tab: _Tab, profile_url: str, debug: bool = False) -> list[WorkExperience]:
+        """Wait for the experience details page in `tab` to load and extract it."""
+        page, ready, capture = tab.page, tab.ready, tab.capture
         experiences = []
 
         try:
-            # Scroll down to load all experiences
-            self.page.evaluate("window.scrollTo(0, 500)")
-            self.page.wait_for_timeout(800)
-            self.page.evaluate("window.scrollTo(0, 1000)")
-            self.page.wait_for_timeout(800)
-            self.page.evaluate("window.scrollTo(0, 2000)")
-            self.page.wait_for_timeout(800)
+            # Prefer the positions JSON the page loaded: exact dates, no scrolling
+            ready.wait_for_network_quiet()
+            if not capture.positions and ready.wait_for_selector(EXPERIENCE_LOADED_SELECTOR):
+                capture.collect_embedded("positions")
+            # A partly captured paginated payload would truncate long careers; read the DOM instead
+            experiences = []
+            if positions_complete(capture.positions):
+                experiences = [WorkExperience(**p) for p in parse_positions(capture.positions)]
+            if experiences:
+                if debug:
+                    print(f"    Debug: {len(experiences)} positions read from Voyager API")
+                if self.archive:
+                    self.archive.store(profile_url, "positions", capture.positions)
+                return experiences
+
+            # DOM fallback: scroll until the list stops growing, then extract
+            experiences = self._extract_experience_via_js(page, debug=debug, profile_url=profile_url)
 
             # Save debug screenshot
             if debug:
-                self.page.screenshot(path="debug_profile.png")
-
-            # Use JavaScript to extract all experience data directly
-            experiences = self._extract_experience_via_js(debug=debug)
+                page.screenshot(path="debug_profile.png")
 
         except Exception as e:
             print(f"    Warning: Error extracting experience: {e}")
 
         return experiences
 
-    def _extract_experience_via_js(self, debug: bool = False) -> list[WorkExperience]:
+    def _extract_experience_via_js(
+        self,
+        page: Page | None = None,
+        debug: bool = False,
+        profile_url: str | None = None
+    ) -> list[WorkExperience]:
         """Extract experience using JavaScript to parse the page."""
+        page = page or self.page
         experiences = []
 
         try:
-            # Extract experience data using JavaScript
-            # Simpler approach: get the full text of each top-level experience item
-            exp_data = self.page.evaluate(r'''() => {
-                let results = [];
-
-                // Get all top-level experience items
-                let items = document.querySelectorAll('li.pvs-list__paged-list-item');
-
-                for (let item of items) {
-                    // Get the full inner text of this item
-                    let fullText = item.innerText.trim();
-
-                    // Skip if too short or too long
-                    if (fullText.length < 20 || fullText.length > 3000) continue;
-
-                    // Skip if it looks like a "Show more" button
-                    if (fullText.toLowerCase().includes('show all') ||
-                        fullText.toLowerCase().includes('see more')) continue;
-
-                    // Also get structured spans for better parsing
-                    let spans = item.querySelectorAll(':scope > div span[aria-hidden="true"]');
-                    let topSpans = [];
-                    spans.forEach(s => {
-                        let t = s.innerText.trim();
-                        if (t && t.length > 0 && t.length < 200) {
-                            topSpans.push(t);
-                        }
-                    });
-
-                    // Check if this has nested roles (multiple positions at same company)
-                    let nestedUl = item.querySelector(':scope > div > div > ul');
-                    let hasNested = nestedUl && nestedUl.querySelectorAll(':scope > li').length > 0;
-
-                    results.push({
-                        fullText: fullText,
-                        topSpans: topSpans,
-                        hasNested: hasNested
-                    });
-                }
-
-                return results;
-            }''')
+            # Scroll until the list stops growing and extract in one round trip
+            exp_data = page.evaluate(SCROLL_AND_EXTRACT_JS, SCROLL_OPTIONS)
+            if exp_data is None:
+                # Page was loaded before the init script was registered
+                page.evaluate(EXPERIENCE_INIT_JS)
+                exp_data = page.evaluate(SCROLL_AND_EXTRACT_JS, SCROLL_OPTIONS)
 
             # Debug: save raw extraction data to file
             if debug and exp_data:
@@ -548,33 +857,18 @@ class LinkedInScraper:
                     json.dump(exp_data, f, indent=2, ensure_ascii=False)
                 print(f"    Debug: Raw data saved to debug_raw_experience.json ({len(exp_data)} entries)")
 
-            # Parse each extracted entry
-            for item in exp_data:
-                full_text = item.get('fullText', '')
-                has_nested = item.get('hasNested', False)
-
-                if has_nested:
-                    # This item has multiple roles at one company - parse each
-                    parsed = self._parse_nested_experience(full_text)
-                    for exp in parsed:
-                        if exp and exp.title != "Unknown":
-                            is_dup = any(e.company == exp.company and e.title == exp.title for e in experiences)
-                            if not is_dup:
-                                experiences.append(exp)
-                else:
-                    # Single role - parse directly
-                    exp = self._parse_single_experience(full_text)
-                    if exp and exp.title != "Unknown":
-                        is_dup = any(e.company == exp.company and e.title == exp.title for e in experiences)
-                        if not is_dup:
-                            experiences.append(exp)
+            if self.archive and profile_url and exp_data:
+                self.archive.store(profile_url, "dom", exp_data)
+
+            experiences = parse_experience_items(exp_data)
 
         except Exception as e:
             print(f"    Debug: JS extraction error: {e}")
 
         return experiences
 
-    def _parse_single_experience(self, full_text: str) -> WorkExperience | None:
+    @staticmethod
+    def _parse_single_experience(full_text: str) -> WorkExperience | None:
         """Parse a single job entry from its full text."""
         if not full_text or len(full_text) < 10:
             return None
@@ -644,7 +938,8 @@ class LinkedInScraper:
             )
         return None
 
-    def _parse_nested_experience(self, full_text: str) -> list[WorkExperience]:
+    @staticmethod
+    def _parse_nested_experience(full_text: str) -> list[WorkExperience]:
         """Parse multiple roles at the same company from full text."""
         results = []
         if not full_text:
@@ -727,177 +1022,31 @@ class LinkedInScraper:
 
         return results
 
-    def _parse_structured_experience(self, texts: list[str], company_override: str = None) -> WorkExperience | None:
-        """Parse experience from a list of text spans (more reliable than raw text)."""
-        if not texts or len(texts) < 2:
-            return None
-
-        company = company_override  # Use override if provided (for nested roles)
-        title = None
-        start_date = None
-        end_date = None
-        duration = None
-
-        # Patterns
-        date_range_pattern = r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})\s*[-–]\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}|Present)'
-        duration_pattern = r'^\d+\s*(yr|yrs|mo|mos)'
-        single_date_pattern = r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}$'
-
-        # Skip patterns
-        skip_patterns = ['see more', 'show all', 'skills', 'endorsement',
-                        'recommendation', 'license', 'certification']
-
-        for text in texts:
-            text = text.strip()
-            if not text or len(text) < 2:
-                continue
-
-            text_lower = text.lower()
-
-            # Skip UI elements
-            if any(p in text_lower for p in skip_patterns):
-                return None
-
-            # Check for date range (e.g., "Jan 2020 - Present")
-            range_match = re.search(date_range_pattern, text, re.IGNORECASE)
-            if range_match:
-                start_date = range_match.group(1)
-                end_date = range_match.group(2)
-                continue
-
-            # Check for duration (e.g., "2 yrs 3 mos")
-            if re.match(duration_pattern, text, re.IGNORECASE):
-                duration = text
-                continue
-
-            # Check for single date
-            if re.match(single_date_pattern, text, re.IGNORECASE):
-                if not start_date:
-                    start_date = text
-                continue
-
-            # Skip location-like entries
-            if re.match(r'^(Remote|Hybrid|On-?site|United States|San Francisco|New York|London|Seattle|Chicago|Los Angeles|Austin|·)', text, re.IGNORECASE):
-                continue
-
-            # Skip employment type
-            if re.match(r'^(Full-time|Part-time|Contract|Internship|Self-employed|Freelance|Seasonal|Apprenticeship)$', text, re.IGNORECASE):
-                continue
-
-            # First real text is usually the title
-            if not title and len(text) > 2 and len(text) < 100:
-                title = text
-            # Second is usually company (if we don't already have one from override)
-            elif not company and len(text) > 1 and len(text) < 100:
-                # Don't set company if it looks like it's the same as title
-                if text != title:
-                    company = text
-
-        # Clean up: if company contains "· Full-time" etc, strip it
-        if company:
-            company = re.split(r'\s*·\s*', company)[0].strip()
-
-        if title or company:
-            return WorkExperience(
-                company=company or "Unknown",
-                title=title or "Unknown",
-                start_date=start_date,
-                end_date=end_date,
-                duration=duration
-            )
-
-        return None
-
-    def _parse_experience_text(self, text: str) -> WorkExperience | None:
-        """Parse experience from a text block."""
-        if not text or len(text) < 10:
-            return None
-
-        # Skip UI elements and non-job entries
-        text_lower = text.lower()
-        skip_patterns = ['see more', 'show all', 'show more', 'see all', 'skills',
-                        'endorsement', 'recommendation', 'license', 'certification',
-                        'education', 'course', 'volunteer', 'publication']
-        if any(pattern in text_lower for pattern in skip_patterns):
-            return None
-
-        # Split by common delimiters
-        lines = []
-        for line in text.replace(' | ', '\n').split('\n'):
-            line = line.strip()
-            if line and len(line) > 1:
-                lines.append(line)
-
-        if not lines:
-            return None
-
-        company = None
-        title = None
-        start_date = None
-        end_date = None
-        duration = None
-
-        # Patterns
-        date_pattern = r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}'
-        duration_pattern = r'\d+\s*(yr|yrs|mo|mos)'
-        date_range_pattern = r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})\s*[-–]\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}|Present)'
 
-        for line in lines:
-            # Check for date range
-            range_match = re.search(date_range_pattern, line, re.IGNORECASE)
-            if range_match:
-                start_date = range_match.group(1)
-                end_date = range_match.group(2)
-                continue
-
-            # Check for duration
-            if re.search(duration_pattern, line, re.IGNORECASE) and not title:
-                duration = line
-                continue
-
-            # Check if line is just a date
-            if re.match(r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}', line, re.IGNORECASE):
-                if not start_date:
-                    start_date = line
-                continue
-
-            # Skip location-like lines
-            if re.match(r'^(Remote|United States|San Francisco|New York|London|·)', line, re.IGNORECASE):
-                continue
-
-            # Skip "Full-time", "Part-time", etc
-            if re.match(r'^(Full-time|Part-time|Contract|Internship|Self-employed)$', line, re.IGNORECASE):
-                continue
-
-            # First substantial line is usually title
-            if not title and len(line) > 2 and len(line) < 100:
-                title = line
-            # Second is usually company (but not if it's the same as title)
-            elif not company and len(line) > 2 and len(line) < 100 and line != title:
-                company = line
-
-        # If company equals title, try to split by comma or clear company
-        if company and title and company == title:
-            # Try to extract company from title like "Title at Company" or "Title, Company"
-            if ' at ' in title:
-                parts = title.split(' at ', 1)
-                title = parts[0].strip()
-                company = parts[1].strip()
-            elif ', ' in title:
-                parts = title.split(', ', 1)
-                title = parts[0].strip()
-                company = parts[1].strip()
-            else:
-                company = None  # Clear duplicate
-
-        # Only return if we have meaningful data
-        if title or company:
-            return WorkExperience(
-                company=company or "Unknown",
-                title=title or "Unknown",
-                start_date=start_date,
-                end_date=end_date,
-                duration=duration
-            )
+def parse_experience_items(exp_data: list[dict]) -> list[WorkExperience]:
+    """
+    Turn window.__brainExperience.extract() output into WorkExperience entries.
 
-        return None
+    Shared by the sync and async scrapers; pure Python so it can also run
+    outside the browser.
+    """
+    experiences = []
+
+    for item in exp_data:
+        full_text = item.get('fullText', '')
+        has_nested = item.get('hasNested', False)
+
+        if has_nested:
+            # This item has multiple roles at one company - parse each
+            parsed = LinkedInScraper._parse_nested_experience(full_text)
+        else:
+            # Single role - parse directly
+            parsed = [LinkedInScraper._parse_single_experience(full_text)]
+
+        for exp in parsed:
+            if exp and exp.title != "Unknown":
+                is_dup = any(e.company == exp.company and e.title == exp.title for e in experiences)
+                if not is_dup:
+                    experiences.append(exp)
+
+    return experiences
@@ -0,0 +1,345 @@
+"""
+SQLite store of search runs and their results.
+
+Keeps every run (query and criteria), its search hits, the profiles and
+normalized experiences that were fetched, and the evaluations, so results
+survive restarts and old runs can be exported without re-scraping.
+
+The database runs in WAL mode and each thread gets its own connection, so
+the web UI can read while a background job writes. Writes are batched:
+each call commits its rows in one transaction.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from cache import ProfileCache, canonical_profile_url, get_brain_cache_dir, work_history_hash
+from dates import is_present, parse_month_range
+from evaluator import ProfileAnalysis, SearchCriteria, criteria_fingerprint
+from scraper import ProfileResult, WorkExperience
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query TEXT NOT NULL,
+    criteria TEXT NOT NULL,
+    criteria_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running',
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS search_hits (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    position INTEGER NOT NULL,
+    profile_url TEXT NOT NULL,
+    name TEXT,
+    headline TEXT,
+    PRIMARY KEY (run_id, profile_url)
+);
+CREATE INDEX IF NOT EXISTS search_hits_profile ON search_hits (profile_url);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    url TEXT PRIMARY KEY,
+    name TEXT,
+    headline TEXT,
+    content_hash TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS experiences (
+    profile_url TEXT NOT NULL REFERENCES profiles(url),
+    position INTEGER NOT NULL,
+    company TEXT,
+    title TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    duration TEXT,
+    start_month INTEGER,
+    end_month INTEGER,
+    is_current INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (profile_url, position)
+);
+CREATE INDEX IF NOT EXISTS experiences_company ON experiences (company);
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    profile_url TEXT NOT NULL REFERENCES profiles(url),
+    criteria_key TEXT NOT NULL,
+    matches INTEGER NOT NULL,
+    confidence TEXT,
+    target_company TEXT,
+    left_date TEXT,
+    reasoning TEXT,
+    evaluated_at REAL NOT NULL,
+    content_hash TEXT,              -- Work history the evaluation saw
+    PRIMARY KEY (run_id, profile_url)
+);
+CREATE INDEX IF NOT EXISTS evaluations_criteria ON evaluations (criteria_key, profile_url);
+"""
+
+# Columns added after a table was first created: (table, column, type)
+MIGRATIONS = [
+    ("evaluations", "content_hash", "TEXT"),
+]
+
+# Hash of an empty experience section (a profile page that didn't load)
+EMPTY_HISTORY_HASH = work_history_hash([])
+
+
+@dataclass
+class RunInfo:
+    """Summary of a stored run."""
+    id: int
+    query: str
+    criteria: SearchCriteria
+    status: str
+    created_at: float
+    finished_at: float | None
+    hits: int
+    evaluated: int
+    matches: int
+
+
+class RunStore:
+    """SQLite-backed store of runs, search hits, profiles, experiences and evaluations."""
+
+    def __init__(self, path: Path | None = None):
+        if path is None:
+            get_brain_cache_dir().mkdir(exist_ok=True)
+            path = get_brain_cache_dir() / "runs.sqlite3"
+        self.path = Path(path)
+        self._local = threading.local()
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+        for table, column, type_ in MIGRATIONS:
+            if column not in {row[1] for row in db.execute(f"PRAGMA table_info({table})")}:
+                db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {type_}")
+        db.commit()
+
+    def _db(self) -> sqlite3.Connection:
+        """This thread's connection; WAL lets readers and one writer work at once."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(str(self.path), timeout=30)
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            self._local.db = db
+        return db
+
+    def start_run(self, criteria: SearchCriteria) -> int:
+        """Create a run for a parsed query and return its id."""
+        db = self._db()
+        with db:
+            cursor = db.execute(
+                "INSERT INTO runs (query, criteria, criteria_key, created_at) VALUES (?, ?, ?, ?)",
+                (criteria.original_query, json.dumps(asdict(criteria)), criteria_fingerprint(criteria), time.time())
+            )
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int, status: str = "done"):
+        db = self._db()
+        with db:
+            db.execute("UPDATE runs SET status = ?, finished_at = ? WHERE id = ?", (status, time.time(), run_id))
+
+    def add_search_hits(self, run_id: int, profiles: list[ProfileResult]):
+        """Record a run's search results, in result order."""
+        now = time.time()
+        rows = [(run_id, i, canonical_profile_url(p.url), p.name, p.headline) for i, p in enumerate(profiles)]
+        db = self._db()
+        with db:
+            db.executemany(
+                """INSERT INTO profiles (url, name, headline, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET name = excluded.name,
+                       headline = COALESCE(excluded.headline, headline), last_seen = excluded.last_seen""",
+                [(url, name, headline, now, now) for _, _, url, name, headline in rows]
+            )
+            db.executemany("INSERT OR REPLACE INTO search_hits VALUES (?, ?, ?, ?, ?)", rows)
+
+    def add_analyses(self, run_id: int, analyses: list[ProfileAnalysis]):
+        """
+        Record fetched work histories and evaluations for a run in one transaction.
+
+        A profile's experiences are only rewritten when its work history changed.
+        """
+        if not analyses:
+            return
+        now = time.time()
+        db = self._db()
+        criteria_key = db.execute("SELECT criteria_key FROM runs WHERE id = ?", (run_id,)).fetchone()[0]
+
+        with db:
+            for a in analyses:
+                url = canonical_profile_url(a.url)
+                content_hash = work_history_hash(a.work_history)
+                row = db.execute("SELECT content_hash FROM profiles WHERE url = ?", (url,)).fetchone()
+                db.execute(
+                    """INSERT INTO profiles (url, name, content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(url) DO UPDATE SET name = excluded.name,
+                           content_hash = excluded.content_hash, last_seen = excluded.last_seen""",
+                    (url, a.name, content_hash, now, now)
+                )
+                if not row or row[0] != content_hash:
+                    db.execute("DELETE FROM experiences WHERE profile_url = ?", (url,))
+                    db.executemany(
+                        "INSERT INTO experiences VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [_experience_row(url, i, e) for i, e in enumerate(a.work_history)]
+                    )
+
+            db.executemany(
+                """INSERT OR REPLACE INTO evaluations (run_id, profile_url, criteria_key, matches, confidence,
+                       target_company, left_date, reasoning, evaluated_at, content_hash)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(run_id, canonical_profile_url(a.url), criteria_key, int(a.matches_criteria), a.confidence,
+                  a.target_company, a.left_date, a.reasoning, now, work_history_hash(a.work_history))
+                 for a in analyses]
+            )
+
+    def work_history(self, profile_url: str) -> list[WorkExperience]:
+        """Latest stored work history of a profile."""
+        rows = self._db().execute(
+            """SELECT company, title, start_date, end_date, duration FROM experiences
+               WHERE profile_url = ? ORDER BY position""",
+            (canonical_profile_url(profile_url),)
+        ).fetchall()
+        return [WorkExperience(*row) for row in rows]
+
+    def run_analyses(self, run_id: int) -> list[ProfileAnalysis]:
+        """A run's evaluations with their work histories, in search result order."""
+        rows = self._db().execute(
+            """SELECT e.profile_url, p.name, e.matches, e.reasoning, e.target_company, e.left_date, e.confidence
+               FROM evaluations e
+               JOIN profiles p ON p.url = e.profile_url
+               LEFT JOIN search_hits h ON h.run_id = e.run_id AND h.profile_url = e.profile_url
+               WHERE e.run_id = ?
+               ORDER BY COALESCE(h.position, 1e9), e.evaluated_at""",
+            (run_id,)
+        ).fetchall()
+        return [
+            ProfileAnalysis(
+                name=name,
+                url=url,
+                work_history=self.work_history(url),
+                matches_criteria=bool(matches),
+                reasoning=reasoning,
+                target_company=target_company,
+                left_date=left_date,
+                confidence=confidence
+            )
+            for url, name, matches, reasoning, target_company, left_date, confidence in rows
+        ]
+
+    def run_histories(self, run_id: int) -> list[tuple[ProfileResult, list[WorkExperience]]]:
+        """
+        A run's search hits that have a stored work history, in result order.
+
+        Includes profiles fetched by any run, so a hit analyzed earlier under
+        other criteria counts too. Profiles whose page showed no experience
+        are left out.
+        """
+        rows = self._db().execute(
+            """SELECT h.profile_url, COALESCE(p.name, h.name), COALESCE(p.headline, h.headline)
+               FROM search_hits h
+               JOIN profiles p ON p.url = h.profile_url
+               WHERE h.run_id = ? AND p.content_hash IS NOT NULL AND p.content_hash != ?
+               ORDER BY h.position""",
+            (run_id, EMPTY_HISTORY_HASH)
+        ).fetchall()
+        return [(ProfileResult(name, url, headline), self.work_history(url)) for url, name, headline in rows]
+
+    def get_run(self, run_id: int) -> RunInfo | None:
+        runs = self._runs("WHERE r.id = ?", (run_id,))
+        return runs[0] if runs else None
+
+    def list_runs(self, limit: int = 50) -> list[RunInfo]:
+        """Most recent runs first."""
+        return self._runs("ORDER BY r.created_at DESC LIMIT ?", (limit,))
+
+    def _runs(self, clause: str, params: tuple) -> list[RunInfo]:
+        rows = self._db().execute(
+            f"""SELECT r.id, r.query, r.criteria, r.status, r.created_at, r.finished_at,
+                   (SELECT COUNT(*) FROM search_hits h WHERE h.run_id = r.id),
+                   (SELECT COUNT(*) FROM evaluations e WHERE e.run_id = r.id),
+                   (SELECT COALESCE(SUM(e.matches), 0) FROM evaluations e WHERE e.run_id = r.id)
+                FROM runs r {clause}""",
+            params
+        ).fetchall()
+        return [
+            RunInfo(row[0], row[1], SearchCriteria(**json.loads(row[2])), *row[3:])
+            for row in rows
+        ]
+
+    def reusable_analyses(
+        self,
+        criteria: SearchCriteria,
+        profiles: list[ProfileResult],
+        cache: ProfileCache
+    ) -> list[ProfileAnalysis]:
+        """
+        Analyses of these profiles from any run under equivalent criteria.
+
+        Lets a new run skip profiles that were already fetched and evaluated
+        for the same criteria (see criteria_fingerprint). An evaluation is
+        only reused while it saw the latest stored work history and the
+        profile cache still holds that history within its TTL (see
+        ProfileCache.evaluation_valid); otherwise the profile is fetched
+        again. The latest such evaluation of each profile wins; results
+        keep the profiles' URLs and names, in the order given.
+        """
+        rows = self._db().execute(
+            """SELECT e.profile_url, e.content_hash, e.evaluated_at,
+                      e.matches, e.reasoning, e.target_company, e.left_date, e.confidence
+               FROM evaluations e
+               JOIN profiles p ON p.url = e.profile_url
+               WHERE e.criteria_key = ?
+                 AND e.content_hash = p.content_hash
+                 AND e.content_hash != ?
+                 -- Failed evaluations (see ProfileEvaluator.evaluate) are worth another try
+                 AND e.reasoning NOT LIKE 'API error:%'
+                 AND e.reasoning NOT LIKE 'Could not read a verdict%'
+               ORDER BY e.evaluated_at""",
+            (criteria_fingerprint(criteria), EMPTY_HISTORY_HASH)
+        ).fetchall()
+        latest = {row[0]: row[1:] for row in rows}
+
+        analyses = []
+        for profile in profiles:
+            url = canonical_profile_url(profile.url)
+            if url not in latest:
+                continue
+            content_hash, evaluated_at, matches, reasoning, target_company, left_date, confidence = latest[url]
+            if not cache.evaluation_valid(url, content_hash, evaluated_at):
+                continue
+            analyses.append(ProfileAnalysis(
+                name=profile.name,
+                url=profile.url,
+                work_history=self.work_history(url),
+                matches_criteria=bool(matches),
+                reasoning=reasoning,
+                target_company=target_company,
+                left_date=left_date,
+                confidence=confidence
+            ))
+        return analyses
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+def _experience_row(url: str, position: int, exp: WorkExperience) -> tuple:
+    """Experience row with month ordinals (start = first month, end = last possible month)."""
+    start = parse_month_range(exp.start_date)
+    end = parse_month_range(exp.end_date)
+    return (
+        url, position, exp.company, exp.title, exp.start_date, exp.end_date, exp.duration,
+        start[0] if start else None, end[1] if end else None, int(is_present(exp.end_date))
+    )
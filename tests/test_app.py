@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from evaluator import ProfileAnalysis, SearchCriteria
+from journal import RunJournal
+from scraper import ProfileResult, WorkExperience
+
+try:
+    import flask
+except ImportError:
+    flask = None
+
+
+CRITERIA = SearchCriteria(company="Uber", original_query="former Uber engineers")
+PROFILES = [ProfileResult("Ada", "https://www.linkedin.com/in/ada"),
+            ProfileResult("Bo", "https://www.linkedin.com/in/bo"),
+            ProfileResult("Cy", "https://www.linkedin.com/in/cy")]
+UBER = [WorkExperience("Uber", "Engineer", "Jan 2020", "Jun 2023")]
+STRIPE = [WorkExperience("Stripe", "Engineer", "Jan 2020", "Jun 2023")]
+
+app_module = None
+tmp = None
+
+
+def setUpModule():
+    global app_module, tmp
+    if flask is None:
+        return
+    # The app opens its stores and caches on import
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["BRAIN_CACHE_DIR"] = tmp.name
+    os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")
+    import app
+    app_module = app
+
+
+def tearDownModule():
+    if tmp is not None:
+        app_module.store.close()
+        tmp.cleanup()
+
+
+@unittest.skipUnless(flask, "Flask is not installed")
+class AppTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app_module.app.test_client()
+
+    def finish(self, job, timeout: float = 5.0):
+        """Wait for a job to finish; fails the test if it doesn't."""
+        while not job.finished:
+            self.assertTrue(job.wait(len(job.results), timeout), f"{job.kind} job did not finish")
+        return job
+
+
+class JobRoutesTest(AppTestCase):
+    def test_cancel(self):
+        started = threading.Event()
+
+        def work(job):
+            started.set()
+            while True:
+                job.wait(len(job.results), timeout=0.01)
+                job.check_cancelled()
+
+        job = app_module.jobs.submit("analyze", work)
+        self.assertTrue(started.wait(5))
+        self.assertTrue(self.client.post(f"/jobs/{job.id}/cancel").get_json()["success"])
+        self.finish(job)
+        self.assertEqual(self.client.get(f"/jobs/{job.id}").get_json()["job"]["status"], "cancelled")
+        self.assertEqual(self.client.post("/jobs/nope/cancel").status_code, 404)
+
+    def test_resume_finishes_an_interrupted_run(self):
+        # Ada was evaluated and Bo and Cy fetched before the run stopped; the
+        # rules settle both, so neither the browser nor Claude is needed
+        run_id = app_module.store.start_run(CRITERIA)
+        app_module.store.add_search_hits(run_id, PROFILES)
+        journal = RunJournal(run_id)
+        journal.start(CRITERIA, PROFILES)
+        journal.plan(PROFILES)
+        journal.fetched(PROFILES[0].url, UBER)
+        journal.evaluated(ProfileAnalysis("Ada", PROFILES[0].url, UBER, True, "Left Uber in Jun 2023."))
+        journal.fetched(PROFILES[1].url, STRIPE)
+        journal.fetched(PROFILES[2].url, UBER)
+        journal.close()
+
+        reply = self.client.post("/resume", json={"run_id": run_id}).get_json()
+        self.assertTrue(reply["success"], reply)
+        job = self.finish(app_module.jobs.get(reply["job_id"]))
+
+        self.assertEqual(job.status, "done", job.error)
+        self.assertEqual({r["name"]: r["matches"] for r in job.results}, {"Ada": True, "Bo": False, "Cy": True})
+        self.assertEqual(app_module.store.get_run(run_id).status, "done")
+        self.assertEqual(len(app_module.store.run_analyses(run_id)), 3)
+        self.assertNotEqual(RunJournal.latest_unfinished(), run_id)
+
+    def test_resume_and_reevaluate_wait_for_the_running_job(self):
+        release = threading.Event()
+        job = app_module.jobs.submit("analyze", lambda job: release.wait(5))
+        try:
+            self.assertEqual(self.client.post("/resume", json={}).status_code, 409)
+            self.assertEqual(self.client.post("/reevaluate", json={}).status_code, 409)
+        finally:
+            release.set()
+            self.finish(job)
+
+
+class AnalyzeStreamTest(AppTestCase):
+    def events(self, url: str) -> list[tuple[str, dict]]:
+        """Read a whole SSE response as (event, data) pairs."""
+        body = self.client.get(url).get_data(as_text=True)
+        events = []
+        for block in body.strip().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines())
+            events.append((fields["event"], json.loads(fields["data"])))
+        return events
+
+    def test_results_progress_and_done(self):
+        release = threading.Event()
+
+        def work(job):
+            job.progress(total=2, stage="analyzing")
+            job.add_result({"name": "Ada", "matches": True})
+            release.wait(5)  # Long enough for a heartbeat
+            job.add_result({"name": "Bo", "matches": False})
+            job.progress(stage="done")
+
+        job = app_module.jobs.submit("analyze", work)
+        threading.Timer(0.2, release.set).start()
+        with patch.object(app_module, "STREAM_HEARTBEAT_SECONDS", 0.05):
+            events = self.events(f"/analyze/stream?job_id={job.id}")
+
+        self.assertEqual(events[0], ("started", {"job_id": job.id}))
+        self.assertEqual([data["name"] for event, data in events if event == "result"], ["Ada", "Bo"])
+        progress = [data for event, data in events if event == "progress"]
+        self.assertTrue(progress)
+        self.assertEqual(progress[-1]["status"], "running")
+        self.assertEqual(set(progress[-1]), {"status", "stage", "done", "total", "eta"})
+        self.assertEqual(events[-1], ("done", {"status": "done", "error": None, "done": 2, "total": 2}))
+
+    def test_failed_job_ends_the_stream(self):
+        def work(job):
+            raise RuntimeError("Browser not launched")
+
+        job = app_module.jobs.submit("analyze", work)
+        events = self.events(f"/analyze/stream?job_id={job.id}")
+        self.assertEqual(events[-1][1]["status"], "failed")
+        self.assertEqual(events[-1][1]["error"], "Browser not launched")
+
+    def test_unknown_job(self):
+        self.assertEqual(self.events("/analyze/stream?job_id=nope"),
+                         [("done", {"status": "failed", "error": "Unknown job"})])
+
+    def test_new_analysis_needs_search_results(self):
+        with patch.dict(app_module.browser_state, search_results=None):
+            self.assertEqual(self.events("/analyze/stream?num_profiles=5"),
+                             [("done", {"status": "failed", "error": "No search results"})])
+
+
+if __name__ == "__main__":
+    unittest.main()
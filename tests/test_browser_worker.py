@@ -0,0 +1,59 @@
+import threading
+import unittest
+from browser_worker import BrowserWorker
+
+
+class FakeScraper:
+    """Stands in for LinkedInScraper.fetch_many on the browser thread."""
+
+    def __init__(self, fail_after: int | None = None):
+        self.fail_after = fail_after
+        self.produced = 0
+        self.threads = set()
+
+    def fetch_many(self, profile_urls, **kwargs):
+        for url in profile_urls:
+            self.threads.add(threading.current_thread().name)
+            if self.produced == self.fail_after:
+                raise RuntimeError("Target page, context or browser has been closed")
+            self.produced += 1
+            yield url, []
+
+
+class BrowserWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.worker = BrowserWorker()
+
+    def test_unlaunched_browser(self):
+        with self.assertRaisesRegex(RuntimeError, "Browser not launched"):
+            list(self.worker.fetch_many(["u1"]))
+
+    def test_fetch_many_runs_on_the_browser_thread(self):
+        self.worker.scraper = FakeScraper()
+        fetched = [url for url, _ in self.worker.fetch_many(["u1", "u2"])]
+        self.assertEqual(fetched, ["u1", "u2"])
+        self.assertEqual(self.worker.scraper.threads, {"brain-browser"})
+
+    def test_scraper_error_reaches_the_caller(self):
+        self.worker.scraper = FakeScraper(fail_after=1)
+        fetched = []
+        with self.assertRaisesRegex(RuntimeError, "browser has been closed"):
+            for url, _ in self.worker.fetch_many(["u1", "u2", "u3"]):
+                fetched.append(url)
+        self.assertEqual(fetched, ["u1"])  # Results before the error still arrive
+
+        # The browser thread is free for the next command
+        self.assertEqual(self.worker.call(lambda: "ok", timeout=5), "ok")
+
+    def test_caller_stopping_early_stops_the_browser(self):
+        self.worker.scraper = scraper = FakeScraper()
+        fetched = self.worker.fetch_many([f"u{i}" for i in range(100)])
+        next(fetched)
+        fetched.close()
+
+        self.assertEqual(self.worker.call(lambda: "ok", timeout=5), "ok")
+        self.assertLessEqual(scraper.produced, 3)  # One in hand, one waiting in the hand-off
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import itertools
+import json
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+from cache import EvaluationCache, ProfileCache, work_history_hash
+from evaluator import SearchCriteria, criteria_fingerprint
+from scraper import WorkExperience
+
+
+URL = "https://www.linkedin.com/in/ada"
+HISTORY = [WorkExperience("Uber", "Engineer", "Jan 2020", "Jun 2023")]
+REPARSED = [WorkExperience("Uber", "Senior Engineer", "Jan 2020", "Jun 2023")]
+
+
+class ProfileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ProfileCache(Path(self.tmp.name) / "profiles.sqlite3")
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_unchanged_visit_keeps_changed_at(self):
+        first = self.cache.put(URL, HISTORY)
+        second = self.cache.put(URL, HISTORY)
+        self.assertEqual(second.changed_at, first.changed_at)
+        self.assertTrue(self.cache.evaluation_valid(URL, work_history_hash(HISTORY), first.changed_at))
+
+    def test_reparse_does_not_backdate_a_change(self):
+        visited = time.time() - 3600
+        self.cache.put(URL, HISTORY, fetched_at=visited)
+        evaluated_at = time.time()
+
+        # archive.reparse stores the new parse with the original visit time
+        before = time.time()
+        entry = self.cache.put(URL, REPARSED, fetched_at=visited)
+        self.assertEqual(entry.fetched_at, visited)
+        self.assertGreaterEqual(entry.changed_at, before)
+        self.assertFalse(self.cache.evaluation_valid(URL, work_history_hash(REPARSED), evaluated_at))
+
+    def test_evaluation_valid_needs_a_fresh_visit(self):
+        self.cache.put(URL, HISTORY, fetched_at=time.time() - self.cache.ttl - 60)
+        self.assertFalse(self.cache.evaluation_valid(URL, work_history_hash(HISTORY), time.time()))
+
+
+
+class EvaluationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "evaluations.sqlite3"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def result(self, reasoning: str) -> dict:
+        return {"matches_criteria": True, "reasoning": reasoning, "target_company": "Uber",
+                "left_date": "Jun 2023", "confidence": "high"}
+
+    def test_round_trip_survives_reopening(self):
+        cache = EvaluationCache(self.path)
+        cache.put("criteria", "history", self.result("Left in 2023"))
+        cache.close()
+
+        cache = EvaluationCache(self.path)
+        self.assertEqual(cache.get("criteria", "history"), self.result("Left in 2023"))
+        self.assertIsNone(cache.get("criteria", "other history"))
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        size = len(json.dumps(self.result("a")))
+        cache = EvaluationCache(self.path, max_bytes=2 * size)
+        # Distinct timestamps so use order is unambiguous
+        with patch.object(time, "time", side_effect=itertools.count(1000)):
+            cache.put("k", "a", self.result("a"))
+            cache.put("k", "b", self.result("b"))
+            cache.get("k", "a")
+            cache.put("k", "c", self.result("c"))
+
+            self.assertIsNone(cache.get("k", "b"))
+            self.assertIsNotNone(cache.get("k", "a"))
+            self.assertIsNotNone(cache.get("k", "c"))
+        cache.close()
+
+
+class CriteriaFingerprintTest(unittest.TestCase):
+    def test_ignores_case_spacing_and_keyword_order(self):
+        a = SearchCriteria(company="Uber", role_keywords=["data", "engineer"], original_query="Uber  data engineers")
+        b = SearchCriteria(company=" uber", role_keywords=["Engineer", "data"], original_query="uber data Engineers")
+        self.assertEqual(criteria_fingerprint(a), criteria_fingerprint(b))
+
+    def test_relative_criteria_expire_monthly(self):
+        relative = SearchCriteria(company="Uber", max_months_ago=6, original_query="left Uber in the last 6 months")
+        absolute = SearchCriteria(company="Uber", left_after="January 2023", original_query="left Uber after 2022")
+        jan, feb = datetime(2026, 1, 31), datetime(2026, 2, 1)
+        self.assertNotEqual(criteria_fingerprint(relative, jan), criteria_fingerprint(relative, feb))
+        self.assertEqual(criteria_fingerprint(absolute, jan), criteria_fingerprint(absolute, feb))
+
+    def test_display_only_fields_are_ignored(self):
+        a = SearchCriteria(company="Uber", original_query="former Uber people", linkedin_search_query="Uber")
+        b = SearchCriteria(company="Uber", original_query="former Uber people", linkedin_search_query="ex Uber")
+        self.assertEqual(criteria_fingerprint(a), criteria_fingerprint(b))
+
+
+if __name__ == "__main__":
+    unittest.main()
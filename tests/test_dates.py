@@ -0,0 +1,89 @@
+import unittest
+from datetime import datetime
+import pandas as pd
+from dates import (
+    candidate_months, format_month, month_ordinal, parse_duration_months, parse_month_range, work_history_table
+)
+from evaluator import RULE_AMBIGUOUS, RULE_MATCH, CriteriaRules, SearchCriteria
+from scraper import WorkExperience
+
+
+TODAY = datetime(2026, 1, 15)
+HISTORIES = [
+    ("ada", [WorkExperience("Stripe", "Staff Engineer", "Jul 2023", "Present"),
+             WorkExperience("Uber", "Engineer", "Jan 2020", "Jun 2023")]),
+    ("bo", [WorkExperience("Uber", "Engineer", None, "2022", "2 yrs 3 mos")]),
+    ("cy", [WorkExperience("Uber", "Engineer", "Mar 2021", "Present")]),
+    ("di", [WorkExperience("Lyft", "Engineer", "Jan 2019", "Dec 2021")]),
+]
+
+
+class ParseTest(unittest.TestCase):
+    def test_month_range(self):
+        self.assertEqual(parse_month_range("Jan 2020"), (month_ordinal(2020, 1),) * 2)
+        self.assertEqual(parse_month_range("September 2021"), (month_ordinal(2021, 9),) * 2)
+        self.assertEqual(parse_month_range("2020"), (month_ordinal(2020, 1), month_ordinal(2020, 12)))
+        self.assertIsNone(parse_month_range("Present"))
+        self.assertIsNone(parse_month_range(None))
+        self.assertEqual(format_month(month_ordinal(2023, 6)), "Jun 2023")
+
+    def test_duration(self):
+        self.assertEqual(parse_duration_months("2 yrs 3 mos"), 27)
+        self.assertEqual(parse_duration_months("1 yr"), 12)
+        self.assertEqual(parse_duration_months("5 mos"), 5)
+        self.assertIsNone(parse_duration_months("Full-time"))
+
+
+class WorkHistoryTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = work_history_table(HISTORIES, today=TODAY)
+
+    def test_one_row_per_position(self):
+        self.assertEqual(list(self.table["candidate"]), ["ada", "ada", "bo", "cy", "di"])
+        self.assertEqual(str(self.table["start_month"].dtype), "Int64")
+
+    def test_present_ends_this_month(self):
+        row = self.table.iloc[0]
+        self.assertTrue(row["is_current"])
+        self.assertEqual((row["end_first"], row["end_last"]), (month_ordinal(2026, 1),) * 2)
+
+    def test_year_only_end_and_start_from_duration(self):
+        row = self.table.iloc[2]
+        self.assertEqual((row["end_first"], row["end_last"]), (month_ordinal(2022, 1), month_ordinal(2022, 12)))
+        self.assertEqual(row["start_month"], month_ordinal(2022, 12) - 27 + 1)
+
+
+class CandidateMonthsTest(unittest.TestCase):
+    def summarize(self, criteria: SearchCriteria) -> pd.DataFrame:
+        table = work_history_table(HISTORIES, today=TODAY)
+        return CriteriaRules(criteria, today=TODAY).summarize(table, today=TODAY)
+
+    def test_tenure_and_months_since_left(self):
+        summary = self.summarize(SearchCriteria(company="Uber"))
+        self.assertEqual(list(summary["worked_there"]), [True, True, True, False])
+        self.assertEqual(summary.loc["ada", "tenure_months"], 42)
+        self.assertEqual(summary.loc["ada", "months_since_left"], 31)
+        self.assertTrue(summary.loc["cy", "is_current"])
+        self.assertTrue(pd.isna(summary.loc["cy", "left_last"]))
+
+    def test_window_membership_matches_the_rules(self):
+        criteria = SearchCriteria(company="Uber", left_after="June 2022")
+        summary = self.summarize(criteria)
+        self.assertTrue(summary.loc["ada", "in_window"])
+        self.assertTrue(pd.isna(summary.loc["bo", "in_window"]))  # Some month of 2022
+        rules = CriteriaRules(criteria, today=TODAY)
+        self.assertEqual(rules.classify(HISTORIES[0][1]).verdict, RULE_MATCH)
+        self.assertEqual(rules.classify(HISTORIES[1][1]).verdict, RULE_AMBIGUOUS)
+
+        summary = self.summarize(SearchCriteria(company="Uber", left_after="January 2023"))
+        self.assertFalse(summary.loc["bo", "in_window"])
+        self.assertTrue(pd.isna(summary.loc["di", "in_window"]))   # Never there
+
+    def test_unbounded_window(self):
+        table = work_history_table(HISTORIES, today=TODAY)
+        summary = candidate_months(table, table["company"].eq("Uber"), today=TODAY)
+        self.assertTrue(summary.loc["bo", "in_window"])
+
+
+if __name__ == "__main__":
+    unittest.main()
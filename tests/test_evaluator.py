@@ -0,0 +1,300 @@
+import json
+import re
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+import anthropic
+import evaluator as evaluator_module
+from cache import EvaluationCache
+from evaluator import (
+    EVALUATION_RUBRIC, MIN_CACHEABLE_TOKENS, ProfileEvaluator, SearchCriteria, _estimate_tokens
+)
+from scraper import WorkExperience
+
+
+SINGLE_ANSWER = """TARGET_COMPANY: Uber
+WORKED_THERE: Yes
+LEFT_DATE: Jun 2024
+MATCHES_CRITERIA: Yes
+CONFIDENCE: medium
+REASONING: Worked on Uber Eats until June 2024."""
+
+
+def default_answer(body: dict) -> str:
+    """A batch answer covering every candidate id, or a single verdict naming the last end date."""
+    content = body["messages"][0]["content"]
+    ids = re.findall(r"^\[(c\d+)\]", content, re.MULTILINE)
+    if ids:
+        return json.dumps([{"id": cid, "matches_criteria": True, "confidence": "medium", "reasoning": cid}
+                           for cid in ids])
+    end = re.findall(r"- (\w+ \d{4})\)", content)
+    return SINGLE_ANSWER.replace("Worked on Uber Eats until June 2024.", f"Left in {end[-1] if end else '?'}.")
+
+
+class MessagesMock(BaseHTTPRequestHandler):
+    """Local stand-in for POST /v1/messages that records request bodies."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append(body)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            status = server.statuses.pop(0) if server.statuses else 200
+            text = server.answers.pop(0) if server.answers else default_answer(body)
+            first = len(server.requests) == 1
+        time.sleep(server.latency)
+        with server.lock:
+            server.in_flight -= 1
+
+        if status != 200:
+            self.reply(status, {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}})
+            return
+
+        # First request writes the prompt cache, later ones read it
+        cached = sum(_estimate_tokens(block["text"]) for block in body.get("system", []))
+        self.reply(200, {
+            "id": f"msg_{len(server.requests)}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": 50,
+                "output_tokens": 40,
+                "cache_creation_input_tokens": cached if first else 0,
+                "cache_read_input_tokens": 0 if first else cached
+            }
+        })
+
+    def reply(self, status: int, data: dict):
+        reply = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MessagesMockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MessagesMock)
+        self.server.requests = []
+        self.server.answers = []
+        self.server.statuses = []    # HTTP statuses for the next requests; 200 once empty
+        self.server.latency = 0.0
+        self.server.lock = threading.Lock()
+        self.server.in_flight = self.server.max_in_flight = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.evaluator = ProfileEvaluator(api_key="test-key")
+        self.evaluator.client = anthropic.Anthropic(
+            api_key="test-key",
+            base_url=f"http://127.0.0.1:{self.server.server_address[1]}",
+            max_retries=0
+        )
+        # Team criteria leave these candidates to Claude instead of the rule pre-filter
+        self.criteria = SearchCriteria(
+            company="Uber", team_or_product="Uber Eats", role_keywords=["engineer"],
+            original_query="Uber Eats engineers"
+        )
+        self.histories = [
+            [WorkExperience("Uber", "Software Engineer", "Jan 2021", "Jun 2024")],
+            [WorkExperience("Uber", "Senior Engineer", "Mar 2019", "Feb 2023")],
+        ]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def candidates(self, count: int) -> list[tuple[str, list[WorkExperience]]]:
+        return [(f"Candidate {n}", [WorkExperience("Uber", "Engineer", "Jan 2019", f"Jan {2010 + n}")])
+                for n in range(count)]
+
+
+class PromptCachingTest(MessagesMockTestCase):
+    def test_rubric_is_long_enough_to_cache(self):
+        self.assertGreaterEqual(_estimate_tokens(EVALUATION_RUBRIC), MIN_CACHEABLE_TOKENS)
+
+    def test_cache_control_marks_the_shared_prefix(self):
+        for work_history in self.histories:
+            self.evaluator.evaluate(self.criteria, work_history, "Candidate")
+
+        first, second = self.server.requests
+        system = first["system"]
+        self.assertEqual(len(system), 2)
+        self.assertEqual(system[0]["text"], EVALUATION_RUBRIC)
+        self.assertTrue(all(block["cache_control"] == {"type": "ephemeral"} for block in system))
+        self.assertIn("Uber Eats engineers", system[1]["text"])
+
+        # Only the candidate changes between requests, and it is outside the cached blocks
+        self.assertEqual(second["system"], system)
+        self.assertNotIn("cache_control", json.dumps(first["messages"]))
+        self.assertIn("Jun 2024", first["messages"][0]["content"])
+        self.assertIn("Feb 2023", second["messages"][0]["content"])
+
+    def test_batch_requests_share_the_rubric_block(self):
+        self.server.answers = [json.dumps([
+            {"id": f"c{n}", "matches_criteria": True, "confidence": "medium", "reasoning": "ok"}
+            for n in (1, 2)
+        ])]
+        results = self.evaluator.evaluate_batch(self.criteria, [("A", self.histories[0]), ("B", self.histories[1])])
+
+        self.assertEqual(len(self.server.requests), 1)
+        system = self.server.requests[0]["system"]
+        self.assertEqual(system[0]["text"], EVALUATION_RUBRIC)
+        self.assertEqual(system[0]["cache_control"], {"type": "ephemeral"})
+        self.assertTrue(all(r.matches_criteria for r in results))
+
+    def test_usage_reports_cache_reads_and_writes(self):
+        for work_history in self.histories:
+            self.evaluator.evaluate(self.criteria, work_history, "Candidate")
+
+        usage = self.evaluator.usage
+        prefix = sum(_estimate_tokens(b["text"]) for b in self.server.requests[0]["system"])
+        self.assertEqual(usage.requests, 2)
+        self.assertEqual(usage.input_tokens, 100)
+        self.assertEqual(usage.output_tokens, 80)
+        self.assertEqual(usage.cache_creation_input_tokens, prefix)
+        self.assertEqual(usage.cache_read_input_tokens, prefix)
+        self.assertIn(f"+{prefix} cache read", usage.summary())
+
+        usage.reset()
+        self.assertEqual((usage.requests, usage.cache_read_input_tokens), (0, 0))
+
+
+class EvaluateManyTest(MessagesMockTestCase):
+    def setUp(self):
+        super().setUp()
+        # Backoff without the waiting
+        patcher = patch.object(evaluator_module, "RETRY_BASE_DELAY", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transient_errors_are_retried(self):
+        self.server.statuses = [529, 503, 429]
+        result = self.evaluator.evaluate(self.criteria, self.histories[0], "Candidate")
+        self.assertTrue(result.matches_criteria, result.reasoning)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_persistent_errors_become_an_api_error_result(self):
+        self.server.statuses = [529] * 3
+        with patch.object(evaluator_module, "MAX_RETRIES", 2):
+            result = self.evaluator.evaluate(self.criteria, self.histories[0], "Candidate")
+        self.assertFalse(result.matches_criteria)
+        self.assertTrue(result.reasoning.startswith("API error:"))
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_client_errors_are_not_retried(self):
+        self.server.statuses = [400]
+        result = self.evaluator.evaluate(self.criteria, self.histories[0], "Candidate")
+        self.assertTrue(result.reasoning.startswith("API error:"))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_ordered_results_with_bounded_concurrency(self):
+        self.server.latency = 0.05
+        candidates = self.candidates(6)
+        results = list(self.evaluator.evaluate_many(self.criteria, candidates, concurrency=2, ordered=True))
+
+        self.assertEqual([i for i, _ in results], list(range(6)))
+        self.assertEqual([r.reasoning for _, r in results], [f"Left in Jan {2010 + n}." for n in range(6)])
+        self.assertEqual(self.server.max_in_flight, 2)
+
+    def test_stopping_early_leaves_the_rest_unsent(self):
+        self.server.latency = 0.05
+        results = self.evaluator.evaluate_many(self.criteria, self.candidates(10), concurrency=2)
+        next(results)
+        results.close()
+        self.assertLessEqual(len(self.server.requests), 3)  # The first result, and two in flight
+
+
+
+class BatchEvaluationTest(MessagesMockTestCase):
+    def batch_ids(self, request: dict) -> list[str]:
+        return re.findall(r"^\[(c\d+)\]", request["messages"][0]["content"], re.MULTILINE)
+
+    def test_incomplete_answer_is_split_and_retried(self):
+        # c3 is missing and c4 has no verdict; both are asked again
+        self.server.answers = [json.dumps([
+            {"id": "c1", "matches_criteria": True, "reasoning": "one"},
+            {"id": "c2", "matches_criteria": False, "reasoning": "two"},
+            {"id": "c4", "reasoning": "four"},
+        ])]
+        results = self.evaluator.evaluate_batch(self.criteria, self.candidates(4))
+
+        self.assertEqual([r.reasoning for r in results[:2]], ["one", "two"])
+        self.assertEqual([r.reasoning for r in results[2:]], ["Left in Jan 2012.", "Left in Jan 2013."])
+        self.assertEqual(len(self.server.requests), 3)  # The batch, then c3 and c4 on their own
+
+    def test_malformed_answer_retries_both_halves(self):
+        self.server.answers = ['[{"id": "c1", "matches_criteria": tr']  # Cut off
+        results = self.evaluator.evaluate_batch(self.criteria, self.candidates(4))
+
+        self.assertTrue(all(r.matches_criteria for r in results))
+        self.assertEqual([self.batch_ids(r) for r in self.server.requests],
+                         [["c1", "c2", "c3", "c4"], ["c1", "c2"], ["c1", "c2"]])
+
+    def test_rule_decided_candidates_skip_the_request(self):
+        candidates = self.candidates(2) + [("Still at Uber", [WorkExperience("Uber", "Engineer", "2019", "Present")])]
+        results = self.evaluator.evaluate_batch(self.criteria, candidates)
+        self.assertEqual(len(self.batch_ids(self.server.requests[0])), 2)
+        self.assertFalse(results[2].matches_criteria)
+
+    def test_batches_follow_the_token_budget(self):
+        candidates = self.candidates(10)
+        self.assertEqual([len(b) for b in self.evaluator._make_batches(list(range(10)), candidates)], [10])
+        with patch.object(evaluator_module, "MAX_BATCH_SIZE", 4):
+            self.assertEqual([len(b) for b in self.evaluator._make_batches(list(range(10)), candidates)], [4, 4, 2])
+        with patch.object(evaluator_module, "BATCH_TOKEN_BUDGET", 1):
+            self.assertEqual([len(b) for b in self.evaluator._make_batches(list(range(3)), candidates)], [1, 1, 1])
+
+    def test_evaluate_many_batched(self):
+        with patch.object(evaluator_module, "MAX_BATCH_SIZE", 3):
+            results = dict(self.evaluator.evaluate_many(self.criteria, self.candidates(7), batched=True))
+        self.assertEqual(sorted(results), list(range(7)))
+        self.assertEqual(len(self.server.requests), 3)  # 3 + 3 + 1, the last one a plain evaluate()
+
+
+
+class EvaluationCacheUseTest(MessagesMockTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.evaluator.cache = EvaluationCache(Path(self.tmp.name) / "evaluations.sqlite3")
+
+    def tearDown(self):
+        self.evaluator.cache.close()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_repeat_evaluation_is_answered_from_the_cache(self):
+        first = self.evaluator.evaluate(self.criteria, self.histories[0], "Candidate")
+        again = self.evaluator.evaluate(self.criteria, self.histories[0], "Same person, other run")
+        self.assertEqual(again, first)
+        self.assertEqual(len(self.server.requests), 1)
+
+        batch = self.evaluator.evaluate_batch(self.criteria, [("A", self.histories[0]), ("B", self.histories[1])])
+        self.assertEqual(batch[0], first)
+        self.assertEqual(len(self.server.requests), 2)  # Only B was asked
+
+    def test_unreadable_answers_are_not_cached(self):
+        self.server.answers = ["I'm not sure."]
+        result = self.evaluator.evaluate(self.criteria, self.histories[0], "Candidate")
+        self.assertEqual(result.reasoning, "Could not read a verdict from Claude's answer")
+
+        self.assertTrue(self.evaluator.evaluate(self.criteria, self.histories[0], "Candidate").matches_criteria)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
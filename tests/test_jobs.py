@@ -0,0 +1,87 @@
+import threading
+import unittest
+from jobs import JobManager
+
+
+class JobManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.jobs = JobManager()
+
+    def finish(self, job, timeout: float = 5.0):
+        """Wait for a job to finish; fails the test if it doesn't."""
+        while not job.finished:
+            self.assertTrue(job.wait(len(job.results), timeout), f"{job.kind} job did not finish")
+        return job
+
+    def test_results_and_progress(self):
+        def work(job):
+            job.progress(total=3, stage="working")
+            for n in range(3):
+                job.add_result({"n": n})
+            return "ok"
+
+        job = self.finish(self.jobs.submit("analyze", work))
+        self.assertEqual((job.status, job.result, job.done, job.total), ("done", "ok", 3, 3))
+        snapshot = job.to_dict(since=1)
+        self.assertEqual(snapshot["results"], [{"n": 1}, {"n": 2}])  # Only what is new
+        self.assertEqual(snapshot["next"], 3)
+
+    def test_cancel_between_profiles_keeps_partial_results(self):
+        first_done = threading.Event()
+        cancelled = threading.Event()
+
+        def work(job):
+            for n in range(100):
+                job.add_result({"n": n})
+                if n == 0:
+                    first_done.set()
+                    cancelled.wait(5)
+                job.check_cancelled()
+
+        job = self.jobs.submit("analyze", work)
+        self.assertTrue(first_done.wait(5))
+        self.assertIs(self.jobs.active(), job)
+        job.cancel()
+        cancelled.set()
+
+        self.finish(job)
+        self.assertEqual(job.status, "cancelled")
+        self.assertEqual(job.results, [{"n": 0}])
+        self.assertIsNone(self.jobs.active())
+
+    def test_job_cancelled_while_queued_never_runs(self):
+        release = threading.Event()
+        ran = []
+        blocker = self.jobs.submit("search", lambda job: release.wait(5))
+        queued = self.jobs.submit("analyze", lambda job: ran.append(job.id))
+        queued.cancel()
+        release.set()
+
+        self.finish(blocker)
+        self.finish(queued)
+        self.assertEqual(queued.status, "cancelled")
+        self.assertEqual(ran, [])
+
+    def test_failure_is_reported(self):
+        def work(job):
+            raise RuntimeError("Browser not launched")
+
+        job = self.finish(self.jobs.submit("analyze", work))
+        self.assertEqual((job.status, job.error), ("failed", "Browser not launched"))
+
+    def test_wait_wakes_on_new_results(self):
+        release = threading.Event()
+
+        def work(job):
+            job.add_result({"n": 0})
+            release.wait(5)
+
+        job = self.jobs.submit("analyze", work)
+        self.assertTrue(job.wait(0, timeout=5))
+        self.assertFalse(job.wait(1, timeout=0.05))  # Nothing new yet
+        release.set()
+        self.finish(job)
+
+
+if __name__ == "__main__":
+    unittest.main()
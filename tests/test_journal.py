@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+from pathlib import Path
+from evaluator import ProfileAnalysis, SearchCriteria
+from journal import RunJournal
+from scraper import ProfileResult, WorkExperience
+
+
+CRITERIA = SearchCriteria(company="Uber", original_query="former Uber engineers")
+PROFILES = [ProfileResult("Ada", "https://www.linkedin.com/in/ada"),
+            ProfileResult("Bo", "https://www.linkedin.com/in/bo")]
+HISTORY = [WorkExperience("Uber", "Engineer", "Jan 2020", "Jun 2023")]
+
+
+class RunJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_run(self) -> RunJournal:
+        journal = RunJournal(1, self.root)
+        journal.start(CRITERIA, PROFILES)
+        journal.plan(PROFILES)
+        journal.fetched(PROFILES[0].url, HISTORY)
+        journal.evaluated(ProfileAnalysis("Ada", PROFILES[0].url, HISTORY, True, "Left in 2023"))
+        journal.close()
+        return journal
+
+    def test_replay(self):
+        self.write_run()
+        state = RunJournal(1, self.root).load()
+        self.assertEqual(state.criteria, CRITERIA)
+        self.assertEqual(state.fetched[PROFILES[0].url], HISTORY)
+        self.assertEqual(state.evaluated[PROFILES[0].url].work_history, HISTORY)
+        self.assertEqual([p.url for p in state.pending], [PROFILES[1].url])
+        self.assertEqual(RunJournal.latest_unfinished(self.root), 1)
+
+    def test_torn_line_is_skipped_and_repaired(self):
+        journal = self.write_run()
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"stage": "fetched", "url": "https://www.linkedin.com/in/bo", "work_hi')  # Crash mid-write
+
+        state = RunJournal(1, self.root).load()
+        self.assertNotIn(PROFILES[1].url, state.fetched)
+
+        # Resuming appends after the fragment is cut, so the new record survives replay
+        resumed = RunJournal(1, self.root)
+        resumed.fetched(PROFILES[1].url, HISTORY)
+        resumed.finish()
+        resumed.close()
+        state = RunJournal(1, self.root).load()
+        self.assertEqual(state.fetched[PROFILES[1].url], HISTORY)
+        self.assertTrue(state.finished)
+        self.assertIsNone(RunJournal.latest_unfinished(self.root))
+
+    def test_latest_unfinished_from_last_record(self):
+        self.write_run()
+        searched_only = RunJournal(2, self.root)
+        searched_only.start(CRITERIA, PROFILES)  # Never analyzed, nothing to resume
+        searched_only.close()
+        self.assertEqual(RunJournal.latest_unfinished(self.root), 1)
+
+        cancelled = RunJournal(1, self.root)
+        cancelled.finish("cancelled")
+        cancelled.close()
+        self.assertEqual(RunJournal.latest_unfinished(self.root), 1)
+
+        done = RunJournal(1, self.root)
+        done.finish()
+        done.close()
+        self.assertIsNone(RunJournal.latest_unfinished(self.root))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from evaluator import parse_query_locally
+
+
+class ParseQueryLocallyTest(unittest.TestCase):
+    def test_former_and_ex_prefixes(self):
+        for query in ("former Stripe engineers", "ex-Stripe engineers", "ex- Stripe engineers", "ex Stripe engineers"):
+            with self.subTest(query=query):
+                criteria = parse_query_locally(query)
+                self.assertEqual(criteria.company, "Stripe")
+                self.assertEqual(criteria.role_keywords, ["engineer"])
+
+    def test_product_resolves_to_parent_company(self):
+        criteria = parse_query_locally("former Instagram designers")
+        self.assertEqual((criteria.company, criteria.team_or_product), ("Meta", "Instagram"))
+
+    def test_company_starting_with_ex_keeps_its_name(self):
+        for query, company in (("former Exxon engineers", "Exxon"), ("ex-Expedia engineers", "Expedia")):
+            with self.subTest(query=query):
+                self.assertEqual(parse_query_locally(query).company, company)
+        # No prefix: not a shape we parse locally, so Claude gets it
+        for query in ("Exxon engineers", "Expedia software engineers", "Experian data scientists"):
+            with self.subTest(query=query):
+                self.assertIsNone(parse_query_locally(query))
+
+    def test_between_years(self):
+        criteria = parse_query_locally("Uber engineers who left between 2023-2025")
+        self.assertEqual((criteria.left_after, criteria.left_before), ("January 2023", "December 2025"))
+
+    def test_reversed_between_years(self):
+        criteria = parse_query_locally("Uber engineers who left between 2025 and 2023")
+        self.assertEqual((criteria.left_after, criteria.left_before), ("January 2023", "December 2025"))
+
+    def test_relative_windows(self):
+        self.assertEqual(parse_query_locally("people who left Stripe in the last 6 months").max_months_ago, 6)
+        self.assertEqual(parse_query_locally("people who left Stripe more than 3 months ago").min_months_ago, 3)
+
+    def test_unrecognized_when_goes_to_claude(self):
+        self.assertIsNone(parse_query_locally("Uber engineers who left around the IPO"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from datetime import datetime
+from evaluator import RULE_AMBIGUOUS, RULE_MATCH, RULE_REJECT, CriteriaRules, SearchCriteria
+from scraper import WorkExperience
+
+
+TODAY = datetime(2026, 1, 15)
+
+
+def verdict(criteria: SearchCriteria, *history: WorkExperience) -> str:
+    return CriteriaRules(criteria, today=TODAY).classify(list(history)).verdict
+
+
+class RoleKeywordsTest(unittest.TestCase):
+    def stint(self, title: str) -> WorkExperience:
+        return WorkExperience("Uber", title, "Jan 2020", "Jun 2024")
+
+    def test_whole_title_match(self):
+        criteria = SearchCriteria(company="Uber", role_keywords=["data", "engineer"])
+        self.assertEqual(verdict(criteria, self.stint("Senior Data Engineer")), RULE_MATCH)
+        self.assertEqual(verdict(criteria, self.stint("Senior Software Engineer")), RULE_AMBIGUOUS)
+
+    def test_keywords_match_whole_words(self):
+        pm = SearchCriteria(company="Uber", role_keywords=["pm"])
+        self.assertEqual(verdict(pm, self.stint("Software Development Engineer")), RULE_AMBIGUOUS)
+        self.assertEqual(verdict(pm, self.stint("Senior PM, Rides")), RULE_MATCH)
+
+    def test_leadership_title_needs_judgment(self):
+        engineer = SearchCriteria(company="Uber", role_keywords=["engineer"])
+        self.assertEqual(verdict(engineer, self.stint("Engineering Manager")), RULE_AMBIGUOUS)
+        self.assertEqual(verdict(engineer, self.stint("Engineer Lead")), RULE_AMBIGUOUS)
+        manager = SearchCriteria(company="Uber", role_keywords=["engineering", "manager"])
+        self.assertEqual(verdict(manager, self.stint("Engineering Manager")), RULE_MATCH)
+
+
+class CompanyTest(unittest.TestCase):
+    def test_product_employer_counts_as_parent(self):
+        criteria = SearchCriteria(company="Meta")
+        self.assertEqual(verdict(criteria, WorkExperience("Instagram", "Designer", "Jan 2020", "Jun 2022")), RULE_MATCH)
+        self.assertEqual(verdict(criteria, WorkExperience("Stripe", "Designer", "Jan 2020", "Jun 2022")), RULE_REJECT)
+
+    def test_team_criteria_never_reject_unknown_employer(self):
+        criteria = SearchCriteria(company="Google", team_or_product="Google Maps")
+        self.assertEqual(verdict(criteria, WorkExperience("Waze", "Engineer", "Jan 2020", "Jun 2022")), RULE_AMBIGUOUS)
+
+    def test_current_employee(self):
+        history = WorkExperience("Uber", "Engineer", "Jan 2020", "Present")
+        self.assertEqual(verdict(SearchCriteria(company="Uber"), history), RULE_REJECT)
+        self.assertEqual(verdict(SearchCriteria(company="Uber", still_employed_ok=True), history), RULE_MATCH)
+
+    def test_unparsed_query_is_left_to_claude(self):
+        query = "uber people who moved to startups"
+        criteria = SearchCriteria(company=query, original_query=query, parsed=False)
+        self.assertEqual(verdict(criteria, WorkExperience("Stripe", "Engineer", "Jan 2020", "Jun 2022")),
+                         RULE_AMBIGUOUS)
+
+    def test_reasoning_mentions_window_only_when_there_is_one(self):
+        history = [WorkExperience("Uber", "Engineer", "Jan 2020", "Jun 2022")]
+        plain = CriteriaRules(SearchCriteria(company="Uber"), today=TODAY).classify(history)
+        self.assertEqual(plain.result.reasoning, "Left Uber in Jun 2022.")
+        windowed = CriteriaRules(SearchCriteria(company="Uber", left_after="January 2022"), today=TODAY)
+        self.assertIn("within the requested window", windowed.classify(history).result.reasoning)
+
+
+class WindowBoundsTest(unittest.TestCase):
+    """left_after / left_before are inclusive, as the evaluation prompt says."""
+
+    def left(self, end: str) -> WorkExperience:
+        return WorkExperience("Uber", "Engineer", "Jan 2018", end)
+
+    def test_left_after_includes_its_month(self):
+        criteria = SearchCriteria(company="Uber", left_after="January 2023")
+        self.assertEqual(verdict(criteria, self.left("Jan 2023")), RULE_MATCH)
+        self.assertEqual(verdict(criteria, self.left("Dec 2022")), RULE_REJECT)
+
+    def test_left_before_includes_its_month(self):
+        criteria = SearchCriteria(company="Uber", left_before="December 2025")
+        self.assertEqual(verdict(criteria, self.left("Dec 2025")), RULE_MATCH)
+        self.assertEqual(verdict(criteria, self.left("Jan 2026")), RULE_REJECT)
+
+    def test_year_only_end_date(self):
+        self.assertEqual(verdict(SearchCriteria(company="Uber", left_after="January 2023"), self.left("2023")),
+                         RULE_MATCH)
+        self.assertEqual(verdict(SearchCriteria(company="Uber", left_after="June 2023"), self.left("2023")),
+                         RULE_AMBIGUOUS)
+        self.assertEqual(verdict(SearchCriteria(company="Uber", left_after="January 2024"), self.left("2023")),
+                         RULE_REJECT)
+
+    def test_relative_bound_month_is_ambiguous(self):
+        criteria = SearchCriteria(company="Uber", max_months_ago=6)  # Today is Jan 2026
+        self.assertEqual(verdict(criteria, self.left("Jul 2025")), RULE_AMBIGUOUS)
+        self.assertEqual(verdict(criteria, self.left("Sep 2025")), RULE_MATCH)
+        self.assertEqual(verdict(criteria, self.left("Jun 2025")), RULE_REJECT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import scraper as scraper_module
+from scraper import LinkedInScraper, WorkExperience
+
+
+def fake_scraper(concurrency: int = 3) -> LinkedInScraper:
+    """Scraper over mock pages whose experience section is ready immediately."""
+    scraper = LinkedInScraper(MagicMock(), concurrency=concurrency)
+    scraper._is_experience_ready = lambda tab: True
+    scraper._read_experience = lambda tab, url, debug=False: [WorkExperience(company=url, title="Engineer")]
+    return scraper
+
+
+class FetchManyTest(unittest.TestCase):
+    def test_yields_every_profile_once(self):
+        scraper = fake_scraper()
+        urls = [f"https://www.linkedin.com/in/u{i}" for i in range(5)]
+        fetched = [url for url, _ in scraper.fetch_many(urls, delay=0)]
+        self.assertCountEqual(fetched, urls)
+
+    def test_close_then_refetch(self):
+        scraper = fake_scraper()
+        first = scraper.fetch_many(["u1", "u2", "u3"], delay=0)
+        next(first)
+        first.close()  # Other tabs were still loading u2 and u3
+
+        fetched = [url for url, _ in scraper.fetch_many(["new1"], delay=0)]
+        self.assertEqual(fetched, ["new1"])
+        self.assertTrue(all(tab.url is None for tab in scraper._tabs))
+
+    def test_navigation_failure_yields_empty_history(self):
+        scraper = fake_scraper(concurrency=1)
+        scraper.cache = MagicMock(**{"get.return_value": None})
+
+        def goto(url, **kwargs):
+            if "/in/bad" in url:
+                raise TimeoutError("net::ERR_TIMED_OUT")
+
+        for page in (scraper.browser.page, scraper.browser.new_page.return_value):
+            page.goto.side_effect = goto
+        urls = ["https://www.linkedin.com/in/good1", "https://www.linkedin.com/in/bad",
+                "https://www.linkedin.com/in/good2"]
+
+        fetched = dict(scraper.fetch_many(urls, delay=0))
+        self.assertEqual(fetched["https://www.linkedin.com/in/bad"], [])
+        self.assertEqual(len(fetched["https://www.linkedin.com/in/good2"]), 1)  # The tab moved on
+        # Failed visits are not cached
+        self.assertCountEqual([c.args[0] for c in scraper.cache.put.call_args_list], [urls[0], urls[2]])
+
+
+class ExperienceReadyTest(unittest.TestCase):
+    def tab(self, state: str):
+        scraper = LinkedInScraper(MagicMock())
+        tab = scraper._tabs[0]
+        tab.ready = MagicMock(**{"is_network_quiet.return_value": True})
+        tab.capture = MagicMock(positions=[])
+        tab.page = MagicMock(**{"evaluate.return_value": state})
+        return scraper, tab
+
+    def test_empty_state_placeholder_is_ready(self):
+        scraper, tab = self.tab("empty")
+        self.assertTrue(scraper._is_experience_ready(tab))
+
+    def test_loaded_page_without_positions_settles(self):
+        scraper, tab = self.tab("complete")
+        self.assertFalse(scraper._is_experience_ready(tab))
+        with patch.object(scraper_module, "EMPTY_SETTLE_SECONDS", 0):
+            self.assertTrue(scraper._is_experience_ready(tab))
+
+    def test_loading_page_is_not_ready(self):
+        scraper, tab = self.tab("interactive")
+        with patch.object(scraper_module, "EMPTY_SETTLE_SECONDS", 0):
+            self.assertFalse(scraper._is_experience_ready(tab))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from cache import ProfileCache
+from evaluator import ProfileAnalysis, SearchCriteria
+from store import RunStore
+from scraper import ProfileResult, WorkExperience
+
+
+CRITERIA = SearchCriteria(company="Uber", original_query="former Uber engineers")
+PROFILES = [ProfileResult("Ada", "https://www.linkedin.com/in/Ada/"),
+            ProfileResult("Bo", "https://www.linkedin.com/in/bo"),
+            ProfileResult("Cy", "https://www.linkedin.com/in/cy")]
+OLD_HISTORY = [WorkExperience("Uber", "Engineer", "Jan 2020", "Jun 2023", "3 yrs 6 mos")]
+NEW_HISTORY = [WorkExperience("Stripe", "Staff Engineer", "Jul 2023", "Present"),
+               WorkExperience("Uber", "Engineer", "Jan 2020", "Jun 2023", "3 yrs 6 mos")]
+
+
+def analysis(profile: ProfileResult, work_history: list[WorkExperience], matches: bool = True) -> ProfileAnalysis:
+    return ProfileAnalysis(profile.name, profile.url, work_history, matches, "Left Uber in Jun 2023",
+                           target_company="Uber", left_date="Jun 2023", confidence="high")
+
+
+class RunStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = RunStore(Path(self.tmp.name) / "runs.sqlite3")
+        self.profiles = ProfileCache(Path(self.tmp.name) / "profiles.sqlite3")
+
+    def tearDown(self):
+        self.store.close()
+        self.profiles.close()
+        self.tmp.cleanup()
+
+    def new_run(self, criteria: SearchCriteria = CRITERIA) -> int:
+        run_id = self.store.start_run(criteria)
+        self.store.add_search_hits(run_id, PROFILES)
+        return run_id
+
+    def test_analyses_round_trip(self):
+        run_id = self.new_run()
+        self.store.add_analyses(run_id, [analysis(PROFILES[1], OLD_HISTORY, matches=False),
+                                         analysis(PROFILES[0], OLD_HISTORY)])
+        self.store.finish_run(run_id)
+
+        analyses = self.store.run_analyses(run_id)
+        self.assertEqual([a.name for a in analyses], ["Ada", "Bo"])  # Search result order
+        self.assertEqual(analyses[0].url, "https://www.linkedin.com/in/ada")
+        self.assertEqual(analyses[0].work_history, OLD_HISTORY)
+
+        run = self.store.get_run(run_id)
+        self.assertEqual((run.status, run.hits, run.evaluated, run.matches), ("done", 3, 2, 1))
+        self.assertEqual(run.criteria, CRITERIA)
+
+    def test_changed_work_history_replaces_experiences(self):
+        first = self.new_run()
+        self.store.add_analyses(first, [analysis(PROFILES[0], OLD_HISTORY)])
+        second = self.new_run()
+        self.store.add_analyses(second, [analysis(PROFILES[0], NEW_HISTORY)])
+
+        self.assertEqual(self.store.work_history(PROFILES[0].url), NEW_HISTORY)
+        rows = self.store._db().execute(
+            "SELECT position, company, start_month, end_month, is_current FROM experiences ORDER BY position"
+        ).fetchall()
+        self.assertEqual(rows, [(0, "Stripe", 2023 * 12 + 6, None, 1), (1, "Uber", 2020 * 12, 2023 * 12 + 5, 0)])
+
+    def test_run_histories(self):
+        run_id = self.new_run()
+        self.store.add_analyses(run_id, [analysis(PROFILES[2], OLD_HISTORY), analysis(PROFILES[0], NEW_HISTORY)])
+
+        histories = self.store.run_histories(run_id)
+        self.assertEqual([p.name for p, _ in histories], ["Ada", "Cy"])  # Bo was never fetched
+        self.assertEqual(histories[0][1], NEW_HISTORY)
+
+    def test_run_histories_skip_empty_pages(self):
+        run_id = self.new_run()
+        self.store.add_analyses(run_id, [analysis(PROFILES[0], OLD_HISTORY), analysis(PROFILES[1], [])])
+        self.assertEqual([p.name for p, _ in self.store.run_histories(run_id)], ["Ada"])
+
+    def test_reusable_analyses_need_equivalent_criteria(self):
+        run_id = self.new_run()
+        failed = ProfileAnalysis("Bo", PROFILES[1].url, OLD_HISTORY, False, "API error: overloaded", confidence="low")
+        self.profiles.put(PROFILES[0].url, OLD_HISTORY)
+        self.profiles.put(PROFILES[1].url, OLD_HISTORY)
+        self.store.add_analyses(run_id, [analysis(PROFILES[0], OLD_HISTORY), failed])
+
+        reused = self.store.reusable_analyses(CRITERIA, PROFILES, self.profiles)
+        self.assertEqual([a.url for a in reused], [PROFILES[0].url])  # Keeps the search hit's URL
+        self.assertEqual(reused[0].work_history, OLD_HISTORY)
+
+        other = SearchCriteria(company="Uber", left_after="January 2024", original_query="left Uber after 2023")
+        self.assertEqual(self.store.reusable_analyses(other, PROFILES, self.profiles), [])
+
+    def test_empty_work_history_is_not_reused(self):
+        run_id = self.new_run()
+        empty = ProfileAnalysis("Ada", PROFILES[0].url, [], False, "No work history available to evaluate.")
+        self.store.add_analyses(run_id, [empty])
+        self.assertEqual(self.store.reusable_analyses(CRITERIA, PROFILES, self.profiles), [])
+
+    def test_evaluation_of_an_older_work_history_is_not_reused(self):
+        first = self.new_run()
+        self.store.add_analyses(first, [analysis(PROFILES[0], OLD_HISTORY)])
+        # A later run under other criteria fetched the updated profile
+        second = self.new_run(SearchCriteria(company="Stripe", original_query="Stripe engineers"))
+        self.profiles.put(PROFILES[0].url, NEW_HISTORY)
+        self.store.add_analyses(second, [analysis(PROFILES[0], NEW_HISTORY)])
+
+        self.assertEqual(self.store.reusable_analyses(CRITERIA, PROFILES, self.profiles), [])
+
+    def test_reuse_honours_the_profile_cache_ttl(self):
+        run_id = self.new_run()
+        self.profiles.put(PROFILES[0].url, OLD_HISTORY, fetched_at=time.time() - self.profiles.ttl - 60)
+        self.store.add_analyses(run_id, [analysis(PROFILES[0], OLD_HISTORY)])
+        self.assertEqual(self.store.reusable_analyses(CRITERIA, PROFILES, self.profiles), [])
+
+        self.profiles.put(PROFILES[0].url, OLD_HISTORY)  # Visited again, unchanged
+        self.assertEqual(len(self.store.reusable_analyses(CRITERIA, PROFILES, self.profiles)), 1)
+
+    def test_databases_without_evaluation_hashes_are_migrated(self):
+        self.store.close()
+        path = Path(self.tmp.name) / "old.sqlite3"
+        db = sqlite3.connect(str(path))
+        db.execute("CREATE TABLE evaluations (run_id INTEGER, profile_url TEXT, criteria_key TEXT, matches INTEGER, "
+                   "confidence TEXT, target_company TEXT, left_date TEXT, reasoning TEXT, evaluated_at REAL)")
+        db.close()
+
+        self.store = RunStore(path)
+        columns = [row[1] for row in self.store._db().execute("PRAGMA table_info(evaluations)")]
+        self.assertEqual(columns[-1], "content_hash")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from voyager import parse_positions, positions_complete
+
+
+def position(title: str, year: int) -> dict:
+    return {"title": title, "companyName": "Uber",
+            "dateRange": {"start": {"year": year, "month": 1}, "end": {"year": year + 1, "month": 1}}}
+
+
+class PositionsPagingTest(unittest.TestCase):
+    def test_single_full_page(self):
+        payload = {"elements": [position("Engineer", 2018), position("Senior Engineer", 2020)],
+                   "paging": {"start": 0, "count": 10, "total": 2}}
+        self.assertTrue(positions_complete([payload]))
+        self.assertEqual(len(parse_positions([payload])), 2)
+
+    def test_partial_page_is_incomplete(self):
+        first = {"elements": [position(f"Role {i}", 2000 + i) for i in range(10)],
+                 "paging": {"start": 0, "count": 10, "total": 14}}
+        self.assertFalse(positions_complete([first]))
+
+        rest = {"elements": [position(f"Role {i}", 2000 + i) for i in range(10, 14)],
+                "paging": {"start": 10, "count": 10, "total": 14}}
+        self.assertTrue(positions_complete([first, rest]))
+
+    def test_normalized_element_urns(self):
+        payload = {"data": {"*elements": ["urn:li:a", "urn:li:b"], "paging": {"start": 0, "count": 2, "total": 5}}}
+        self.assertFalse(positions_complete([payload]))
+
+    def test_duplicate_page_counts_once(self):
+        first = {"elements": [position(f"Role {i}", 2000 + i) for i in range(10)],
+                 "paging": {"start": 0, "count": 10, "total": 14}}
+        self.assertFalse(positions_complete([first, first]))
+
+    def test_gap_between_pages_is_incomplete(self):
+        pages = [{"elements": [position(f"Role {i}", 2000 + i) for i in range(start, start + 5)],
+                  "paging": {"start": start, "count": 5, "total": 15}} for start in (0, 10)]
+        self.assertFalse(positions_complete(pages))
+
+    def test_collections_with_equal_totals_are_separate(self):
+        def page(urn: str, start: int, count: int) -> dict:
+            return {"entityUrn": urn, "elements": [position(f"Role {i}", 2000 + i) for i in range(count)],
+                    "paging": {"start": start, "count": 10, "total": 12}}
+
+        # Two position groups of 12, each with only its first page captured
+        self.assertFalse(positions_complete([page("urn:li:a", 0, 10), page("urn:li:b", 0, 10)]))
+        self.assertTrue(positions_complete([page("urn:li:a", 0, 10), page("urn:li:b", 0, 10),
+                                            page("urn:li:a", 10, 2), page("urn:li:b", 10, 2)]))
+
+    def test_payload_without_paging_is_trusted(self):
+        self.assertTrue(positions_complete([{"included": [position("Engineer", 2018)]}]))
+
+
+if __name__ == "__main__":
+    unittest.main()
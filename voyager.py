@@ -0,0 +1,286 @@
+"""
+Capture of LinkedIn's Voyager API responses.
+
+LinkedIn pages load their data as JSON (the Voyager API) before rendering it.
+Reading that JSON directly gives exact position dates and search hits without
+scrolling or regex-parsing innerText. The DOM extractors in scraper.py remain
+the fallback when no usable payload is seen, or when a paginated positions
+payload was only partly captured.
+
+Parsers return plain dicts with the WorkExperience / ProfileResult fields so
+this module stays independent of scraper.py (which imports it).
+"""
+
+import json
+import re
+
+
+# Profile positions (REST and GraphQL variants)
+POSITIONS_URL = re.compile(
+    r"/voyager/api/(identity/dash/profilePositionGroups|identity/profiles/[^/]+/positionGroups"
+    r"|graphql\?.*(ProfilePositionGroups|ProfileComponents))"
+)
+
+# People search results
+SEARCH_URL = re.compile(
+    r"/voyager/api/(search/dash/clusters|graphql\?.*(SearchClusters|searchDashClusters))"
+)
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Server-rendered Voyager payloads embedded in the HTML as <code> blocks
+EMBEDDED_PAYLOADS_JS = '''() => {
+    const payloads = [];
+    for (const el of document.querySelectorAll('code[id^="bpr-guid-"]')) {
+        const text = el.textContent || "";
+        if (text.includes('"included"')) payloads.push(text);
+    }
+    return payloads;
+}'''
+
+
+class VoyagerCapture:
+    """Collects Voyager JSON payloads seen by a page."""
+
+    def __init__(self, page):
+        self.page = page
+        self.positions: list = []
+        self.search: list = []
+        page.on("response", self._on_response)
+
+    @staticmethod
+    def _classify(url: str) -> str | None:
+        if "/voyager/api/" not in url:
+            return None
+        if POSITIONS_URL.search(url):
+            return "positions"
+        if SEARCH_URL.search(url):
+            return "search"
+        return None
+
+    def _store(self, kind: str, data):
+        if kind == "positions":
+            self.positions.append(data)
+        else:
+            self.search.append(data)
+
+    def _on_response(self, response):
+        kind = self._classify(response.url)
+        if not kind or not response.ok:
+            return
+        try:
+            self._store(kind, response.json())
+        except Exception:
+            pass  # Body unavailable (navigated away) or not JSON
+
+    def reset(self):
+        """Forget payloads from the previous page. Call before navigating."""
+        self.positions = []
+        self.search = []
+
+    def collect_embedded(self, kind: str):
+        """Add Voyager payloads embedded in the current document's HTML."""
+        try:
+            for text in self.page.evaluate(EMBEDDED_PAYLOADS_JS):
+                self._store(kind, json.loads(text))
+        except Exception:
+            pass
+
+
+class AsyncVoyagerCapture(VoyagerCapture):
+    """VoyagerCapture for playwright.async_api pages."""
+
+    async def _on_response(self, response):
+        kind = self._classify(response.url)
+        if not kind or not response.ok:
+            return
+        try:
+            self._store(kind, await response.json())
+        except Exception:
+            pass
+
+    async def collect_embedded(self, kind: str):
+        try:
+            for text in await self.page.evaluate(EMBEDDED_PAYLOADS_JS):
+                self._store(kind, json.loads(text))
+        except Exception:
+            pass
+
+
+def _walk(node):
+    """Yield every dict in a JSON tree."""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def _text(value) -> str | None:
+    """Voyager strings are either plain or wrapped as {"text": ...}."""
+    if isinstance(value, dict):
+        value = value.get("text")
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
+
+
+def _month_year(date: dict | None) -> str | None:
+    """{"month": 1, "year": 2020} -> "Jan 2020"."""
+    if not isinstance(date, dict) or not date.get("year"):
+        return None
+    month = date.get("month")
+    if month and 1 <= month <= 12:
+        return f"{MONTHS[month - 1]} {date['year']}"
+    return str(date["year"])
+
+
+def _duration(start: dict | None, end: dict | None) -> str | None:
+    """Format a date range like LinkedIn does ("2 yrs 3 mos", end month inclusive)."""
+    if not isinstance(start, dict) or not start.get("year"):
+        return None
+    if isinstance(end, dict) and end.get("year"):
+        end_year, end_month = end["year"], end.get("month") or 12
+    else:
+        return None  # Ongoing roles depend on today's date; leave to the evaluator
+    months = (end_year - start["year"]) * 12 + end_month - (start.get("month") or 1) + 1
+    if months <= 0:
+        return None
+    years, months = divmod(months, 12)
+    parts = []
+    if years:
+        parts.append(f"{years} yr{'s' if years > 1 else ''}")
+    if months:
+        parts.append(f"{months} mo{'s' if months > 1 else ''}")
+    return " ".join(parts) or None
+
+
+def _sort_key(date: dict | None) -> int:
+    if not isinstance(date, dict) or not date.get("year"):
+        return 0
+    return date["year"] * 12 + (date.get("month") or 1)
+
+
+def parse_positions(payloads: list) -> list[dict]:
+    """
+    Map captured position payloads to WorkExperience fields.
+
+    Handles both the dash shape (title/companyName/dateRange) and the older
+    REST shape (title/companyName/timePeriod). Newest roles come first, like
+    the rendered page.
+    """
+    found = []
+    seen = set()
+
+    for entity in _walk(payloads):
+        title = _text(entity.get("title"))
+        company = _text(entity.get("companyName"))
+        if not title or not company:
+            continue
+
+        period = entity.get("dateRange") or entity.get("timePeriod") or {}
+        start = period.get("start") or period.get("startDate")
+        end = period.get("end") or period.get("endDate")
+
+        key = (company, title, _sort_key(start))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        found.append((
+            # Current roles first, then by most recent end/start
+            (end is None, _sort_key(end), _sort_key(start)),
+            {
+                "company": company,
+                "title": title,
+                "start_date": _month_year(start),
+                "end_date": _month_year(end) or ("Present" if start else None),
+                "duration": _duration(start, end)
+            }
+        ))
+
+    found.sort(key=lambda item: item[0], reverse=True)
+    return [exp for _, exp in found]
+
+
+def _walk_paths(node, path: tuple = ()):
+    """Yield (path, dict) for every dict in a JSON tree; paths skip list indices."""
+    if isinstance(node, dict):
+        yield path, node
+        for key, value in node.items():
+            yield from _walk_paths(value, path + (key,))
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk_paths(value, path)
+
+
+def positions_complete(payloads: list) -> bool:
+    """
+    Whether captured position payloads hold every page of their collections.
+
+    Long careers come back paginated ({"paging": {"start", "count",
+    "total"}} next to the elements). Pages belong to the same collection
+    when they share its entityUrn or, without one, their place in the
+    payload and their total. The payloads are complete when, for each
+    paged collection, the pages seen (a page captured twice counts once)
+    cover every element from 0 to its total. Payloads without paging
+    info are trusted.
+    """
+    collections: dict[tuple, dict[int, int]] = {}
+    for path, entity in _walk_paths(payloads):
+        paging = entity.get("paging")
+        elements = entity.get("elements", entity.get("*elements"))
+        if not isinstance(paging, dict) or not isinstance(elements, list):
+            continue
+        total = paging.get("total")
+        if not isinstance(total, int):
+            continue
+        urn = entity.get("entityUrn")
+        key = (urn, total) if isinstance(urn, str) else (path, total)
+        start = paging.get("start") if isinstance(paging.get("start"), int) else 0
+        pages = collections.setdefault(key, {})
+        pages[start] = max(pages.get(start, 0), len(elements))
+
+    for (_, total), pages in collections.items():
+        covered = 0
+        for start, count in sorted(pages.items()):
+            if start > covered:
+                break
+            covered = max(covered, start + count)
+        if covered < total:
+            return False
+    return True
+
+
+def parse_search_hits(payloads: list) -> list[dict]:
+    """Map captured search payloads to ProfileResult fields, in page order."""
+    results = []
+    seen = set()
+
+    for entity in _walk(payloads):
+        url = entity.get("navigationUrl")
+        if not isinstance(url, str):
+            continue
+        match = re.search(r"(/in/[^/?#]+)", url)
+        name = _text(entity.get("title"))
+        if not match or not name:
+            continue
+
+        # Anonymous out-of-network results
+        if name.lower() == "linkedin member":
+            continue
+
+        profile_url = f"https://www.linkedin.com{match.group(1)}"
+        if profile_url in seen:
+            continue
+        seen.add(profile_url)
+
+        results.append({
+            "name": name,
+            "url": profile_url,
+            "headline": _text(entity.get("primarySubtitle"))
+        })
+
+    return results